@@ -0,0 +1,269 @@
+"""
+## Purpose
+**Benchmark suite** of the readability stages. Seeded synthetic audit-style corpora (1 KB to 10 MB) are
+scored per stage (`eflaw`, `text_statistics`, `readability_gfogs`, `jargon_checker`, `simplewords_checker`,
+`sentiment_analysis`, `sentiment_batch`, `render_bar_chart`) and end to end (`analyze_observation`).
+Reported are the throughput (words/s, fastest of a few runs) and the peak memory (tracemalloc, measured
+in a separate run). The textstat caches are cleared before every run, the word memo of `func_words`
+is kept (like in a long running process).
+
+The results can be stored as baseline and compared with later runs: a stage is a regression if the
+throughput drops or the peak memory grows by more than the threshold (exit code 1).
+Baselines are machine-specific, save one on the machine the comparison runs on.
+
+## Usage
+Run from the project's root folder (the word lists are loaded from `resources/`):
+```shell
+python benchmarks/bench_readability.py --save-baseline
+python benchmarks/bench_readability.py --sizes 10KB,10MB --stages eflaw,end_to_end
+python benchmarks/bench_readability.py --threshold 0.15
+python benchmarks/bench_readability.py --stages sentiment_analysis,sentiment_batch --sentiment lexicon
+```
+---
+# Functions
+"""
+
+## Packages
+import argparse  # to parse the command line arguments
+import json  # to store and read the baseline
+import os  # to locate the scripts folder
+import platform  # to describe the machine in the baseline
+import random  # to generate the synthetic corpora
+import sys  # to import the scripts and set the exit code
+import time  # to measure the throughput
+import tracemalloc  # to measure the peak memory
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+import func_readability as rc  # noqa: E402
+import func_sentiment  # noqa: E402
+import func_metrics  # noqa: E402
+import func_scoring  # noqa: E402
+
+
+# --- Global Parameters ---
+SIZES = {'1KB': 1_000, '10KB': 10_000, '100KB': 100_000, '1MB': 1_000_000, '10MB': 10_000_000}
+default_sizes = "1KB,10KB,100KB,1MB"
+default_seed = 42
+default_threshold = 0.2  # 20% slower or more memory is a regression
+default_repeat = 3  # runs per stage, the fastest counts
+repeat_budget_seconds = 2.0  # no further runs once a stage took this long in total
+default_baseline = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+# --- Global Parameters ---
+
+
+## Fixed vocabulary of the synthetic corpora (independent of the word lists, hence comparable over time)
+VOCABULARY = (
+    "the a of to and in for on by with was were is are not be has have that this from as at all any "
+    "management team process control controls review reviewed vendor vendors contract contracts payment "
+    "payments invoice invoices approval approved policy policies procedure procedures system systems access "
+    "user users account accounts report reports period periods risk risks audit finding findings "
+    "documentation documented implementation implemented monitoring monitored organizational procurement "
+    "notification notifications responsibility responsibilities segregation duties reconciliation "
+    "reconciliations authorization unauthorized effectively consistently appropriately accordingly "
+    "information technology security compliance requirement requirements evidence sample samples tested "
+    "identified observed noted performed maintained updated timely annual quarterly monthly regional "
+    "local global department function business unit owner owners data master changes change request"
+).split()
+PHRASES = (
+    "in order to", "leverage", "ensure", "framework", "in addition", "approx. 5 of 20", "e.g.", "i.e.",
+    "on a regular basis", "in the event that", "with regard to", "utilize", "prior to", "at this point in time",
+)
+SENTIMENT_WORDS = ("good", "great", "poor", "bad", "excellent", "weak", "strong", "inadequate")
+
+
+def make_sentence(rng):
+    """Returns one synthetic sentence (5 to 35 words, some phrases and sentiment words)."""
+    words = [rng.choice(VOCABULARY) for _ in range(rng.randint(5, 35))]
+    if rng.random() < 0.5:
+        words.insert(rng.randrange(len(words)), rng.choice(PHRASES))
+    if rng.random() < 0.2:
+        words.insert(rng.randrange(len(words)), rng.choice(SENTIMENT_WORDS))
+    sentence = " ".join(words)
+
+    return sentence[0].upper() + sentence[1:] + "."
+
+
+def make_paragraph(rng):
+    """Returns one synthetic observation paragraph (1 to 8 sentences, sometimes as numbered list)."""
+    sentences = [make_sentence(rng) for _ in range(rng.randint(1, 8))]
+    if len(sentences) > 2 and rng.random() < 0.2:
+        return sentences[0] + "\n" + "\n".join(f"{no}. {sentence}" for no, sentence in enumerate(sentences[1:], start=1))
+
+    return " ".join(sentences)
+
+
+def make_corpus(size, seed=default_seed):
+    """Returns a reproducible list of observation paragraphs with about `size` characters in total.
+
+    Args:
+        size (int): Characters of the corpus
+        seed (int): Random seed
+
+    Returns:
+        corpus (list): Observation paragraphs
+    """
+
+    rng = random.Random(f"{seed}:{size}")
+    corpus = []
+    length = 0
+    while length < size:
+        paragraph = make_paragraph(rng)
+        corpus.append(paragraph)
+        length += len(paragraph)
+
+    return corpus
+
+
+## Stages: name and function(corpus, results) scoring all paragraphs
+STAGES = {
+    'eflaw': lambda corpus, results: [rc.eflaw(i, text) for i, text in enumerate(corpus)],
+    'text_statistics': lambda corpus, results: [rc.text_statistics(i, text) for i, text in enumerate(corpus)],
+    'readability_gfogs': lambda corpus, results: [rc.readability_gfogs(i, text) for i, text in enumerate(corpus)],
+    'jargon_checker': lambda corpus, results: [rc.jargon_checker(i, text) for i, text in enumerate(corpus)],
+    'simplewords_checker': lambda corpus, results: [rc.simplewords_checker(i, text) for i, text in enumerate(corpus)],
+    'sentiment_analysis': lambda corpus, results: [rc.sentiment_analysis(i, text) for i, text in enumerate(corpus)],
+    'sentiment_batch': lambda corpus, results: func_sentiment.get_backend().score_many(corpus),
+    'render_bar_chart': lambda corpus, results: [rc.render_bar_chart(i, results) for i in range(len(results))],
+    'end_to_end': lambda corpus, results: [rc.analyze_observation(i, text) for i, text in enumerate(corpus)],
+    'triage': lambda corpus, results: [rc.analyze_observation(i, text, metrics=func_metrics.TRIAGE) for i, text in enumerate(corpus)],
+    'triage_vectorized': lambda corpus, results: func_scoring.score_many(corpus),
+}
+
+
+def warm_up():
+    """Imports the lazily loaded packages and loads the word lists (not part of the measurements)."""
+    sample = make_corpus(1)
+    rc.load_external_lists()
+    results = [rc.analyze_observation(i, text) for i, text in enumerate(sample)]
+    rc.render_bar_chart(0, results)
+
+
+def clear_caches():
+    """Clears the textstat caches (results per text), otherwise repeated runs only measure cache hits."""
+    rc.get_textstat().set_lang("en")
+
+
+def run_stage(stage, corpus, results, memory=True, repeat=default_repeat):
+    """Runs one stage on the corpus.
+
+    Args:
+        stage (string): Name of the stage (see `STAGES`)
+        corpus (list): Observation paragraphs
+        results (list): Results of `analyze_observation` (input of `render_bar_chart`)
+        memory (bool): Measure the peak memory in a separate run
+        repeat (int): Maximum number of runs, the fastest counts
+
+    Returns:
+        measurement (dict): seconds, words_per_s and peak_kb
+    """
+
+    function = STAGES[stage]
+    words = sum(len(text.split()) for text in corpus)
+
+    timings = []
+    while len(timings) < max(1, repeat) and sum(timings) < repeat_budget_seconds:
+        clear_caches()
+        start = time.perf_counter()
+        function(corpus, results)
+        timings.append(time.perf_counter() - start)
+    seconds = min(timings)
+
+    peak_kb = None
+    if memory:
+        clear_caches()
+        tracemalloc.start()
+        function(corpus, results)
+        peak_kb = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+        tracemalloc.stop()
+
+    return {'seconds': round(seconds, 4), 'words_per_s': round(words / seconds, 1), 'peak_kb': peak_kb}
+
+
+def compare(measurements, baseline, threshold):
+    """Compares the measurements with the baseline.
+
+    Args:
+        measurements (dict): "stage|size" and measurement
+        baseline (dict): "stage|size" and measurement of the baseline
+        threshold (float): Allowed relative change, e.g. 0.2
+
+    Returns:
+        regressions (list): Descriptions of the regressions
+    """
+
+    regressions = []
+    for key, measurement in measurements.items():
+        reference = baseline.get(key)
+        if reference is None:
+            continue
+        if measurement['words_per_s'] < reference['words_per_s'] * (1 - threshold):
+            regressions.append(f"{key}: {measurement['words_per_s']} words/s (baseline {reference['words_per_s']})")
+        if measurement['peak_kb'] and reference.get('peak_kb') and measurement['peak_kb'] > reference['peak_kb'] * (1 + threshold):
+            regressions.append(f"{key}: {measurement['peak_kb']} KB peak (baseline {reference['peak_kb']})")
+
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the readability stages on synthetic corpora.")
+    parser.add_argument('--sizes', default=default_sizes, help=f"corpus sizes, any of {','.join(SIZES)}")
+    parser.add_argument('--stages', default=",".join(STAGES), help="stages to run")
+    parser.add_argument('--seed', type=int, default=default_seed, help="random seed of the corpora")
+    parser.add_argument('--baseline', default=default_baseline, help="baseline file (json)")
+    parser.add_argument('--save-baseline', action='store_true', help="store the results as baseline")
+    parser.add_argument('--threshold', type=float, default=default_threshold, help="allowed relative change")
+    parser.add_argument('--repeat', type=int, default=default_repeat, help="maximum runs per stage")
+    parser.add_argument('--no-memory', action='store_true', help="skip the peak memory measurement")
+    parser.add_argument('--sentiment', choices=list(func_sentiment.BACKENDS), default=func_sentiment.default_backend,
+                        help="sentiment backend")
+    args = parser.parse_args(argv)
+
+    sizes = [size.strip() for size in args.sizes.split(",") if size.strip()]
+    stages = [stage.strip() for stage in args.stages.split(",") if stage.strip()]
+    unknown = [name for name in sizes if name not in SIZES] + [name for name in stages if name not in STAGES]
+    if unknown:
+        parser.error(f"unknown size or stage: {', '.join(unknown)}")
+
+    func_sentiment.set_backend(args.sentiment)
+    warm_up()
+    measurements = {}
+    print(f"{'stage':<22}{'size':>7}{'words':>10}{'seconds':>10}{'words/s':>12}{'peak KB':>11}")
+    for size in sizes:
+        corpus = make_corpus(SIZES[size], args.seed)
+        words = sum(len(text.split()) for text in corpus)
+        results = [rc.analyze_observation(i, text) for i, text in enumerate(corpus)] if 'render_bar_chart' in stages else []
+        for stage in stages:
+            measurement = run_stage(stage, corpus, results, memory=not args.no_memory, repeat=args.repeat)
+            measurements[f"{stage}|{size}"] = measurement
+            print(f"{stage:<22}{size:>7}{words:>10}{measurement['seconds']:>10}{measurement['words_per_s']:>12}{str(measurement['peak_kb']):>11}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as baseline_file:
+            json.dump({'machine': platform.platform(), 'python': platform.python_version(), 'seed': args.seed,
+                       'sentiment': args.sentiment, 'results': measurements}, baseline_file, indent=2)
+        print(f"Baseline saved: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline found (run with --save-baseline first).")
+        return 0
+
+    with open(args.baseline) as baseline_file:
+        baseline = json.load(baseline_file)
+    if baseline.get('seed') != args.seed:
+        print(f"Baseline uses seed {baseline.get('seed')}, not compared.")
+        return 0
+    if baseline.get('sentiment', func_sentiment.default_backend) != args.sentiment:
+        print(f"Baseline uses the sentiment backend {baseline.get('sentiment')}, not compared.")
+        return 0
+
+    regressions = compare(measurements, baseline['results'], args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    print(f"{len(regressions)} regression(s), threshold {args.threshold:.0%}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
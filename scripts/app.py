@@ -7,6 +7,7 @@ All used subpages have to be imported:
 ```python3 linenums="1"
 import app1
 import app2
+import app3
 import streamlit as st
 from hfunc import make_url_link
 ```
@@ -17,6 +18,7 @@ The page references are stored in a dictionary:
 PAGES = {
     'Startpage': app1,
     'Quick Check': app2,
+    'Corpus Summary': app3,
 }
 ```
 
@@ -25,6 +27,7 @@ PAGES = {
 # Importing packages and subpages
 import app1
 import app2
+import app3
 import streamlit as st
 import func_readability as rc  # here to use make_url_link
 
@@ -38,6 +41,7 @@ link = rc.make_url_link(URL, text)
 PAGES = {
     'Startpage': app1,
     'Quick Check': app2,
+    'Corpus Summary': app3,
 }
 
 
@@ -7,11 +7,13 @@ Readability scores are calculated after the `[Analyze]` button is pressed.
 
 ## Key Elements/Variables
 ### observation_stats_list (list)
-All results, statistics and details are stored in a **dictionary** within a **list**, the **observation_stats_list**. The list was used to create a dictionary per 
-observation paragraph and append it to the list (this was relevant for the analyzing all observations of an audit report.)
-A list of dictionaries.
+All results, statistics and details are stored in an **ObservationResult** (see `func_result`) within a **list**, the **observation_stats_list**.
+The list was used to create a result per observation paragraph and append it to the list (this was relevant for the analyzing all observations of an audit report.)
+The record stores the raw numbers and match lists once and formats the texts on access. It supports the former dictionary keys, e.g. `observation_stats_list[i]['eflaw_score']`.
 \n\n
-In case of the **Quick Check** the list only contains **one dictionary** with the following **keys**:
+In case of the **Quick Check** the list only contains **one result**. It is built per analysis, the results of the last
+analyses are kept per session in the **AnalysisHistory** (see `func_session`) within `st.session_state`, bounded to
+`history_size` entries (see `resources/rcBOT_config.ini`). The result supports the following **keys**:
 ```shell
 dict_keys(['Observation No.', 
            'eflaw_score', 
@@ -82,8 +84,15 @@ Input text: `This is a quick reader check test.`
 # Importing packages
 import streamlit as st  # to render streamlit webpage
 import pandas as pd  # to store text, stats, scores and results
+import configparser  # to read the history size from the config file
 import func_readability as rc  # to import the readability algorithms
-
+from func_session import AnalysisHistory  # to keep the last analyses per session
+from func_cache import ResultCache, analyze_cached  # to skip texts analyzed before
+from func_incremental import IncrementalScorer  # to re-score only the edited lines
+from func_result import results_to_frame  # to display the results as table
+import func_timing  # to time the readability stages
+import func_sentiment  # to select the sentiment backend
+import logging  # to write the timing logs
 
 
 # --- Global Parameters ---
@@ -93,16 +102,11 @@ recommended_score_fres = 49  # or higher
 recommended_score_eflaw = 25  # or lower
 recommended_score_gfs = 17  # or lower
 recommended_score_cons = 18  # or lower
-# --- Global Parameters ---
-
 
-# --- Global Variables ---
-observation_no = 0
-observation = ""
-gl_data = []
-gl_amount_of_observations = 0
-observation_stats_list = []
-# --- Global Variables ---
+CONFIG_FILE = "resources/rcBOT_config.ini"
+default_history_size = 5  # analyses kept per session
+default_cache_items = 1024  # results kept in memory (shared by all sessions)
+# --- Global Parameters ---
 
 
 def check_word_count(observation_input):
@@ -122,6 +126,166 @@ def check_word_count(observation_input):
     return word_list_len
 
 
+def load_history_size(CONFIG_FILE):
+    """Loads the number of analyses kept per session from the config file.
+
+    Args:
+        CONFIG_FILE (string): Path to the config file + config file name
+
+    Returns:
+        history_size (int): Maximum number of analyses per session
+    """
+
+    config = configparser.ConfigParser()
+    config.read(CONFIG_FILE)
+
+    history_size = config.getint('QUICKCHECK', 'history_size', fallback=default_history_size)
+
+    return history_size
+
+
+def load_incremental(CONFIG_FILE):
+    """Loads the incremental re-scoring switch from the config file.
+
+    Args:
+        CONFIG_FILE (string): Path to the config file + config file name
+
+    Returns:
+        incremental (bool): True if only new or changed lines are scored
+    """
+
+    config = configparser.ConfigParser()
+    config.read(CONFIG_FILE)
+
+    incremental = config.getboolean('QUICKCHECK', 'incremental', fallback=True)
+
+    return incremental
+
+
+def session_history():
+    """Returns the analysis history of the current session (created on first use)."""
+
+    if 'analysis_history' not in st.session_state:
+        st.session_state['analysis_history'] = AnalysisHistory(load_history_size(CONFIG_FILE))
+
+    return st.session_state['analysis_history']
+
+
+def session_scorer():
+    """Returns the incremental scorer of the current session (created on first use), or None if disabled."""
+
+    if 'incremental_scorer' not in st.session_state:
+        st.session_state['incremental_scorer'] = IncrementalScorer() if load_incremental(CONFIG_FILE) else None
+
+    return st.session_state['incremental_scorer']
+
+
+def load_timing_config(CONFIG_FILE):
+    """Loads the profiling mode and the timing log file from the config file.
+
+    Args:
+        CONFIG_FILE (string): Path to the config file + config file name
+
+    Returns:
+        profile_mode (string): "off", "cprofile" or "tracemalloc"
+        log_file (string): Path to the JSON timing log, empty: no log
+    """
+
+    config = configparser.ConfigParser()
+    config.read(CONFIG_FILE)
+
+    profile_mode = config.get('TIMING', 'profile', fallback='off')
+    if profile_mode not in func_timing.PROFILE_MODES:
+        profile_mode = 'off'
+    log_file = config.get('TIMING', 'log_file', fallback='')
+
+    return profile_mode, log_file
+
+
+def load_sentiment_backend(CONFIG_FILE):
+    """Loads the sentiment backend from the config file.
+
+    Args:
+        CONFIG_FILE (string): Path to the config file + config file name
+
+    Returns:
+        backend (string): "textblob", "lexicon" or "off"
+    """
+
+    config = configparser.ConfigParser()
+    config.read(CONFIG_FILE)
+
+    backend = config.get('SENTIMENT', 'backend', fallback=func_sentiment.default_backend)
+    if backend not in func_sentiment.BACKENDS:
+        backend = func_sentiment.default_backend
+
+    return backend
+
+
+@st.cache_resource
+def timing_log_handler(log_file):
+    """Adds the JSON timing log file to the timing logger (once per server process)."""
+
+    handler = logging.FileHandler(log_file)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    func_timing.logger.addHandler(handler)
+    func_timing.logger.setLevel(logging.INFO)
+
+    return handler
+
+
+@st.cache_resource
+def shared_sentiment_backend():
+    """Returns the sentiment backend of the config file. The backend is selected once for the Streamlit
+    server, not per analysis (the selection is process-wide, see `func_sentiment.set_backend`)."""
+
+    return func_sentiment.set_backend(load_sentiment_backend(CONFIG_FILE))
+
+
+@st.cache_resource
+def shared_result_cache():
+    """Returns the result cache shared by all sessions. The optional SQLite file (config [CACHE] sqlite_path)
+    keeps the results across server restarts."""
+
+    config = configparser.ConfigParser()
+    config.read(CONFIG_FILE)
+
+    max_items = config.getint('CACHE', 'memory_items', fallback=default_cache_items)
+    db_path = config.get('CACHE', 'sqlite_path', fallback='') or None
+
+    return ResultCache(max_items, db_path)
+
+
+@st.cache_resource
+def shared_lexicon_cache():
+    """Returns the process-wide lexicon cache. Shared by all sessions of the Streamlit server,
+    changed csv-word lists are still picked up (see `func_readability.LexiconCache`)."""
+
+    return rc.lexicon_cache
+
+
+## The fragment re-runs on its own (Streamlit 1.37+), hence the chart view can be changed without a new analysis
+## (a full re-run would not press the "Analyze" button and the report would be gone)
+@st.fragment
+def sentence_length_chart(i, observation_stats_list):
+    """Renders the sentence length chart. Long documents (more than `chart_max_bars` sentences) are shown as
+    sentence windows or histogram, single sentences page by page."""
+
+    sentence_count = len(observation_stats_list[i].sentence_lengths)
+    if sentence_count <= rc.chart_max_bars:
+        st.write(rc.render_bar_chart(i, observation_stats_list))
+        return
+
+    view = st.radio('Sentence lengths', ['Windows', 'Histogram'], horizontal=True,
+                    help=f'{sentence_count} sentences, windows of consecutive sentences or the length distribution')
+    st.write(rc.render_bar_chart(i, observation_stats_list, mode=view.lower()))
+
+    pages = rc.sentence_pages(sentence_count)
+    page = st.number_input(f'Single sentences: page (1 to {pages}, {rc.chart_page_size} sentences per page)',
+                           min_value=1, max_value=pages, value=1)
+    st.write(rc.render_bar_chart(i, observation_stats_list, page=page))
+
+
 def app():
     """Main function which renders the streamlit webpage and calls the functions."""
 
@@ -148,40 +312,33 @@ def app():
             i = int(observation_no)
             observation = observation_input
 
-            ## Add first empty dictionary to observation stats list
-            observation_stats_list.append({})
-
-            ## Assign observation No.: iterator
-            observation_stats_list[i]['Observation No.'] = i+1
+            ## Timing spans of the stages (shown in the sidebar, optionally logged and profiled)
+            timings = func_timing.Timings()
+            profile_mode, log_file = load_timing_config(CONFIG_FILE)
+            shared_sentiment_backend()
 
-            ## Getting eflaw-based stats and score from the "eflaw" function
-            observation_stats_list[i]['eflaw_score'], observation_stats_list[i]['eflaw_rank'], observation_stats_list[i]['eflaw_score_rank'], observation_stats_list[i][
-                'eflaw_sentencecount'], observation_stats_list[i]['sentence_length_dict'], observation_stats_list[i]['eflaw_miniwords_count'] = rc.eflaw(i, observation)
+            ## Load the (cached) jargon, simple and difficult word lists
+            with timings.span('word_lists'):
+                shared_lexicon_cache().load()
 
-            ## Getting the gunning_fog-based stats and score from the "readability_gfogs" function
-            observation_stats_list[i]['gunning_fog_score'], observation_stats_list[i][
-                'gunning_fog_rank'], observation_stats_list[i]['gunning_fog_score_rank'] = rc.readability_gfogs(i, observation)
+            ## Parse the text once, all readability functions share the parsed document
+            document = rc.parse_document(observation)
 
-            ## Getting stats from the "text_statistics" function
-            observation_stats_list[i]['observation_no'], observation_stats_list[i]['words'], observation_stats_list[i]['sentences'], observation_stats_list[i]['syllables'], observation_stats_list[
-                i]['word_sentence_ratio'], observation_stats_list[i]['diffcult_words_list'], observation_stats_list[i]['diffcult_words_num'] = rc.text_statistics(i, observation)
+            ## Run all readability checks ("analyze_observation" function),
+            ## after an edit only the new or changed lines are scored (see func_incremental)
+            result_cache = shared_result_cache()
+            scorer = session_scorer()
+            analyze_function = scorer.analyze if scorer is not None else rc.analyze_observation
 
-            ## Getting long sentence count from the "long_sentences" function
-            observation_stats_list[i]['long_sentences'] = rc.long_sentences(i, observation)
+            def analyze(i, observation):
+                return analyze_function(i, observation, timings)
 
-            ## Getting jargon words from the "jargon_checker" function
-            observation_stats_list[i]['jargon_checklist'], observation_stats_list[i]['jargon_checklist_dict'] = rc.jargon_checker(i, observation)
-            
-            ## Getting word to be simplified from the "implewords_checker" function
-            observation_stats_list[i]['simplewords_checklist'], observation_stats_list[i]['simplewords_checklist_dict'] = rc.simplewords_checker(i, observation)
+            with func_timing.capture(profile_mode) as profile_report, timings.span('analysis (total)'):
+                observation_stats_list = [analyze_cached(i, document, result_cache, analyze)]
 
-            ## Getting improvement suggestions from the "improvement_suggestions" function
-            observation_stats_list[i]['improvement_suggestions'] = rc.improvement_suggestions(i, observation_stats_list)
-
-            ## Getting sentiment from the "sentiment_analysis" function
-            observation_stats_list[i]['bob_result_polarity'], observation_stats_list[i]['bob_result_subjectivity'] = rc.sentiment_analysis(i, observation)
-            
-            print("observation_stats_list:", observation_stats_list[i])  # for testing
+            ## Keep the results in the (bounded) history of this session
+            history = session_history()
+            history.add(observation, observation_stats_list[i])
 
             ## -------------------------------------------------------------------------
             ## Render/Display Readability Report
@@ -200,11 +357,21 @@ def app():
             gfog_score = observation_stats_list[i]['gunning_fog_score']
             gfog_rank = observation_stats_list[i]['gunning_fog_rank']
 
-            if int(observation_stats_list[i]['eflaw_score']) > recommended_score_eflaw:
+            ## Thresholds of the text's language (see resources/language_profiles.ini)
+            language_profile = rc.result_profile(observation_stats_list[i])
+            score_eflaw = language_profile.score_eflaw
+            sentence_length_max = language_profile.sentence_length_max
+
+            if eflaw_score is None:
+            ## No sentence with more than 4 words, hence no EFLAW score (info box)
+                col_rs1.info(f'EFLAW: {rc.eflaw_rank_missing}')
+                col_rs2.info('No sentence with more than 4 words.')
+
+            elif int(observation_stats_list[i]['eflaw_score']) > score_eflaw:
             ## If score above threshold print red box (error) box
                 col_rs1.error(f'EFLAW: {eflaw_score}')
                 col_rs2.error(
-                    f'{eflaw_rank} Target is {recommended_score_eflaw} or lower.')
+                    f'{eflaw_rank} Target is {score_eflaw} or lower.')
 
             else:
             ## If score below threshold print green (success) box
@@ -231,9 +398,9 @@ def app():
             if int(observation_stats_list[i]['long_sentences']) > 0:
                 long_sen = observation_stats_list[i]['long_sentences']
                 total_sen = observation_stats_list[i]['eflaw_sentencecount']
-                st.error(f'{long_sen} out of {total_sen} sentences are longer than the recommended {recommended_sentence_lengh_max} words.\n\n')
+                st.error(f'{long_sen} out of {total_sen} sentences are longer than the recommended {sentence_length_max} words.\n\n')
             else:
-                st.success(f'All sentences are within the recommended length of {recommended_sentence_lengh_max} words.')
+                st.success(f'All sentences are within the recommended length of {sentence_length_max} words.')
 
             st.write('')
             st.write('')
@@ -244,14 +411,18 @@ def app():
             polarity = observation_stats_list[i]['bob_result_polarity']
             objectivity = observation_stats_list[i]['bob_result_subjectivity']
 
-            if polarity == "neutral":
+            if polarity == rc.sentiment_not_analyzed and not language_profile.sentiment:
+                st.info(f'The sentiment is only analyzed for English texts (language: {language_profile.label}).')
+            elif polarity == rc.sentiment_not_analyzed:
+                st.info('The sentiment is not analyzed (config: [SENTIMENT] backend = off).')
+            elif polarity == "neutral":
                 st.success(f'The text has a {polarity} sentiment.')
             else:
                 st.error(f'The text has a {polarity} sentiment.')
 
             if objectivity == "objective" or objectivity == "very objective":
                 st.success(f'The text is written in an {objectivity} manner.')
-            else:
+            elif objectivity != rc.sentiment_not_analyzed:
                 st.error(f'The text is written in an {objectivity} manner.')
 
             st.write('')
@@ -268,13 +439,13 @@ def app():
             st.subheader('Text Statistics')
 
             ## Creating a dataframe based on the observation_stats_list, to display details as table
-            df_obs = pd.DataFrame(observation_stats_list)
-            st.table(df_obs.loc[i, ['words', 'eflaw_sentencecount', 'word_sentence_ratio', 'long_sentences']])
+            df_obs = results_to_frame(observation_stats_list, ['words', 'eflaw_sentencecount', 'word_sentence_ratio', 'long_sentences'])
+            st.table(df_obs.loc[i])
             st.write(' \n\n')
 
             ## Render/display bar chart for sentence length
-            bar_chart = rc.render_bar_chart(i, observation_stats_list)
-            st.write(bar_chart)
+            with timings.span('chart'):
+                sentence_length_chart(i, observation_stats_list)
 
             st.write('')
             st.write('')
@@ -302,14 +473,34 @@ def app():
             st.sidebar.write('')
             st.sidebar.write('---')
             st.sidebar.subheader("Recommended Scores")
-            st.sidebar.write(f'Sentence lenght: {recommended_sentence_lengh_max} or shorter')
-            st.sidebar.write(f'EFLAW: {recommended_score_eflaw} or lower')
+            st.sidebar.write(f'Language: {language_profile.label}')
+            st.sidebar.write(f'Sentence lenght: {sentence_length_max} or shorter')
+            st.sidebar.write(f'EFLAW: {score_eflaw} or lower')
             st.sidebar.write(f'GFOGS: {recommended_score_gfs} or lower')
             st.sidebar.write('---')
             st.sidebar.subheader("Abbreviations")
             st.sidebar.write('EFLAW: McAlpine EFLAW Score')
             st.sidebar.write('GFOGS: Gunning Fog Score')
 
+            st.sidebar.write('---')
+            st.sidebar.subheader("Session")
+            st.sidebar.write(f'Analyses kept: {len(history)} of {history.max_items} ({history.memory_bytes() / 1024:.1f} KB)')
+            cache_stats = result_cache.stats()
+            st.sidebar.write(f"Result cache: {cache_stats['hits_memory'] + cache_stats['hits_disk']} hits, {cache_stats['misses']} misses")
+            if scorer is not None:
+                scorer_stats = scorer.stats()
+                st.sidebar.write(f"Lines re-used: {scorer_stats['hits']}, scored: {scorer_stats['misses']}")
+
+            ## Timing of the stages (and the optional profile), logged as JSON line if configured
+            with st.sidebar.expander("Timing"):
+                timing_table = pd.DataFrame(timings.to_dict()['timings_ms'].items(), columns=['Stage', 'ms'])
+                st.table(timing_table)
+                for report in profile_report.values():
+                    st.code(report)
+            if log_file:
+                timing_log_handler(log_file)
+                timings.log(source="quick_check", characters=len(observation), profile=profile_mode)
+
             st.sidebar.write('---')
             URL = ''
             text = 'user manual'
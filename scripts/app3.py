@@ -0,0 +1,184 @@
+"""
+## Purpose
+Section to summarize a **corpus of reports** (e.g. all audit reports of a year).
+The user uploads report files (.docx, .txt, .xlsx), every report is one group (e.g. one business unit).
+The observation paragraphs are scored on all worker processes after the `[Summarize]` button is pressed,
+only the corpus aggregates are kept (see `func_aggregate`), not the results of the paragraphs.
+
+## Key Elements/Variables
+### summary (dictionary)
+Corpus summary of `func_aggregate.CorpusAggregate.summary`:
+
+- EFLAW and Gunning FOG distribution (quantiles) per report and of all reports
+- most frequent jargon and words to be simplified
+- longest sentences of the corpus
+
+The settings (workers, number of sentences and phrases listed, accuracy of the quantiles) are in
+section `[CORPUS]` of `resources/rcBOT_config.ini`.
+---
+# Functions
+"""
+
+
+# Importing packages
+import streamlit as st  # to render streamlit webpage
+import pandas as pd  # to display the summary as tables
+import configparser  # to read the corpus settings from the config file
+import os  # to name the groups and the temporary files
+import tempfile  # to store the uploaded reports for the import
+from collections import deque  # to keep the group of the pending paragraphs
+import func_aggregate  # to aggregate the results
+import func_batch  # to score the paragraphs on all cores
+import func_ingest  # to read the paragraphs of the reports
+
+
+# --- Global Parameters ---
+CONFIG_FILE = "resources/rcBOT_config.ini"
+# --- Global Parameters ---
+
+
+def load_corpus_config(CONFIG_FILE):
+    """Loads the corpus summary settings from the config file.
+
+    Args:
+        CONFIG_FILE (string): Path to the config file + config file name
+
+    Returns:
+        settings (dict): workers (0: number of CPU cores), top_sentences, top_phrases and relative_accuracy
+    """
+
+    config = configparser.ConfigParser()
+    config.read(CONFIG_FILE)
+
+    return {
+        'workers': config.getint('CORPUS', 'workers', fallback=0) or None,
+        'top_sentences': config.getint('CORPUS', 'top_sentences', fallback=func_aggregate.default_top_n),
+        'top_phrases': config.getint('CORPUS', 'top_phrases', fallback=func_aggregate.default_top_phrases),
+        'relative_accuracy': config.getfloat('CORPUS', 'relative_accuracy', fallback=func_aggregate.default_relative_accuracy),
+    }
+
+
+def summarize_reports(paths, settings):
+    """Scores the paragraphs of the reports and returns the corpus summary, one group per report.
+
+    Args:
+        paths (list): Tuples (report name, path to the report)
+        settings (dict): Corpus settings (see `load_corpus_config`)
+
+    Returns:
+        summary (dict): Corpus summary (see `func_aggregate.CorpusAggregate.summary`)
+    """
+
+    groups = deque()  # group of the paragraphs read but not yet aggregated
+
+    def paragraphs():
+        for name, path in paths:
+            for paragraph in func_ingest.iter_paragraphs(path):
+                groups.append(name)
+                yield paragraph
+
+    def paragraph_groups():
+        while True:
+            yield groups.popleft()
+
+    aggregate = func_aggregate.CorpusAggregate(settings['top_sentences'], settings['relative_accuracy'])
+    func_batch.aggregate_many(paragraphs(), groups=paragraph_groups(), workers=settings['workers'], aggregate=aggregate)
+
+    return aggregate.summary(top_phrases=settings['top_phrases'])
+
+
+def distribution_table(summary, score):
+    """Builds the table of a score distribution: one row per report and the total.
+
+    Args:
+        summary (dict): Corpus summary
+        score (string): 'eflaw' or 'gunning_fog'
+
+    Returns:
+        df_distribution (DataFrame): Observations, words, long sentences and the quantiles of the score
+    """
+
+    rows = {}
+    for name, group in list(summary['groups'].items()) + [('All reports', summary['total'])]:
+        rows[name] = {'observations': group['observations'], 'words': group['words'],
+                      'long sentences': group['long_sentences'], **group[score]}
+
+    return pd.DataFrame.from_dict(rows, orient='index').drop(columns='count')
+
+
+def app():
+    """Main function which renders the streamlit webpage and calls the functions."""
+
+    st.subheader('Corpus Summary Page')
+
+    uploads = st.file_uploader('Reports to be summarized (one group per report):', type=['docx', 'txt', 'xlsx'],
+                               accept_multiple_files=True)
+
+    ## If the "Summarize" button is pressed, execute the following:
+    if st.button('Summarize'):
+
+        if not uploads:
+            st.error('Attention: Upload at least one report.')
+            return
+
+        settings = load_corpus_config(CONFIG_FILE)
+
+        ## The reports are read from files (streamed paragraph by paragraph, see func_ingest)
+        with tempfile.TemporaryDirectory() as directory:
+            paths = []
+            names = set()
+            for number, upload in enumerate(uploads):
+                path = os.path.join(directory, f"{number}{os.path.splitext(upload.name)[1].lower()}")
+                with open(path, 'wb') as report_file:
+                    report_file.write(upload.getbuffer())
+                ## One group per report, the upload no. is appended to a repeated name (e.g. report.docx and report.txt)
+                name = stem = os.path.splitext(upload.name)[0]
+                suffix = number + 1
+                while name in names:
+                    name = f"{stem} ({suffix})"
+                    suffix += 1
+                names.add(name)
+                paths.append((name, path))
+
+            with st.spinner('Scoring the observation paragraphs ...'):
+                summary = summarize_reports(paths, settings)
+
+        if not summary['total']['observations']:
+            st.error('Attention: The reports have no observation paragraphs (5 or more words).')
+            return
+
+        ## -------------------------------------------------------------------------
+        ## Render/Display Corpus Summary
+        ## -------------------------------------------------------------------------
+        st.title("Corpus Summary")
+        st.write(f"{summary['total']['observations']} observation paragraphs of {len(summary['groups'])} reports.")
+
+        ## Render/Display Score Distributions --------------------------------------
+        st.subheader('McAlpine EFLAW')
+        st.write(f"Quantiles of the scores (within {settings['relative_accuracy']:.0%}), lower is easier to read.")
+        st.table(distribution_table(summary, 'eflaw'))
+        df_ranks = pd.DataFrame({name: group['eflaw_ranks'] for name, group in summary['groups'].items()}).fillna(0).astype(int)
+        st.table(df_ranks)
+
+        st.subheader('Gunning Fog Index')
+        st.table(distribution_table(summary, 'gunning_fog'))
+
+        st.write('')
+        st.write('')
+
+        ## Render/Display Most Frequent Jargon and Words to be Simplified ----------
+        st.subheader('Jargon to be Reviewed')
+        st.write('Number of observation paragraphs containing the phrase.')
+        st.table(pd.DataFrame(summary['jargon'], columns=['Jargon', 'Alternative', 'Observations']))
+
+        st.subheader('Words to be Simplified')
+        st.table(pd.DataFrame(summary['simplewords'], columns=['Word', 'Alternative', 'Observations']))
+
+        st.write('')
+        st.write('')
+
+        ## Render/Display Longest Sentences ----------------------------------------
+        st.subheader('Longest Sentences')
+        st.write('Observations are numbered across all reports in upload order.')
+        df_sentences = pd.DataFrame(summary['longest_sentences']).rename(columns={'group': 'Report'})
+        st.dataframe(df_sentences)
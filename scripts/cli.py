@@ -0,0 +1,280 @@
+"""
+## Purpose
+**Headless command line interface** to score report files or stdin without the Streamlit UI,
+e.g. from pre-commit-style hooks on report drafts. The results are written as JSON lines or CSV.
+Heavy packages (pandas, altair, streamlit) are not imported, textstat and textblob only on first use.
+
+## Usage
+Run from the project's root folder (the word lists are loaded from `resources/`):
+```shell
+python scripts/cli.py report.docx --format csv > scores.csv
+cat draft.txt | python scripts/cli.py - --format json
+python scripts/cli.py --cold-start
+python scripts/cli.py report.docx --timing --profile cprofile > scores.jsonl
+python scripts/cli.py report.docx --workers 8 --sentiment lexicon > scores.jsonl
+python scripts/cli.py reports/*.docx --workers 8 --output scores.parquet --columns words,eflaw_score,gunning_fog_score
+python scripts/cli.py rapport_ch.docx --language auto > scores.jsonl
+python scripts/cli.py reports/*.docx --workers 8 --metrics triage --format csv > triage.csv
+python scripts/cli.py archive_2023.txt --large --top 20 > archive_2023.json
+python scripts/cli.py reports/*.docx --workers 8 --dedup near > scores.jsonl
+```
+---
+# Functions
+"""
+
+## Packages
+import argparse  # to parse the command line arguments
+import configparser  # to read the sentiment backend from the config file
+import csv  # to write the csv output
+from collections import deque  # to keep the file names of the pending paragraphs
+import json  # to write the json output
+import logging  # to write the timings to stderr
+import os  # to locate this script for the cold start measurement
+import statistics  # to calculate the median cold start time
+import subprocess  # to measure the cold start in a fresh interpreter
+import sys  # to read stdin and write stdout
+import time  # to measure the cold start
+
+
+# --- Global Parameters ---
+CONFIG_FILE = "resources/rcBOT_config.ini"
+cold_start_target_seconds = 2.0  # start-up incl. scoring a short text
+cold_start_sample = "The management team did not ensure that the monitoring controls were documented.\n"
+# --- Global Parameters ---
+
+
+def load_sentiment_backend(CONFIG_FILE):
+    """Loads the sentiment backend from the config file.
+
+    Args:
+        CONFIG_FILE (string): Path to the config file + config file name
+
+    Returns:
+        backend (string): "textblob", "lexicon" or "off" (default: `func_sentiment.default_backend`)
+    """
+
+    import func_sentiment  # to get the default backend
+
+    config = configparser.ConfigParser()
+    config.read(CONFIG_FILE)
+
+    return config.get('SENTIMENT', 'backend', fallback=func_sentiment.default_backend).strip()
+
+
+def iter_input_paragraphs(paths, min_words):
+    """Yields (source, paragraph) for all input files. "-" reads the text from stdin.
+
+    Args:
+        paths (list): Paths to .docx, .txt or .xlsx files or "-"
+        min_words (int): Paragraphs with fewer words are skipped
+
+    Yields:
+        source (string): File name (or "-")
+        paragraph (string): Paragraph text
+    """
+
+    import func_ingest  # to read the paragraphs
+
+    for path in paths:
+        if path == "-":
+            paragraphs = func_ingest.filter_paragraphs(func_ingest.iter_text_paragraphs(sys.stdin), min_words)
+        else:
+            paragraphs = func_ingest.iter_paragraphs(path, min_words)
+        for paragraph in paragraphs:
+            yield path, paragraph
+
+
+def score(paths, output_format, workers, min_words, output=sys.stdout, cache=None, timings=None, export=None, language=None,
+          metrics=None, dedup=None):
+    """Scores all paragraphs of the input files and writes one record per paragraph.
+
+    Args:
+        paths (list): Paths to .docx, .txt or .xlsx files or "-" for stdin
+        output_format (string): "json" (JSON lines) or "csv"
+        workers (int): Number of worker processes
+        min_words (int): Paragraphs with fewer words are skipped
+        output (file): Output stream
+        cache (ResultCache): Optional result cache (see `func_cache`)
+        timings (Timings): Optional collector of the stage timings (see `func_timing`)
+        export (ResultWriter): Optional export file (see `func_export`, with the extra column "file"),
+            replaces the output stream
+        language (string): Language (see `func_language`), "auto" to detect it per paragraph, default: config
+        metrics (list): Result keys to be calculated and written (see `func_metrics`), default: all
+        dedup (Deduplicator): Optional deduplication of repeated paragraphs (see `func_dedup`)
+
+    Returns:
+        count (int): Number of scored paragraphs
+    """
+
+    import func_batch  # to analyze the paragraphs
+    import func_readability as rc  # to get the export columns
+
+    sources = deque()  # results are returned in input order
+
+    def paragraphs():
+        for source, paragraph in iter_input_paragraphs(paths, min_words):
+            sources.append(source)
+            yield paragraph
+
+    keys = None  # all result keys (json), export columns (csv)
+    if metrics is not None:
+        keys = ['Observation No.'] + [key for key in metrics if key != 'Observation No.']
+
+    writer = None
+    if export is None and output_format == "csv":
+        writer = csv.DictWriter(output, fieldnames=['file'] + (keys or rc.export_columns), extrasaction='ignore')
+        writer.writeheader()
+
+    count = 0
+    for observation_stats in func_batch.iter_analyze(paragraphs(), workers=workers, cache=cache, timings=timings, language=language,
+                                                     metrics=metrics, dedup=dedup):
+        source = sources.popleft()
+        if export is not None:
+            export.write(observation_stats, source)
+        else:
+            record = {'file': source, **({key: observation_stats[key] for key in keys} if keys else observation_stats)}
+            if writer is not None:
+                writer.writerow(record)
+            else:
+                output.write(json.dumps(record) + "\n")
+        count += 1
+
+    return count
+
+
+def measure_cold_start(runs=3):
+    """Measures the wall time of a fresh interpreter scoring a short text from stdin.
+
+    Args:
+        runs (int): Number of measurements
+
+    Returns:
+        cold_start (dict): Times per run, best and median time, target and result
+    """
+
+    command = [sys.executable, os.path.abspath(__file__), "-", "--workers", "1"]
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, input=cold_start_sample, text=True, capture_output=True, check=True)
+        times.append(round(time.perf_counter() - start, 3))
+
+    return {
+        'runs': times,
+        'best_seconds': min(times),
+        'median_seconds': statistics.median(times),
+        'target_seconds': cold_start_target_seconds,
+        'within_target': statistics.median(times) <= cold_start_target_seconds,
+    }
+
+
+def main(argv=None):
+    """Parses the command line arguments and runs the scoring or the cold start measurement."""
+
+    parser = argparse.ArgumentParser(description="Score the readability of report paragraphs.")
+    parser.add_argument("paths", nargs="*", default=["-"], help='.docx, .txt or .xlsx files, "-" for stdin (default)')
+    parser.add_argument("--format", choices=["json", "csv"], default="json", help="output format (json = JSON lines)")
+    parser.add_argument("--workers", type=int, default=1, help="number of worker processes (default: 1)")
+    parser.add_argument("--min-words", type=int, default=5, help="skip paragraphs with fewer words (default: 5)")
+    parser.add_argument("--cache-db", help="SQLite file to cache the results across runs")
+    parser.add_argument("--cold-start", action="store_true", help="measure the start-up time against the target")
+    parser.add_argument("--timing", action="store_true", help="write the stage timings as JSON line to stderr")
+    parser.add_argument("--profile", choices=["off", "cprofile", "tracemalloc"], default="off",
+                        help="profile the scoring, report to stderr (cprofile: use --workers 1)")
+    parser.add_argument("--output", help="export file instead of stdout: .csv, .jsonl or .parquet (optionally .gz/.bz2/.xz), "
+                                         "written in batches (see section [EXPORT] of the config)")
+    parser.add_argument("--columns", help="exported columns, comma separated (default: config or export columns)")
+    parser.add_argument("--compression", help="compression of the export file (csv/jsonl: gzip, bz2, xz; parquet: snappy, gzip, zstd)")
+    parser.add_argument("--sentiment", choices=["textblob", "lexicon", "off"],
+                        help="sentiment backend (lexicon: fast, batched; off: no sentiment analysis) "
+                             "(default: section [SENTIMENT] of the config)")
+    parser.add_argument("--language", help='language profile, e.g. en, de, fr, or "auto" to detect it per paragraph '
+                                           "(default: section [LANGUAGE] of the config)")
+    parser.add_argument("--large", action="store_true", help="score every input file as one plain text in constant memory "
+                                                             "(large-input mode), one JSON line per file")
+    parser.add_argument("--top", type=int, default=10, help="longest sentences reported in the large-input mode (default: 10)")
+    parser.add_argument("--metrics", help='result keys to be calculated, comma separated, or "triage" (EFLAW and Gunning FOG); '
+                                          "only the metrics needed for them run (default: all)")
+    parser.add_argument("--dedup", choices=["exact", "near"], help="analyze repeated paragraphs once: exact (same normalized text) "
+                                                                   "or near (also paragraphs differing in a few words), stats to stderr")
+    args = parser.parse_args(argv)
+
+    if args.cold_start:
+        cold_start = measure_cold_start()
+        print(json.dumps(cold_start))
+        return 0 if cold_start['within_target'] else 1
+
+    import func_sentiment  # to select the sentiment backend
+    try:
+        func_sentiment.set_backend(args.sentiment or load_sentiment_backend(CONFIG_FILE))
+    except ValueError as error:
+        parser.error(f"{error} (section [SENTIMENT] of {CONFIG_FILE})")
+
+    if args.language:
+        import func_language  # to check the language
+        if args.language != func_language.AUTO and args.language not in func_language.profiles()[0]:
+            parser.error(f"unknown language: {args.language} (use one of {', '.join(func_language.profiles()[0])} or {func_language.AUTO})")
+
+    if args.large:
+        import func_largefile  # to score the files in pieces
+        for path in args.paths:
+            print(json.dumps(func_largefile.analyze_large_file(path, args.language, top_n=args.top).to_dict()))
+        return 0
+
+    metrics = None
+    if args.metrics:
+        import func_metrics  # to check the result keys
+        metrics = list(func_metrics.TRIAGE) if args.metrics == "triage" else [key.strip() for key in args.metrics.split(",") if key.strip()]
+        try:
+            func_metrics.plan(metrics)
+        except ValueError as error:
+            parser.error(str(error))
+
+    cache = None
+    if args.cache_db:
+        from func_cache import ResultCache
+        cache = ResultCache(db_path=args.cache_db)
+
+    dedup = None
+    if args.dedup:
+        import func_dedup  # to group the repeated paragraphs
+        dedup = func_dedup.Deduplicator(near=args.dedup == "near")
+
+    import func_timing  # to time and profile the scoring
+    timings = None
+    if args.timing:
+        logging.basicConfig(stream=sys.stderr, level=logging.INFO, format="%(message)s")
+        timings = func_timing.Timings()
+
+    export = None
+    if args.output:
+        import func_export  # to stream the results to the export file
+        columns = [column.strip() for column in args.columns.split(",") if column.strip()] if args.columns else None
+        fmt = func_export.format_of(args.output)[0] or {'json': "jsonl"}.get(args.format, args.format)
+        try:
+            export = func_export.open_writer(args.output, fmt, columns or metrics, args.compression, extra_columns=['file'])
+        except ValueError as error:
+            parser.error(str(error))
+
+    with func_timing.capture(args.profile) as profile_report:
+        if export is None:
+            count = score(args.paths, args.format, args.workers, args.min_words, cache=cache, timings=timings, language=args.language,
+                          metrics=metrics, dedup=dedup)
+        else:
+            with export:
+                count = score(args.paths, args.format, args.workers, args.min_words, cache=cache, timings=timings, export=export,
+                              language=args.language, metrics=metrics, dedup=dedup)
+    if timings is not None:
+        timings.log(source="cli", paragraphs=count, workers=args.workers)
+    for report in profile_report.values():
+        print(report, file=sys.stderr)
+    if cache is not None:
+        print(json.dumps({'cache': cache.stats()}), file=sys.stderr)
+        cache.close()
+    if dedup is not None:
+        print(json.dumps({'dedup': dedup.stats()}), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
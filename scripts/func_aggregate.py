@@ -0,0 +1,286 @@
+"""
+## Purpose
+Containing the **corpus aggregates** of a batch run (e.g. all audit reports of a year). The aggregates are
+updated result by result, hence a corpus summary does not hold the results (no DataFrame of all results):
+
+- EFLAW and Gunning FOG distribution per group (e.g. business unit or report): streaming quantile sketch
+  (relative accuracy, see `QuantileSketch`), mean, minimum, maximum and the EFLAW ranks
+- most frequent jargon and words to be simplified (observations containing them)
+- longest sentences of the corpus (top-N heap)
+
+Aggregates of several worker processes are merged (`merge`), the result is the same as aggregating all
+results in one process (see `func_batch.aggregate_many`).
+
+## Key Elements/Variables
+### QuantileSketch (class)
+Mergeable quantile sketch: the values are counted in logarithmic buckets, a quantile is within
+`relative_accuracy` of the exact value (DDSketch).
+
+### TopN (class)
+Mergeable heap of the N items with the largest keys.
+
+### CorpusAggregate (class)
+Sketches per group, phrase counters and the longest sentences, `summary()` returns the dashboard numbers.
+
+## Usage
+```python3 linenums="1"
+import func_aggregate, func_batch
+aggregate = func_aggregate.CorpusAggregate(top_n=100)
+for observation_stats in func_batch.iter_analyze(texts, metrics=func_aggregate.SUMMARY_METRICS):
+    aggregate.add(observation_stats, group="Finance")
+aggregate.summary()['groups']['Finance']['eflaw']  # {'count': 812, 'mean': 21.3, 'p50': 20.8, ...}
+```
+---
+# Functions
+"""
+
+## Packages
+import heapq  # to keep the longest sentences
+import math  # to calculate the buckets of the quantile sketch
+from collections import Counter  # to count the buckets, ranks and phrases
+
+
+# --- Global Parameters ---
+default_relative_accuracy = 0.01  # quantiles within 1% of the exact value
+default_top_n = 100  # longest sentences kept
+default_top_phrases = 20  # phrases listed in the summary
+QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)  # quantiles of the summary
+## Result keys needed for the aggregates (see `func_metrics`), e.g. no sentiment and no difficult words
+SUMMARY_METRICS = ("eflaw_score", "eflaw_rank", "gunning_fog_score", "sentence_length_dict", "long_sentences", "words",
+                   "jargon_checklist_dict", "simplewords_checklist_dict")
+# --- Global Parameters ---
+
+
+class QuantileSketch:
+    """Mergeable quantile sketch (see module description). Values of 0 or less are counted as 0.
+
+    Args:
+        relative_accuracy (float): Maximum relative error of a quantile
+    """
+
+    __slots__ = ("relative_accuracy", "_gamma", "count", "total", "zeros", "buckets", "minimum", "maximum")
+
+    def __init__(self, relative_accuracy=default_relative_accuracy):
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.count = 0
+        self.total = 0.0
+        self.zeros = 0
+        self.buckets = Counter()  # bucket index: values, bucket k holds (gamma^(k-1), gamma^k]
+        self.minimum = None
+        self.maximum = None
+
+    def add(self, value):
+        """Adds a value (None is skipped)."""
+        if value is None:
+            return
+        self.count += 1
+        self.total += value
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+        if value <= 0:
+            self.zeros += 1
+        else:
+            self.buckets[math.ceil(math.log(value, self._gamma))] += 1
+
+    def merge(self, other):
+        """Adds the values of another sketch (same relative accuracy)."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError(f"Sketches with different accuracy: {self.relative_accuracy} and {other.relative_accuracy}")
+        if not other.count:
+            return
+        self.count += other.count
+        self.total += other.total
+        self.zeros += other.zeros
+        self.buckets.update(other.buckets)
+        self.minimum = other.minimum if self.minimum is None else min(self.minimum, other.minimum)
+        self.maximum = other.maximum if self.maximum is None else max(self.maximum, other.maximum)
+
+    def quantile(self, q):
+        """Returns the q-quantile (0 to 1), None if no value was added."""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zeros
+        if rank < seen:
+            return max(self.minimum, 0.0)
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                value = 2 * self._gamma ** index / (self._gamma + 1)  # middle of the bucket (relative)
+                return min(max(value, self.minimum), self.maximum)
+        return self.maximum
+
+    def mean(self):
+        """Returns the mean, None if no value was added."""
+        return self.total / self.count if self.count else None
+
+    def summary(self, quantiles=QUANTILES, points=1):
+        """Returns count, mean, minimum, quantiles (e.g. "p50") and maximum, rounded."""
+        def rounded(value):
+            return None if value is None else round(value, points)
+
+        summary = {'count': self.count, 'mean': rounded(self.mean()), 'min': rounded(self.minimum)}
+        for q in quantiles:
+            summary[f"p{round(q * 100):g}"] = rounded(self.quantile(q))
+        summary['max'] = rounded(self.maximum)
+
+        return summary
+
+
+class TopN:
+    """Mergeable heap of the N items with the largest keys (ties: the item with the larger key tuple)."""
+
+    __slots__ = ("n", "_heap")
+
+    def __init__(self, n=default_top_n):
+        self.n = n
+        self._heap = []  # (key, item), smallest key first
+
+    def push(self, key, item):
+        """Adds an item if its key is among the N largest."""
+        if len(self._heap) < self.n:
+            heapq.heappush(self._heap, (key, item))
+        elif (key, item) > self._heap[0]:
+            heapq.heapreplace(self._heap, (key, item))
+
+    def merge(self, other):
+        """Adds the items of another heap."""
+        for key, item in other._heap:
+            self.push(key, item)
+
+    def items(self):
+        """Returns the items, largest key first."""
+        return [item for key, item in sorted(self._heap, reverse=True)]
+
+    def __len__(self):
+        return len(self._heap)
+
+
+class GroupAggregate:
+    """Aggregates of one group: observations, words, long sentences, EFLAW and Gunning FOG sketches, EFLAW ranks."""
+
+    __slots__ = ("observations", "words", "long_sentences", "eflaw", "gunning_fog", "eflaw_ranks")
+
+    def __init__(self, relative_accuracy=default_relative_accuracy):
+        self.observations = 0
+        self.words = 0
+        self.long_sentences = 0
+        self.eflaw = QuantileSketch(relative_accuracy)
+        self.gunning_fog = QuantileSketch(relative_accuracy)
+        self.eflaw_ranks = Counter()
+
+    def add(self, observation_stats):
+        self.observations += 1
+        self.words += observation_stats.words or 0
+        self.long_sentences += observation_stats.long_sentences or 0
+        self.eflaw.add(observation_stats.eflaw_value)
+        self.gunning_fog.add(observation_stats.gunning_fog_value)
+        if observation_stats.eflaw_rank is not None:
+            self.eflaw_ranks[observation_stats.eflaw_rank] += 1
+
+    def merge(self, other):
+        self.observations += other.observations
+        self.words += other.words
+        self.long_sentences += other.long_sentences
+        self.eflaw.merge(other.eflaw)
+        self.gunning_fog.merge(other.gunning_fog)
+        self.eflaw_ranks.update(other.eflaw_ranks)
+
+    def summary(self, quantiles=QUANTILES):
+        return {
+            'observations': self.observations,
+            'words': self.words,
+            'long_sentences': self.long_sentences,
+            'eflaw': self.eflaw.summary(quantiles),
+            'gunning_fog': self.gunning_fog.summary(quantiles),
+            'eflaw_ranks': dict(self.eflaw_ranks.most_common()),
+        }
+
+
+class CorpusAggregate:
+    """Corpus aggregates, updated result by result (see module description).
+
+    Args:
+        top_n (int): Longest sentences kept
+        relative_accuracy (float): Maximum relative error of the quantiles
+    """
+
+    def __init__(self, top_n=default_top_n, relative_accuracy=default_relative_accuracy):
+        self.top_n = top_n
+        self.relative_accuracy = relative_accuracy
+        self.groups = {}  # group name: GroupAggregate, in order of the first result
+        self.phrases = {'jargon': Counter(), 'simplewords': Counter()}  # word list: phrase and observations containing it
+        self.alternatives = {'jargon': {}, 'simplewords': {}}  # word list: phrase and alternative
+        self.longest_sentences = TopN(top_n)
+
+    def spawn(self):
+        """Returns an empty aggregate with the same settings (e.g. for a worker process)."""
+        return CorpusAggregate(self.top_n, self.relative_accuracy)
+
+    def group(self, name):
+        """Returns the aggregates of a group (created on first use)."""
+        if name not in self.groups:
+            self.groups[name] = GroupAggregate(self.relative_accuracy)
+        return self.groups[name]
+
+    def add(self, observation_stats, group=None):
+        """Adds the results of one observation.
+
+        Args:
+            observation_stats (ObservationResult): Results (see `SUMMARY_METRICS` for the required results)
+            group (string): Group of the observation, e.g. business unit or report, None: one group
+        """
+
+        self.group(group).add(observation_stats)
+        for name, hits in (('jargon', observation_stats.jargon_hits), ('simplewords', observation_stats.simplewords_hits)):
+            for phrase, alternative in hits or ():
+                self.phrases[name][phrase] += 1
+                self.alternatives[name].setdefault(phrase, alternative)
+        ## Longest first, on a tie the earlier sentence (observation no., sentence no.)
+        for sentence_no, (words, text) in enumerate(zip(observation_stats.sentence_lengths or (),
+                                                        observation_stats.sentence_texts or ()), start=1):
+            self.longest_sentences.push((words, -observation_stats.observation_no, -sentence_no),
+                                        (group, observation_stats.observation_no, sentence_no, words, text))
+
+    def merge(self, other):
+        """Adds the aggregates of another CorpusAggregate (e.g. of a worker process)."""
+        for name, group in other.groups.items():
+            self.group(name).merge(group)
+        for name, counter in other.phrases.items():
+            self.phrases[name].update(counter)
+            for phrase, alternative in other.alternatives[name].items():
+                self.alternatives[name].setdefault(phrase, alternative)
+        self.longest_sentences.merge(other.longest_sentences)
+
+    def total(self):
+        """Returns the aggregates of all groups."""
+        total = GroupAggregate(self.relative_accuracy)
+        for group in self.groups.values():
+            total.merge(group)
+        return total
+
+    def summary(self, quantiles=QUANTILES, top_phrases=default_top_phrases):
+        """Returns the corpus summary.
+
+        Args:
+            quantiles (tuple): Quantiles of the scores (0 to 1)
+            top_phrases (int): Most frequent jargon and simple words listed
+
+        Returns:
+            summary (dict): total and groups (observations, words, long sentences, 'eflaw' and 'gunning_fog'
+                distribution, EFLAW ranks), 'jargon' and 'simplewords' (phrase, alternative, observations),
+                'longest_sentences' (one dictionary per sentence, longest first)
+        """
+
+        summary = {
+            'total': self.total().summary(quantiles),
+            'groups': {name: group.summary(quantiles) for name, group in self.groups.items()},
+        }
+        for name, counter in self.phrases.items():
+            summary[name] = [(phrase, self.alternatives[name][phrase], count) for phrase, count in counter.most_common(top_phrases)]
+        summary['longest_sentences'] = [{'group': group, 'Observation No.': observation_no, 'Sentence No': sentence_no,
+                                         'Words': words, 'Sentence': text}
+                                        for group, observation_no, sentence_no, words, text in self.longest_sentences.items()]
+
+        return summary
@@ -0,0 +1,349 @@
+"""
+## Purpose
+Containing the **batch analysis** of many observations (e.g. all observation paragraphs of audit reports).
+The readability checks are CPU-bound pure Python, hence the observations are distributed over a
+**process pool** in chunks. The results are returned in the order of the input texts.
+`iter_analyze` streams the results and keeps only a few chunks in flight (bounded memory).
+The texts of a chunk are analyzed grouped by language (see `func_language`), hence a mixed-language
+batch switches the textstat language and the word lists once per language and chunk.
+With `metrics` only the requested results are calculated (see `func_metrics`), e.g. a triage by EFLAW and
+Gunning FOG skips the checkers and the sentiment.
+With `dedup` repeated boilerplate paragraphs are analyzed once per group (see `func_dedup`).
+`aggregate_many` returns corpus aggregates instead of the results: every worker aggregates its chunks and only
+the (mergeable) aggregates are sent back (see `func_aggregate`).
+
+## Usage
+```python3 linenums="1"
+import func_batch
+results = func_batch.analyze_many(texts, workers=8)
+triage = func_batch.analyze_many(texts, workers=8, metrics=func_metrics.TRIAGE)
+results = func_batch.analyze_many(texts, workers=8, dedup=func_dedup.Deduplicator())
+summary = func_batch.aggregate_many(texts, groups=units, workers=8).summary()
+```
+---
+# Functions
+"""
+
+## Packages
+import math  # to calculate the chunk size
+import os  # to get the number of CPU cores
+from collections import deque  # to keep the pending chunks in input order
+from itertools import islice  # to cut the input texts into chunks
+from concurrent.futures import Future, ProcessPoolExecutor  # to run the checks on all cores
+import func_readability as rc  # to import the readability algorithms
+import func_language  # to group the texts by language
+import func_metrics  # to skip the sentiment if it is not requested
+import func_sentiment  # to score the sentiment of a chunk at once
+import func_cache  # to skip texts analyzed before
+import func_aggregate  # to aggregate the results of a chunk
+import func_timing  # to time the readability stages
+
+
+def init_worker(sentiment_backend=func_sentiment.default_backend):
+    """Warms up a worker process: imports textstat, loads the word lists and compiles the phrase matchers once.
+    The word classifier (and its memo) is kept for all chunks of the worker.
+
+    Args:
+        sentiment_backend (string): Sentiment backend of the main process (see `func_sentiment`)
+    """
+    func_sentiment.set_backend(sentiment_backend)
+    rc.get_textstat()
+    rc.load_external_lists()
+    rc.lexicon_cache.matcher('jargon')
+    rc.lexicon_cache.matcher('simplewords')
+    rc.lexicon_cache.classifier()
+
+
+def default_chunksize(amount_of_texts, workers):
+    """Returns the number of texts sent to a worker at once (about four chunks per worker).
+
+    Args:
+        amount_of_texts (int): Number of texts to be analyzed
+        workers (int): Number of worker processes
+
+    Returns:
+        chunksize (int): Number of texts per chunk
+    """
+
+    return max(1, math.ceil(amount_of_texts / (workers * 4)))
+
+
+def analyze_chunk(items, language=None, metrics=None, timings=None):
+    """Runs the readability checks for a chunk of texts (executed in a worker process).
+    The texts are analyzed grouped by language, the sentiment of all texts of a language is scored at once.
+
+    Args:
+        items (list): Tuples (iterator, observation text)
+        language (string): Language (see `func_language`), "auto" to detect it per text, default: configured default
+        metrics (list): Result keys to be calculated (see `func_metrics`), default: all
+        timings (Timings): Optional collector of the stage timings (see `func_timing`)
+
+    Returns:
+        observation_stats_list (list): One ObservationResult per text
+    """
+
+    timings = timings or func_timing.null_timings
+    scored = "sentiment" in func_metrics.plan(metrics)
+    results = {}
+    for name, group in func_language.group_by_language(items, language).items():
+        texts = [text for _, text in group]
+        if scored and func_language.get_profile(name).sentiment:
+            with timings.span('sentiment'):
+                sentiments = func_sentiment.get_backend().score_many(texts)
+        else:
+            sentiments = [(None, None)] * len(texts)
+        for (i, text), sentiment in zip(group, sentiments):
+            results[i] = rc.analyze_observation(i, text, timings, sentiment, name, metrics)
+
+    return [results[i] for i, _ in items]
+
+
+def analyze_chunk_timed(items, language=None, metrics=None):
+    """Runs all readability checks for a chunk of texts and times the stages (see `analyze_chunk`).
+
+    Returns:
+        observation_stats_list (list): One ObservationResult per text
+        totals (dict): Seconds per stage
+    """
+
+    timings = func_timing.Timings()
+    observation_stats_list = analyze_chunk(items, language, metrics, timings)
+
+    return observation_stats_list, timings.totals()
+
+
+class InlineExecutor:
+    """Runs the chunks in this process (one worker), same interface as the process pool."""
+
+    def submit(self, function, *args):
+        future = Future()
+        try:
+            future.set_result(function(*args))
+        except BaseException as error:
+            future.set_exception(error)
+        return future
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+def iter_analyze(texts, workers=None, chunksize=16, cache=None, timings=None, language=None, metrics=None, dedup=None):
+    """Runs the readability checks for many texts and yields the results in input order.
+    The texts are consumed lazily: at most two chunks per worker are pending at any time.
+
+    Args:
+        texts (iterable): Observation texts (e.g. a generator from `func_ingest.iter_paragraphs`)
+        workers (int): Number of worker processes, default: number of CPU cores. 1 runs in-process.
+        chunksize (int): Number of texts sent to a worker at once
+        cache (ResultCache): Optional result cache (see `func_cache`), only cache misses are analyzed
+        timings (Timings): Optional collector of the stage timings (see `func_timing`). The stage timings
+            of the worker processes are summed up, "wait" is the time spent waiting for the workers.
+        language (string): Language (see `func_language`), "auto" to detect it per text, default: configured default
+        metrics (list): Result keys to be calculated (see `func_metrics`), default: all
+        dedup (Deduplicator): Optional deduplication (see `func_dedup`), only the first text of a group of
+            duplicates is analyzed, the other texts of the group get its results
+
+    Yields:
+        observation_stats (ObservationResult): Result per text
+    """
+
+    if dedup is None:
+        yield from _iter_analyze(texts, workers, chunksize, cache, timings, language, metrics)
+        return
+
+    plan = deque()  # (group, first) per text not yet yielded, in input order
+
+    def representatives():
+        for text in texts:
+            group, first = dedup.assign(text)
+            plan.append((group, first))
+            if first:
+                yield text
+
+    ## The first text of a group is before its duplicates, hence its results are known when they are yielded
+    analyzed = _iter_analyze(representatives(), workers, chunksize, cache, timings, language, metrics)
+    position = 0
+    for observation_stats in analyzed:
+        group, first = plan.popleft()
+        while not first:  # duplicates before the next first text
+            yield func_cache.renumber(group.result, position)
+            position += 1
+            group, first = plan.popleft()
+        group.result = observation_stats
+        yield func_cache.renumber(observation_stats, position)
+        position += 1
+    for group, _ in plan:  # duplicates after the last first text
+        yield func_cache.renumber(group.result, position)
+        position += 1
+
+
+def _iter_analyze(texts, workers, chunksize, cache, timings, language, metrics):
+    """Runs the readability checks for many texts and yields the results in input order (see `iter_analyze`)."""
+
+    workers = workers or os.cpu_count() or 1
+    timings = timings or func_timing.null_timings
+    timed = timings is not func_timing.null_timings
+
+    if workers <= 1:
+        executor = InlineExecutor()
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                       initargs=(func_sentiment.get_backend().name,))
+
+    version = rc.scoring_version(language, metrics) if cache is not None else None
+    texts = iter(texts)
+    start = 0
+    pending = deque()  # (start, results incl. cache hits, keys, future for the misses)
+    inflight = {}  # key: number of pending texts with this key (repeats are analyzed once)
+    fresh = {}  # key: results of an in-flight key, until all its repeats are yielded
+    with executor as pool:
+        while True:
+            ## Fill the pipeline up to two chunks per worker
+            while len(pending) < workers * 2:
+                chunk = list(islice(texts, chunksize))
+                if not chunk:
+                    break
+                results = [None] * len(chunk)
+                keys = [None] * len(chunk)
+                misses = []
+                for k, text in enumerate(chunk):
+                    if cache is not None:
+                        key = keys[k] = cache.key(text, version)
+                        if key in inflight:
+                            inflight[key] += 1
+                            continue
+                        cached = cache.get(key)
+                        if cached is not None:
+                            results[k] = func_cache.renumber(cached, start + k)
+                            continue
+                        inflight[key] = 1
+                    misses.append((start + k, text))
+                future = pool.submit(analyze_chunk_timed if timed else analyze_chunk, misses, language, metrics) if misses else None
+                pending.append((start, results, keys, future))
+                start += len(chunk)
+            if not pending:
+                break
+
+            chunk_start, results, keys, future = pending.popleft()
+            analyzed = iter(())
+            if future is not None:
+                with timings.span('wait'):
+                    analyzed = future.result()
+                if timed:
+                    analyzed, totals = analyzed
+                    timings.merge(totals)
+                analyzed = iter(analyzed)
+            for k, observation_stats in enumerate(results):
+                if observation_stats is not None:
+                    continue
+                key = keys[k]
+                if key is None:
+                    results[k] = next(analyzed)
+                    continue
+                if key in fresh:
+                    results[k] = func_cache.renumber(fresh[key], chunk_start + k)
+                else:
+                    results[k] = fresh[key] = next(analyzed)
+                    cache.put(key, results[k])
+                inflight[key] -= 1
+                if not inflight[key]:
+                    del inflight[key]
+                    del fresh[key]
+            yield from results
+
+
+def analyze_many(texts, workers=None, chunksize=None, cache=None, timings=None, language=None, metrics=None, dedup=None):
+    """Runs the readability checks (see `func_readability.analyze_observation`) for many texts.
+
+    Args:
+        texts (iterable): Observation texts
+        workers (int): Number of worker processes, default: number of CPU cores. 1 runs in-process.
+        chunksize (int): Number of texts sent to a worker at once, default: see `default_chunksize`
+        cache (ResultCache): Optional result cache (see `func_cache`)
+        timings (Timings): Optional collector of the stage timings (see `func_timing`)
+        language (string): Language (see `func_language`), "auto" to detect it per text, default: configured default
+        metrics (list): Result keys to be calculated (see `func_metrics`), default: all
+        dedup (Deduplicator): Optional deduplication (see `func_dedup`)
+
+    Returns:
+        observation_stats_list (list): One ObservationResult per text, in input order
+    """
+
+    texts = list(texts)
+    workers = workers or os.cpu_count() or 1
+    workers = min(workers, len(texts)) if texts else 1
+    chunksize = chunksize or default_chunksize(len(texts), workers)
+
+    return list(iter_analyze(texts, workers=workers, chunksize=chunksize, cache=cache, timings=timings, language=language, metrics=metrics,
+                             dedup=dedup))
+
+
+def aggregate_chunk(items, groups, language=None, aggregate=None):
+    """Runs the readability checks for a chunk of texts and aggregates the results (executed in a worker process).
+
+    Args:
+        items (list): Tuples (iterator, observation text)
+        groups (list): Group per text (e.g. business unit)
+        language (string): Language (see `func_language`), "auto" to detect it per text, default: configured default
+        aggregate (CorpusAggregate): Empty aggregate with the settings (see `func_aggregate`)
+
+    Returns:
+        aggregate (CorpusAggregate): Aggregates of the chunk
+    """
+
+    aggregate = aggregate if aggregate is not None else func_aggregate.CorpusAggregate()
+    for observation_stats, group in zip(analyze_chunk(items, language, func_aggregate.SUMMARY_METRICS), groups):
+        aggregate.add(observation_stats, group)
+
+    return aggregate
+
+
+def aggregate_many(texts, groups=None, workers=None, chunksize=16, language=None, aggregate=None):
+    """Runs the readability checks for many texts and returns the corpus aggregates (see `func_aggregate`).
+    The texts are consumed lazily and no results are kept: at most two chunks per worker are pending at
+    any time, the aggregates of the chunks are merged in input order.
+
+    Args:
+        texts (iterable): Observation texts
+        groups (iterable): Group per text (e.g. business unit or report), default: one group (None)
+        workers (int): Number of worker processes, default: number of CPU cores. 1 runs in-process.
+        chunksize (int): Number of texts sent to a worker at once
+        language (string): Language (see `func_language`), "auto" to detect it per text, default: configured default
+        aggregate (CorpusAggregate): Aggregate to be updated (e.g. of a previous batch), default: new aggregate
+
+    Returns:
+        aggregate (CorpusAggregate): Corpus aggregates
+    """
+
+    workers = workers or os.cpu_count() or 1
+    aggregate = aggregate if aggregate is not None else func_aggregate.CorpusAggregate()
+
+    if workers <= 1:
+        executor = InlineExecutor()
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                       initargs=(func_sentiment.get_backend().name,))
+
+    texts = iter(texts)
+    groups = iter(groups) if groups is not None else None
+    start = 0
+    pending = deque()
+    with executor as pool:
+        while True:
+            while len(pending) < workers * 2:
+                chunk = list(islice(texts, chunksize))
+                if not chunk:
+                    break
+                labels = list(islice(groups, len(chunk))) if groups is not None else []
+                labels += [None] * (len(chunk) - len(labels))
+                items = list(enumerate(chunk, start))
+                pending.append(pool.submit(aggregate_chunk, items, labels, language, aggregate.spawn()))
+                start += len(chunk)
+            if not pending:
+                break
+            aggregate.merge(pending.popleft().result())
+
+    return aggregate
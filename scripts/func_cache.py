@@ -0,0 +1,156 @@
+"""
+## Purpose
+Containing the **result cache**. Audit reports reuse a lot of boilerplate and the Quick Check is often run
+again on an unchanged text, hence the results are cached by the content of the text.
+
+## Key Elements/Variables
+### ResultCache (class)
+- Key: SHA-256 of the text and `func_readability.scoring_version()` (rules, thresholds, word lists).
+  The text is hashed as is: every character, incl. whitespace, can change the sentence texts in the results.
+- Tier 1: in-memory LRU
+- Tier 2 (optional): SQLite file, persists across restarts and can be shared by processes
+- `stats()`: hit/miss counters
+---
+# Functions
+"""
+
+## Packages
+import hashlib  # to hash the text
+import pickle  # to store the results in SQLite
+import sqlite3  # for the on-disk tier
+import threading  # to guard the cache (Streamlit sessions run in threads)
+from collections import OrderedDict  # for the in-memory LRU tier
+import func_readability as rc  # to get the scoring version and analyze misses
+
+
+class ResultCache:
+    """Two-tier (memory + optional SQLite) cache of analysis results.
+
+    Args:
+        max_items (int): Maximum number of results in memory
+        db_path (string): Path to the SQLite file, None: memory only
+    """
+
+    def __init__(self, max_items=1024, db_path=None):
+        self.max_items = max(1, int(max_items))
+        self.db_path = db_path
+        self._memory = OrderedDict()  # key: observation_stats
+        self._lock = threading.Lock()
+        self._db = None
+        self.hits_memory = 0
+        self.hits_disk = 0
+        self.misses = 0
+
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, result BLOB NOT NULL)")
+            self._db.commit()
+
+    def key(self, observation, version=None):
+        """Returns the cache key of a text.
+
+        Args:
+            observation (string): Observation text
+            version (string): Scoring version, default: `func_readability.scoring_version()`
+
+        Returns:
+            key (string): Hex digest
+        """
+
+        version = rc.scoring_version() if version is None else version
+
+        return hashlib.sha256(f"{version}\0{observation}".encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """Returns the cached results (or None). Results found on disk are added to the memory tier."""
+        with self._lock:
+            observation_stats = self._memory.get(key)
+            if observation_stats is not None:
+                self._memory.move_to_end(key)
+                self.hits_memory += 1
+                return observation_stats
+
+            if self._db is not None:
+                row = self._db.execute("SELECT result FROM results WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    observation_stats = pickle.loads(row[0])
+                    self._remember(key, observation_stats)
+                    self.hits_disk += 1
+                    return observation_stats
+
+            self.misses += 1
+            return None
+
+    def put(self, key, observation_stats):
+        """Stores the results in memory and (if enabled) on disk."""
+        with self._lock:
+            self._remember(key, observation_stats)
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO results (key, result) VALUES (?, ?)",
+                                 (key, pickle.dumps(observation_stats, protocol=pickle.HIGHEST_PROTOCOL)))
+                self._db.commit()
+
+    def _remember(self, key, observation_stats):
+        self._memory[key] = observation_stats
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+    def stats(self):
+        """Returns the hit/miss counters.
+
+        Returns:
+            stats (dict): hits_memory, hits_disk, misses, hit_ratio and items_memory
+        """
+
+        lookups = self.hits_memory + self.hits_disk + self.misses
+        return {
+            'hits_memory': self.hits_memory,
+            'hits_disk': self.hits_disk,
+            'misses': self.misses,
+            'hit_ratio': round((self.hits_memory + self.hits_disk) / lookups, 3) if lookups else 0.0,
+            'items_memory': len(self._memory),
+        }
+
+    def clear(self):
+        """Removes all results from memory and disk."""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM results")
+                self._db.commit()
+
+    def close(self):
+        """Closes the SQLite connection."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+def renumber(observation_stats, i):
+    """Returns a copy of cached results with the observation no. of iterator i."""
+    return observation_stats.renumbered(i)
+
+
+def analyze_cached(i, observation, cache, analyze=None):
+    """Runs all readability checks (see `func_readability.analyze_observation`), using the cache.
+
+    Args:
+        i (int): Iterator (the observation no. is i+1)
+        observation (string or Document): Observation text
+        cache (ResultCache): Result cache
+        analyze (function): Analysis of a cache miss, default: `func_readability.analyze_observation`
+
+    Returns:
+        observation_stats (ObservationResult): All results, statistics and details of the observation
+    """
+
+    text = observation if isinstance(observation, str) else observation.text
+    key = cache.key(text)
+    observation_stats = cache.get(key)
+    if observation_stats is None:
+        observation_stats = (analyze or rc.analyze_observation)(i, observation)
+        cache.put(key, observation_stats)
+
+    return renumber(observation_stats, i)
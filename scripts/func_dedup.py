@@ -0,0 +1,232 @@
+"""
+## Purpose
+Containing the **deduplication stage** of the batch analysis. Audit reports repeat standard paragraphs
+(disclaimers, scope statements, rating definitions) many times across a batch. The paragraphs are normalized
+(case, spaces and tabs) and grouped:
+
+- exact duplicates: same normalized text (fingerprint: BLAKE2 hash). Punctuation and line breaks are kept,
+  they end the sentences and count towards the word lengths, hence an exact duplicate has the same scores.
+- near duplicates (optional): MinHash signature of the word pairs (without punctuation), at least
+  `min_similarity` of the word pairs shared (estimated Jaccard similarity) and the same words and mini words
+  per sentence, e.g. the same disclaimer with another date or entity name. The candidates are looked up by
+  bands of the signature (locality-sensitive hashing), not compared one by one.
+
+Only the first paragraph of a group is analyzed, the other paragraphs of the group get its results
+(renumbered). A near duplicate has the same EFLAW score, the few other words are not scored (e.g. Gunning FOG,
+jargon and sentiment are those of the first paragraph).
+
+## Key Elements/Variables
+### Deduplicator (class)
+- `assign(text)`: group of a paragraph and if it is the first of its group
+- `stats()`: texts, analyzed groups, exact and near duplicates, saved share and words
+- Groups are kept least recently used (`max_groups`), a paragraph of an evicted group is analyzed again.
+
+## Usage
+```python3 linenums="1"
+import func_batch, func_dedup
+dedup = func_dedup.Deduplicator(near=True)
+results = func_batch.analyze_many(texts, workers=8, dedup=dedup)
+dedup.stats()  # {'texts': 12000, 'analyzed': 4100, 'exact_duplicates': 7600, 'near_duplicates': 300, ...}
+```
+---
+# Functions
+"""
+
+## Packages
+## numpy is imported on first use (see func_sentiment)
+import hashlib  # to hash the normalized paragraphs and the word pairs
+import re  # to collapse the spaces and remove the punctuation of the word pairs
+import threading  # to guard the groups
+from collections import OrderedDict  # for the least recently used groups
+import func_readability as rc  # to segment the sentences of the near duplicates
+
+
+# --- Global Parameters ---
+default_max_groups = 100_000  # groups kept (least recently used)
+default_min_similarity = 0.8  # share of the word pairs of a near duplicate (estimated Jaccard similarity)
+near_min_words = 8  # shorter paragraphs are only grouped as exact duplicates
+near_length_ratio = 0.9  # words of the shorter / longer paragraph of a near duplicate
+shingle_words = 2  # words per shingle of the MinHash
+signature_bands = 8  # bands of the signature (candidate lookup)
+signature_rows = 4  # hashes per band (signature: bands * rows hashes)
+# --- Global Parameters ---
+
+
+## Spaces and tabs (line breaks end a sentence and are kept)
+_pattern_spaces = re.compile(r"[ \t]+")
+## Punctuation (everything besides letters, digits and whitespace), removed from the words of the MinHash
+_pattern_punctuation = re.compile(r"[^\w\s]")
+
+
+def normalize(text):
+    """Normalizes a paragraph: lower case, single spaces. Punctuation and line breaks are kept
+    (sentence ends and word lengths of EFLAW and Gunning FOG).
+
+    Args:
+        text (string): Paragraph
+
+    Returns:
+        normalized (string): Normalized paragraph
+    """
+
+    return _pattern_spaces.sub(" ", text.lower()).strip()
+
+
+def shape(text):
+    """Returns the words and mini words per sentence of a paragraph (EFLAW of a near duplicate)."""
+    return tuple((sentence.word_count, sentence.miniword_count) for sentence in rc.get_lexicons().segmenter().segment(text))
+
+
+def fingerprint(normalized):
+    """Returns the fingerprint of a normalized paragraph (exact duplicates)."""
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).digest()
+
+
+_seeds = None
+
+
+def minhash(words):
+    """Returns the MinHash signature of the word pairs of a paragraph.
+
+    Args:
+        words (list): Words of the normalized paragraph (without punctuation)
+
+    Returns:
+        signature (tuple): `signature_bands * signature_rows` minimum hashes
+    """
+    import numpy as np  # imported on first use
+    global _seeds
+
+    if _seeds is None:  # one fixed hash function per signature position (XOR with a seed)
+        _seeds = np.frombuffer(hashlib.blake2b(b"func_dedup", digest_size=64).digest() * 4,
+                               dtype=np.uint64)[:signature_bands * signature_rows].copy()
+        _seeds ^= np.arange(len(_seeds), dtype=np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+    shingles = {" ".join(words[i:i + shingle_words]) for i in range(max(1, len(words) - shingle_words + 1))}
+    hashes = np.frombuffer(b"".join(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest() for shingle in shingles),
+                           dtype=np.uint64)
+
+    return tuple((hashes[:, None] ^ _seeds[None, :]).min(axis=0).tolist())
+
+
+def similarity(a, b):
+    """Returns the estimated Jaccard similarity of two MinHash signatures (share of equal hashes)."""
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+class Group:
+    """Paragraphs with the same (or a near) fingerprint, analyzed once."""
+
+    __slots__ = ("key", "signature", "words", "shape", "bands", "result")
+
+    def __init__(self, key, signature, words, shape, bands):
+        self.key = key  # fingerprint of the first paragraph
+        self.signature = signature  # MinHash signature, None: exact duplicates only
+        self.words = words  # words of the first paragraph
+        self.shape = shape  # words and mini words per sentence, None: exact duplicates only
+        self.bands = bands  # bands of the signature (near duplicate index)
+        self.result = None  # results of the first paragraph (set by the batch analysis)
+
+
+class Deduplicator:
+    """Groups exact and near duplicate paragraphs (see module description).
+
+    Args:
+        near (bool): Group near duplicates too (MinHash), otherwise exact duplicates only
+        min_similarity (float): Share of the word pairs of a near duplicate
+        max_groups (int): Groups kept (least recently used)
+    """
+
+    def __init__(self, near=False, min_similarity=default_min_similarity, max_groups=default_max_groups):
+        self.near = near
+        self.min_similarity = float(min_similarity)
+        self.max_groups = max(1, int(max_groups))
+        self._groups = OrderedDict()  # fingerprint: Group
+        self._bands = [{} for _ in range(signature_bands)]  # band: groups
+        self._lock = threading.Lock()
+        self.texts = 0
+        self.exact_duplicates = 0
+        self.near_duplicates = 0
+        self.saved_words = 0
+
+    def _find_near(self, signature, words, sentences, bands):
+        """Returns the group of a near duplicate (shares a band, is similar enough and has the same words and
+        mini words per sentence), None if there is none."""
+        for index, band in zip(self._bands, bands):
+            for group in index.get(band, ()):
+                if (min(words, group.words) >= near_length_ratio * max(words, group.words)
+                        and similarity(signature, group.signature) >= self.min_similarity
+                        and sentences == group.shape):
+                    return group
+        return None
+
+    def assign(self, text):
+        """Returns the group of a paragraph.
+
+        Args:
+            text (string): Paragraph
+
+        Returns:
+            group (Group): Group of the paragraph (its `result` is set after the first paragraph is analyzed)
+            first (bool): True if the paragraph is the first of its group (to be analyzed)
+        """
+
+        normalized = normalize(text)
+        key = fingerprint(normalized)
+        words = normalized.split()
+        with self._lock:
+            self.texts += 1
+            group = self._groups.get(key)
+            if group is not None:
+                self._groups.move_to_end(key)
+                self.exact_duplicates += 1
+                self.saved_words += len(words)
+                return group, False
+
+            signature, sentences, bands = None, None, ()
+            if self.near and len(words) >= near_min_words:
+                signature = minhash(_pattern_punctuation.sub(" ", normalized).split())
+                sentences = shape(text)
+                bands = tuple(signature[band * signature_rows:(band + 1) * signature_rows] for band in range(signature_bands))
+                group = self._find_near(signature, len(words), sentences, bands)
+                if group is not None:
+                    self._groups.move_to_end(group.key)
+                    self.near_duplicates += 1
+                    self.saved_words += len(words)
+                    return group, False
+
+            group = Group(key, signature, len(words), sentences, bands)
+            self._groups[key] = group
+            for index, band in zip(self._bands, bands):
+                index.setdefault(band, []).append(group)
+            while len(self._groups) > self.max_groups:
+                self._evict(self._groups.popitem(last=False)[1])
+
+        return group, True
+
+    def _evict(self, group):
+        for index, band in zip(self._bands, group.bands):
+            members = index[band]
+            members.remove(group)
+            if not members:
+                del index[band]
+
+    def stats(self):
+        """Returns the counters: texts, analyzed groups, exact and near duplicates, saved share of the
+        analyses and words of the paragraphs which were not analyzed."""
+        duplicates = self.exact_duplicates + self.near_duplicates
+        return {
+            'texts': self.texts,
+            'analyzed': self.texts - duplicates,
+            'exact_duplicates': self.exact_duplicates,
+            'near_duplicates': self.near_duplicates,
+            'saved_ratio': round(duplicates / self.texts, 4) if self.texts else 0.0,
+            'saved_words': self.saved_words,
+            'groups': len(self._groups),
+        }
+
+    def clear(self):
+        """Removes all groups (the counters are kept)."""
+        with self._lock:
+            self._groups.clear()
+            for index in self._bands:
+                index.clear()
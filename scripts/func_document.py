@@ -0,0 +1,198 @@
+"""
+## Purpose
+Containing the parsed **Document** model which is shared by all readability metrics.
+The input text is split into sentences and tokenized **once**. All functions
+in `func_readability` accept either a raw string or a `Document`.
+
+## Key Elements/Variables
+### Document (class)
+- `text`: raw input text
+- `sentences`: list of `Sentence` tuples (start/end offsets into `text`, word and mini word counts)
+- `words`: words as counted by textstat (lower case, punctuation removed, see `func_words.tokenize`)
+- `vocabulary`: unique words of the difficult and complex word checks (see `func_words.vocabulary`)
+- `syllables`: syllables per word of `words` and `vocabulary` (hyphenation dictionary of textstat)
+- `stats_text`: text prepared for `textstat` (line breaks are treated as sentence ends)
+- `checker_text`: lower case text without commas for the jargon and simple word checks
+
+### SentenceSegmenter (class)
+Single pass over the text (compiled patterns). A sentence ends with ".", "!" or "?" followed by a space
+or with a line break. Periods of abbreviations (`resources/list_abbreviations.csv`, e.g. "approx.", "e.g.")
+do not end a sentence, list markers at the start of a line ("6.", "12)", "•", "-") are not part of the sentence.
+---
+# Functions
+"""
+
+## Packages
+import re  # to find the sentence ends and words
+from collections import namedtuple
+import func_words  # to tokenize the words of the statistics
+
+
+## A sentence is stored as offsets into Document.text (no copy of the text)
+Sentence = namedtuple("Sentence", ["start", "end", "word_count", "miniword_count"])
+
+## Sentence ends: ".", "!", "?" (incl. closing quotes/brackets) before a space or the end, and line breaks
+_pattern_end = re.compile(r"""[.!?]+['"’”)\]]*(?=\s|$)|\n""")
+## List markers at the start of a line, e.g. "6. ", "12) ", "• ", "- "
+_pattern_list_marker = re.compile(r"[ \t]*(?:\d{1,3}[.)]|[•·\-–*])[ \t]+")
+
+
+class SentenceSegmenter:
+    """Splits a text into sentences (see module description).
+
+    Args:
+        abbreviations (iterable): Abbreviations incl. their period, e.g. "approx." (case-insensitive)
+        miniword_max_length (int): Characters of a mini word
+    """
+
+    __slots__ = ("abbreviations", "miniword_max_length")
+
+    def __init__(self, abbreviations, miniword_max_length=3):
+        self.abbreviations = frozenset(abbreviation.strip().lower() for abbreviation in abbreviations if abbreviation.strip())
+        self.miniword_max_length = miniword_max_length
+
+    def segment(self, text):
+        """Returns the sentences of a text.
+
+        Args:
+            text (string): Text
+
+        Returns:
+            sentences (list): List of `Sentence` tuples (offsets into `text`)
+        """
+
+        sentences = []
+        append = self._append
+        start = self._skip_list_marker(text, 0)
+        for match in _pattern_end.finditer(text):
+            end = match.end()
+            if end <= start:  # period of a list marker
+                continue
+            sentence_end = match.group()
+            if sentence_end == "\n":
+                append(sentences, text, start, end - 1)
+                start = self._skip_list_marker(text, end)
+            elif sentence_end != "." or not self._is_abbreviation(text, start, end - 1):
+                append(sentences, text, start, end)
+                start = end
+        append(sentences, text, start, len(text))
+
+        return sentences
+
+    def _is_abbreviation(self, text, start, end):
+        """Checks if the word before the period at `end` is an abbreviation."""
+        word_start = max(text.rfind(" ", start, end), text.rfind("\t", start, end), start - 1) + 1
+        word = text[word_start:end + 1].lstrip("(\"'‘“").lower()
+        return word in self.abbreviations
+
+    @staticmethod
+    def _skip_list_marker(text, start):
+        marker = _pattern_list_marker.match(text, start)
+        return marker.end() if marker else start
+
+    def _append(self, sentences, text, start, end):
+        """Appends the sentence text[start:end] (without surrounding whitespace) if it has words.
+        Periods are not counted as characters of a word, words of periods only (e.g. "...") are skipped."""
+        segment = text[start:end]
+        words = segment.replace(".", "").split()
+        if words:
+            first = start + len(segment) - len(segment.lstrip())
+            last = start + len(segment.rstrip())
+            miniword_count = sum(map((self.miniword_max_length + 1).__gt__, map(len, words)))  # e.g. words with 3 or less characters
+            sentences.append(Sentence(first, last, len(words), miniword_count))
+
+
+class Document:
+    """Parsed representation of an observation text. Build it once and pass it to every metric.
+    All parts are computed on first access and kept for later metrics.
+
+    Args:
+        text (string): Observation text
+        language (string): Language of the text (see `func_language`), default: configured default language
+    """
+
+    __slots__ = ("text", "language", "_sentences", "_words", "_vocabulary",
+                 "_stats_text", "_checker_text", "_syllables")
+
+    def __init__(self, text, language=None):
+        self.text = text
+        self.language = language
+        self._sentences = None
+        self._words = None
+        self._vocabulary = None
+        self._stats_text = None
+        self._checker_text = None
+        self._syllables = None
+
+    @property
+    def sentences(self):
+        """Sentences of the text (see `SentenceSegmenter`, abbreviations and mini words of the language)."""
+        if self._sentences is None:
+            ## imported here to avoid a circular import (func_readability imports this module)
+            from func_readability import get_lexicons
+            self._sentences = get_lexicons(self.language).segmenter().segment(self.text)
+        return self._sentences
+
+    def sentence_text(self, sentence):
+        """Returns the text of a sentence."""
+        return self.text[sentence.start:sentence.end]
+
+    @property
+    def words(self):
+        """Words of the word and syllable counts (see `func_words.tokenize`), shared by the textstat counts
+        and the Gunning FOG score. A line break separates words like a space, hence the words of `stats_text`."""
+        if self._words is None:
+            self._words = func_words.tokenize(self.text)
+        return self._words
+
+    @property
+    def vocabulary(self):
+        """Unique words of the difficult words and the complex words of the Gunning FOG score
+        (see `func_words.vocabulary`)."""
+        if self._vocabulary is None:
+            self._vocabulary = func_words.vocabulary(self.text)
+        return self._vocabulary
+
+    @property
+    def stats_text(self):
+        """Text for the textstat statistics: a line break ends a sentence."""
+        if self._stats_text is None:
+            self._stats_text = self.text.replace("\n", ". ")
+        return self._stats_text
+
+    @property
+    def checker_text(self):
+        """Text for the jargon and simple word checks: one line, lower case, no commas."""
+        if self._checker_text is None:
+            checker_text = self.text.replace("\n", " ").lower()
+            checker_text = checker_text.replace(",", "")
+            self._checker_text = checker_text.replace("  ", " ")
+        return self._checker_text
+
+    @property
+    def syllables(self):
+        """Syllables per word of `words` and `vocabulary`, counted once (see `func_readability.word_syllables`)."""
+        if self._syllables is None:
+            from func_readability import word_syllables
+            self._syllables = word_syllables(self.vocabulary.union(self.words), self.language)
+        return self._syllables
+
+
+def as_document(observation, language=None):
+    """Returns the observation as `Document`. Strings are parsed, documents are passed through
+    (documents of another language are parsed again).
+
+    Args:
+        observation (string or Document): Observation text
+        language (string): Language of the text (see `func_language`), default: language of the document or configured default
+
+    Returns:
+        document (Document): Parsed observation
+    """
+
+    if isinstance(observation, Document):
+        if language is None or language == observation.language:
+            return observation
+        return Document(observation.text, language)
+
+    return Document(observation, language)
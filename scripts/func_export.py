@@ -0,0 +1,357 @@
+"""
+## Purpose
+Containing the **streaming export** of the results to CSV, JSON lines or Parquet. The results are written
+in batches while the scoring runs, hence a large run (e.g. 100k paragraphs) never keeps all results in memory.
+A file is written as `<name>.part` and renamed when it is complete.
+
+## Key Elements/Variables
+### ResultWriter (class)
+- `write(observation_stats)`: buffers one result, the buffer is written every `batch_rows` rows
+- `write_columns(table)`: writes a table (column name and list of values), e.g. a DataFrame
+- `close()`: writes the rest and renames the file (context manager: removes the partial file on errors)
+
+### open_writer (function)
+Opens a writer for a path or for the export folder of the config file (section [EXPORT]).
+The format follows the file extension (`.csv`, `.jsonl`, `.parquet`, optionally `.gz`, `.bz2`, `.xz`).
+
+## Usage
+```python3 linenums="1"
+import func_export
+with func_export.open_writer(fmt="parquet", name="audit-2024") as writer:
+    for observation_stats in func_batch.iter_analyze(texts):
+        writer.write(observation_stats)
+```
+---
+# Functions
+"""
+
+## Packages
+import configparser  # to read the export settings
+import contextlib  # to keep the original error if the partial file cannot be closed
+import csv  # to write csv files
+import json  # to write JSON lines
+import os  # to create the export folder and rename the complete files
+import time  # to name the export files
+import func_readability as rc  # to get the default export columns
+from func_result import RAW_FIELDS, RESULT_KEYS, column_type, results_to_columns  # to check and type the columns and collect a batch column by column
+
+
+# --- Global Parameters ---
+CONFIG_FILE = "resources/rcBOT_config.ini"
+FORMATS = ("csv", "jsonl", "parquet")
+default_directory = "reports"  # relative to the project's root folder
+default_format = "csv"
+default_batch_rows = 1000  # rows written at once
+## Compression per format (csv/jsonl: stdlib, parquet: pyarrow codecs)
+COMPRESSIONS = {
+    'csv': ("none", "gzip", "bz2", "xz"),
+    'jsonl': ("none", "gzip", "bz2", "xz"),
+    'parquet': ("none", "snappy", "gzip", "zstd"),
+}
+compression_suffixes = {'gzip': ".gz", 'bz2': ".bz2", 'xz': ".xz"}
+# --- Global Parameters ---
+
+
+def open_text(path, compression):
+    """Opens a text file for writing, compressed with gzip, bz2 or xz (or not at all)."""
+    if compression == "gzip":
+        import gzip
+        return gzip.open(path, "wt", encoding="utf-8", newline="")
+    if compression == "bz2":
+        import bz2
+        return bz2.open(path, "wt", encoding="utf-8", newline="")
+    if compression == "xz":
+        import lzma
+        return lzma.open(path, "wt", encoding="utf-8", newline="")
+
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+class ResultWriter:
+    """Writes results in batches to a file (see module description).
+
+    Args:
+        path (string): Path of the export file
+        columns (list): Result keys (see `func_result.RESULT_KEYS`), default: `func_readability.export_columns`
+        compression (string): Compression (see `COMPRESSIONS`), default: none (parquet: snappy)
+        extra_columns (list): Columns in front of the result columns, values given per `write`, e.g. ["file"]
+        batch_rows (int): Rows written at once
+
+    Raises:
+        ValueError: Unknown compression or column (checked before the file is opened)
+    """
+
+    format = ""
+
+    def __init__(self, path, columns=None, compression=None, extra_columns=(), batch_rows=default_batch_rows):
+        compression = compression or "none"
+        if compression not in COMPRESSIONS[self.format]:
+            raise ValueError(f"Unknown {self.format} compression: {compression} (use one of {', '.join(COMPRESSIONS[self.format])})")
+        columns = list(columns or rc.export_columns)
+        unknown = [column for column in columns if column not in RESULT_KEYS and column not in RAW_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown export columns: {', '.join(unknown)} (use result keys, see func_result.RESULT_KEYS)")
+        self.path = path
+        self.columns = columns
+        self.compression = compression
+        self.extra_columns = list(extra_columns)
+        self.batch_rows = max(1, int(batch_rows))
+        self.rows = 0
+        self._buffer = []  # (observation_stats, extra values)
+        self._partial_path = path + ".part"
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._open(self._partial_path)
+
+    def write(self, observation_stats, *extra_values):
+        """Buffers one result (and the values of the extra columns)."""
+        self._buffer.append((observation_stats, extra_values))
+        if len(self._buffer) >= self.batch_rows:
+            self.flush()
+
+    def write_many(self, results):
+        """Writes many results (iterable, consumed lazily)."""
+        for observation_stats in results:
+            self.write(observation_stats)
+
+    def flush(self):
+        """Writes the buffered results."""
+        if not self._buffer:
+            return
+        table = {column: list(values) for column, values in zip(self.extra_columns, zip(*(extra for _, extra in self._buffer)))}
+        table.update(results_to_columns((observation_stats for observation_stats, _ in self._buffer), self.columns))
+        self._buffer.clear()
+        self.write_columns(table)
+
+    def write_columns(self, table):
+        """Writes a table (column name and list of values, all columns of the same length)."""
+        rows = len(next(iter(table.values()), ()))
+        if rows:
+            self._write_table(table)
+            self.rows += rows
+
+    def close(self):
+        """Writes the buffered results, closes the file and renames it (complete).
+        On an error the partial file is removed (see `abort`) and the error is raised."""
+        try:
+            self.flush()
+            self._close()
+        except BaseException:
+            with contextlib.suppress(Exception):
+                self.abort()
+            raise
+        os.replace(self._partial_path, self.path)
+
+    def abort(self):
+        """Closes and removes the partial file."""
+        self._buffer.clear()
+        try:
+            self._close()
+        finally:
+            if os.path.exists(self._partial_path):
+                os.remove(self._partial_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    ## Format-specific
+    def _open(self, path):
+        raise NotImplementedError
+
+    def _write_table(self, table):
+        raise NotImplementedError
+
+    def _close(self):
+        raise NotImplementedError
+
+
+class CsvWriter(ResultWriter):
+    """CSV with header (lists and dictionaries as their text)."""
+
+    format = "csv"
+
+    def _open(self, path):
+        self._file = open_text(path, self.compression)
+        self._writer = csv.writer(self._file)
+        self._header = None
+
+    def _write_table(self, table):
+        if self._header is None:
+            self._header = list(table)
+            self._writer.writerow(self._header)
+        self._writer.writerows(zip(*(table[column] for column in self._header)))
+
+    def _close(self):
+        self._file.close()
+
+
+class JsonlWriter(ResultWriter):
+    """JSON lines, one object per result."""
+
+    format = "jsonl"
+
+    def _open(self, path):
+        self._file = open_text(path, self.compression)
+
+    def _write_table(self, table):
+        columns = list(table)
+        self._file.writelines(json.dumps(dict(zip(columns, row))) + "\n" for row in zip(*table.values()))
+
+    def _close(self):
+        self._file.close()
+
+
+class ParquetWriter(ResultWriter):
+    """Parquet (pyarrow, optional), one row group per batch. The schema follows the types of the results
+    (see `func_result.ATTRIBUTE_TYPES`), hence a column without values in the first batch keeps its type.
+    Lists and dictionaries (e.g. `jargon_checklist_dict`) are stored as JSON text, the extra columns as text."""
+
+    format = "parquet"
+
+    def __init__(self, path, columns=None, compression=None, extra_columns=(), batch_rows=default_batch_rows):
+        super().__init__(path, columns, compression or "snappy", extra_columns, batch_rows)
+
+    def _open(self, path):
+        import pyarrow as pa  # imported on first use, optional
+
+        arrow_types = {int: pa.int64(), float: pa.float64(), str: pa.string()}
+        self._nested = {column for column in self.columns if column_type(column) not in arrow_types}
+        self._schema = pa.schema([(column, pa.string()) for column in self.extra_columns]
+                                 + [(column, arrow_types.get(column_type(column), pa.string())) for column in self.columns])
+        self._path = path
+        self._writer = None
+
+    def _write_table(self, table):
+        import pyarrow as pa  # imported on first use, optional
+        import pyarrow.parquet as pq
+
+        columns = []
+        for field in self._schema:
+            values = table[field.name]
+            if field.name in self._nested:
+                values = [None if value is None else json.dumps(value) for value in values]
+            elif field.name in self.extra_columns:
+                values = [None if value is None else str(value) for value in values]
+            columns.append(pa.array(values, field.type, from_pandas=True))  # from_pandas: NaN of a DataFrame is None
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self._path, self._schema, compression=self.compression)
+        self._writer.write_table(pa.Table.from_arrays(columns, schema=self._schema))
+
+    def _close(self):
+        import pyarrow.parquet as pq
+
+        if self._writer is None:  # no rows: empty file with the column names
+            pq.write_table(self._schema.empty_table(), self._path)
+        else:
+            self._writer.close()
+
+
+WRITERS = {'csv': CsvWriter, 'jsonl': JsonlWriter, 'parquet': ParquetWriter}
+
+
+def format_of(path):
+    """Returns the export format and the compression of a file name, e.g. ("csv", "gzip") for "a.csv.gz"."""
+    name = path.lower()
+    compression = None
+    for candidate, suffix in compression_suffixes.items():
+        if name.endswith(suffix):
+            compression = candidate
+            name = name[:-len(suffix)]
+    extension = os.path.splitext(name)[1].lstrip(".")
+    fmt = {'json': "jsonl", 'ndjson': "jsonl", 'pq': "parquet"}.get(extension, extension)
+
+    return (fmt if fmt in FORMATS else None), compression
+
+
+def load_export_config(CONFIG_FILE):
+    """Loads the export settings from the config file.
+
+    Args:
+        CONFIG_FILE (string): Path to the config file + config file name
+
+    Returns:
+        settings (dict): directory, format, compression, columns (None: default columns) and batch_rows
+    """
+
+    config = configparser.ConfigParser()
+    config.read(CONFIG_FILE)
+
+    columns = [column.strip() for column in config.get('EXPORT', 'columns', fallback='').split(",") if column.strip()]
+
+    return {
+        'directory': config.get('EXPORT', 'directory', fallback=default_directory) or default_directory,
+        'format': config.get('EXPORT', 'format', fallback=default_format) or default_format,
+        'compression': config.get('EXPORT', 'compression', fallback='') or None,
+        'columns': columns or None,
+        'batch_rows': config.getint('EXPORT', 'batch_rows', fallback=default_batch_rows),
+    }
+
+
+def open_writer(path=None, fmt=None, columns=None, compression=None, extra_columns=(), name="observations",
+                config_file=CONFIG_FILE):
+    """Opens a result writer. Arguments which are not given are taken from the config file (section [EXPORT]).
+
+    Args:
+        path (string): Export file, default: `<directory>/<name>-<timestamp>.<format>` (see config)
+        fmt (string): "csv", "jsonl" or "parquet", default: file extension or config
+        columns (list): Result keys, default: config or `func_readability.export_columns`
+        compression (string): Compression (see `COMPRESSIONS`), default: file extension or config
+        extra_columns (list): Columns in front of the result columns (values given per `write`)
+        name (string): Name of the export file (without folder and extension), used if path is None
+        config_file (string): Path to the config file
+
+    Returns:
+        writer (ResultWriter): Writer (use as context manager)
+    """
+
+    settings = load_export_config(config_file)
+    if path is not None:
+        path_format, path_compression = format_of(path)
+        fmt = fmt or path_format
+        compression = compression or path_compression
+    fmt = fmt or settings['format']
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown export format: {fmt} (use one of {', '.join(FORMATS)})")
+    compression = compression or settings['compression']
+    if fmt == "parquet" or compression in (None, "none"):
+        suffix = ""
+    else:
+        suffix = compression_suffixes.get(compression, "")
+    if path is None:
+        path = os.path.join(settings['directory'], f"{name}-{time.strftime('%Y%m%d-%H%M%S')}.{fmt}{suffix}")
+
+    return WRITERS[fmt](path, columns or settings['columns'], compression, extra_columns, settings['batch_rows'])
+
+
+def export_results(results, path=None, fmt=None, columns=None, compression=None, name="observations"):
+    """Streams results (iterable, consumed lazily) to an export file (see `open_writer`).
+
+    Returns:
+        path (string): Export file
+        rows (int): Number of written results
+    """
+
+    with open_writer(path, fmt, columns, compression, name=name) as writer:
+        writer.write_many(results)
+
+    return writer.path, writer.rows
+
+
+def export_frame(df, path=None, fmt=None, compression=None, name="observations"):
+    """Writes a DataFrame (all its columns) to an export file in batches (see `open_writer`).
+
+    Returns:
+        path (string): Export file
+        rows (int): Number of written rows
+    """
+
+    with open_writer(path, fmt, list(df.columns), compression, name=name) as writer:
+        for start in range(0, len(df), writer.batch_rows):
+            writer.write_columns(df.iloc[start:start + writer.batch_rows].to_dict('list'))
+
+    return writer.path, writer.rows
@@ -0,0 +1,205 @@
+"""
+## Purpose
+Containing the **incremental re-scoring** of the Quick Check. Authors edit one sentence and press
+`[Analyze]` again, hence the partial results of every line (word, mini word and syllable counts,
+difficult words, jargon and simple word hits, sentence length entry) are kept by the line text.
+Only new or changed lines are scored, the document scores are aggregated from the partial results.
+
+## Key Elements/Variables
+### IncrementalScorer (class)
+- `analyze(i, observation)`: same results as `func_readability.analyze_observation`
+- Partial results are kept per language and line, they are dropped if the scoring version (rules, thresholds,
+  language profiles, word lists) changes.
+
+### Differences to the full analysis
+- Jargon and simple word phrases are matched per line, a phrase spanning a line break is not found.
+- The sentiment and the sentence count of the Gunning FOG score are calculated on the whole text.
+---
+# Functions
+"""
+
+## Packages
+import re  # to count the sentences like textstat
+from collections import OrderedDict, namedtuple  # for the LRU store of the partial results
+import func_readability as rc  # to import the readability algorithms
+import func_language  # language profiles
+import func_result  # compact result record of an observation
+import func_timing  # to time the readability stages
+
+
+# --- Global Parameters ---
+default_max_lines = 2048  # partial results kept (lines)
+# --- Global Parameters ---
+
+
+## Sentences as counted by textstat.sentence_count
+_pattern_sentence = re.compile(r'\b[^.!?]+[.!?]*', re.UNICODE)
+
+## Partial results of one line of the observation
+LinePartial = namedtuple("LinePartial", [
+    "sentence_lengths",  # words per sentence
+    "sentence_texts",  # text per sentence
+    "words",  # words (EFLAW)
+    "miniwords",  # words with 3 or less characters (EFLAW)
+    "lexicon",  # textstat word count
+    "syllables",  # textstat syllable count
+    "sentences",  # textstat sentences with more than 2 words
+    "difficult_words",  # difficult words as (word, syllables)
+    "fog_difficult_words",  # difficult words of the Gunning FOG score
+    "jargon",  # found jargon phrases
+    "simplewords",  # found simple word phrases
+])
+
+
+def score_line(line, profile=None):
+    """Scores one line of the observation.
+
+    Args:
+        line (string): Line of the observation text (without line break)
+        profile (LanguageProfile): Language of the line (see `func_language`), default: configured default language
+
+    Returns:
+        partial (LinePartial): Partial results of the line
+    """
+
+    profile = profile or func_language.get_profile()
+    lexicons = rc.get_lexicons(profile.name)
+    document = rc.Document(line, profile.name)  # words, vocabulary and syllables of the line, counted once
+    sentences = document.sentences
+
+    with rc.textstat_language(profile.textstat_lang) as textstat:
+        return LinePartial(
+            sentence_lengths=tuple(sentence.word_count for sentence in sentences),
+            sentence_texts=tuple(line[sentence.start:sentence.end] for sentence in sentences),
+            words=sum(sentence.word_count for sentence in sentences),
+            miniwords=sum(sentence.miniword_count for sentence in sentences),
+            lexicon=len(document.words),
+            syllables=sum(document.syllables[word] for word in document.words),
+            sentences=sum(1 for sentence in _pattern_sentence.findall(line) if textstat.lexicon_count(sentence) > 2),
+            difficult_words=rc.difficult_words(document),
+            fog_difficult_words=rc.complex_words(document),
+            jargon=frozenset(lexicons.matcher('jargon').count(document.checker_text)),
+            simplewords=frozenset(lexicons.matcher('simplewords').count(document.checker_text)),
+        )
+
+
+class IncrementalScorer:
+    """Keeps the partial results of the last scored lines (least recently used).
+
+    Args:
+        max_lines (int): Maximum number of lines kept
+    """
+
+    def __init__(self, max_lines=default_max_lines):
+        self.max_lines = max(1, int(max_lines))
+        self._partials = OrderedDict()  # (language, line): LinePartial
+        self._version = None
+        self.hits = 0
+        self.misses = 0
+
+    def partial(self, line, profile=None):
+        """Returns the partial results of a line, scoring it only if it is new or changed."""
+        profile = profile or func_language.get_profile()
+        key = (profile.name, line)
+        partial = self._partials.get(key)
+        if partial is not None:
+            self._partials.move_to_end(key)
+            self.hits += 1
+            return partial
+
+        partial = score_line(line, profile)
+        self._partials[key] = partial
+        while len(self._partials) > self.max_lines:
+            self._partials.popitem(last=False)
+        self.misses += 1
+
+        return partial
+
+    def analyze(self, i, observation, timings=None, language=None):
+        """Runs all readability checks, re-using the partial results of unchanged lines
+        (see `func_readability.analyze_observation`).
+
+        Args:
+            i (int): Iterator (the observation no. is i+1)
+            observation (string or Document): Observation text
+            timings (Timings): Optional collector of the stage timings (see `func_timing`)
+            language (string): Language (see `func_language`), "auto" to detect it, default: configured default
+
+        Returns:
+            observation_stats (ObservationResult): All results, statistics and details of the observation
+        """
+        timings = timings or func_timing.null_timings
+        text = observation if isinstance(observation, str) else observation.text
+
+        ## Changed rules, thresholds, profiles or word lists invalidate all partial results
+        with timings.span('word_lists'):
+            version = rc.scoring_version(language)
+            if version != self._version:
+                self.clear()
+                self._version = version
+            profile = func_language.resolve_language(language, text)
+
+        with timings.span('lines'):
+            partials = [self.partial(line, profile) for line in text.split("\n")]
+
+        ## eflaw-based stats and score (a line break ends a sentence, hence no sentence spans two lines)
+        sentences = [sentence for partial in partials for sentence in zip(partial.sentence_lengths, partial.sentence_texts)]
+        sentence_lengths = tuple(length for length, _ in sentences if length > 4)
+        sentence_texts = tuple(sentence_text for length, sentence_text in sentences if length > 4)
+        count_words = sum(partial.words for partial in partials)
+        count_miniwords = sum(partial.miniwords for partial in partials)
+        eflaw_score = (count_words+count_miniwords)/len(sentence_lengths) if sentence_lengths else None
+
+        ## textstat-based stats
+        lexiconcount = sum(partial.lexicon for partial in partials)
+        sentencecount = max(1, sum(partial.sentences for partial in partials))
+        syllablecount = sum(partial.syllables for partial in partials)
+        difficult_words = tuple(sorted(set().union(*(partial.difficult_words for partial in partials))))
+
+        ## Gunning FOG score (formula of textstat.gunning_fog)
+        fog_difficult_words = frozenset().union(*(partial.fog_difficult_words for partial in partials))
+        gunning_fog = 0.0
+        if lexiconcount:
+            with timings.span('textstat'), rc.textstat_language(profile.textstat_lang) as textstat:
+                fog_sentencecount = textstat.sentence_count(text)
+            average_sentence_length = rc.round_half_up(lexiconcount / fog_sentencecount, 1)
+            gunning_fog = rc.round_half_up(0.4 * (average_sentence_length + len(fog_difficult_words) / lexiconcount * 100), 2)
+
+        ## Checkers (in word list order)
+        jargon = frozenset().union(*(partial.jargon for partial in partials))
+        simplewords = frozenset().union(*(partial.simplewords for partial in partials))
+        dict_jargon, dict_simplewords, _ = rc.load_external_lists(profile.name)
+
+        ## sentiment (English lexicon, not analyzed for the other languages)
+        polarity, subjectivity = None, None
+        if profile.sentiment:
+            with timings.span('sentiment'):
+                polarity, subjectivity = rc.sentiment_scores(text)
+
+        return func_result.ObservationResult(
+            observation_no=i+1,
+            eflaw_value=eflaw_score,
+            eflaw_sentencecount=len(sentence_lengths),
+            eflaw_miniwords_count=count_miniwords,
+            sentence_lengths=sentence_lengths,
+            sentence_texts=sentence_texts,
+            gunning_fog_value=gunning_fog,
+            words=lexiconcount,
+            sentences=sentencecount,
+            syllables=syllablecount,
+            difficult_words=difficult_words,
+            long_sentences=sum(1 for length, _ in sentences if length > profile.sentence_length_max),
+            jargon_hits=tuple((phrase, alternative) for phrase, alternative in dict_jargon.items() if phrase in jargon),
+            simplewords_hits=tuple((phrase, alternative) for phrase, alternative in dict_simplewords.items() if phrase in simplewords),
+            polarity=polarity,
+            subjectivity=subjectivity,
+            language=profile.name,
+        )
+
+    def stats(self):
+        """Returns the hit/miss counters of the partial results (lines)."""
+        return {'hits': self.hits, 'misses': self.misses, 'lines': len(self._partials)}
+
+    def clear(self):
+        """Removes all partial results."""
+        self._partials.clear()
@@ -0,0 +1,206 @@
+"""
+## Purpose
+Containing the **import of reports** (.docx, .txt and .xlsx). The observation paragraphs are read
+**lazily** with generators, hence the memory use does not depend on the size of the report.
+
+## Key Elements/Variables
+### iter_paragraphs (generator)
+Yields the observation paragraphs of a report. Headings and other paragraphs with 4 words or fewer
+are skipped (like in the `eflaw` sentence count).
+
+### analyze_file (generator)
+Yields the readability results per paragraph (see `func_batch.iter_analyze`).
+---
+# Functions
+"""
+
+## Packages
+import os  # to get the file extension
+import zipfile  # to open the .docx container without loading it completely
+from xml.etree import ElementTree  # to stream the paragraphs of the .docx document
+import func_batch  # to analyze the paragraphs
+
+
+# --- Global Parameters ---
+min_paragraph_words = 5  # paragraphs with fewer words are headings or list labels
+# --- Global Parameters ---
+
+
+## WordprocessingML namespace used in word/document.xml
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+def keep_paragraph(paragraph, min_words=min_paragraph_words):
+    """Checks if a paragraph is an observation paragraph (and not a heading or an empty line).
+
+    Args:
+        paragraph (string): Paragraph text
+        min_words (int): Minimum number of words
+
+    Returns:
+        keep (bool): True if the paragraph has min_words or more words
+    """
+
+    return len(paragraph.split()) >= min_words
+
+
+def iter_text_paragraphs(lines):
+    """Yields the paragraphs of text lines (e.g. an open file or stdin). Paragraphs are separated
+    by empty lines, the line breaks within a paragraph are kept (like in the Quick Check input field).
+
+    Args:
+        lines (iterable): Text lines
+
+    Yields:
+        paragraph (string): Paragraph text
+    """
+
+    paragraph_lines = []
+    for line in lines:
+        line = line.rstrip()
+        if line:
+            paragraph_lines.append(line)
+        elif paragraph_lines:
+            yield "\n".join(paragraph_lines)
+            paragraph_lines = []
+    if paragraph_lines:
+        yield "\n".join(paragraph_lines)
+
+
+def iter_txt_paragraphs(path):
+    """Yields the paragraphs of a text file (see `iter_text_paragraphs`).
+
+    Args:
+        path (string): Path to the .txt file
+
+    Yields:
+        paragraph (string): Paragraph text
+    """
+
+    with open(path, 'r', encoding='utf-8') as text_file:
+        yield from iter_text_paragraphs(text_file)
+
+
+def iter_docx_paragraphs(path, skip_headings=True):
+    """Yields the paragraphs of a Word document (incl. paragraphs in tables).
+    word/document.xml is parsed incrementally and processed elements are released,
+    instead of loading the whole document with python-docx.
+
+    Args:
+        path (string): Path to the .docx file
+        skip_headings (bool): Skip paragraphs with a heading or title style
+
+    Yields:
+        paragraph (string): Paragraph text
+    """
+
+    with zipfile.ZipFile(path) as docx_file:
+        with docx_file.open("word/document.xml") as document_xml:
+            body = None
+            for event, elem in ElementTree.iterparse(document_xml, events=("start", "end")):
+                if event == "start":
+                    if elem.tag == W_NS + "body":
+                        body = elem
+                    continue
+
+                if elem.tag == W_NS + "p":
+                    style = elem.find(f"{W_NS}pPr/{W_NS}pStyle")
+                    style_name = style.get(W_NS + "val", "") if style is not None else ""
+                    if not (skip_headings and style_name.lower().startswith(("heading", "title"))):
+                        parts = []
+                        for node in elem.iter():
+                            if node.tag == W_NS + "t" and node.text:
+                                parts.append(node.text)
+                            elif node.tag == W_NS + "tab":
+                                parts.append("\t")
+                            elif node.tag in (W_NS + "br", W_NS + "cr"):
+                                parts.append("\n")
+                        yield "".join(parts)
+                    elem.clear()
+
+                ## Release the processed top level elements (paragraphs, tables)
+                if body is not None and len(body) and elem is body[-1]:
+                    body.remove(elem)
+
+
+def iter_xlsx_paragraphs(path):
+    """Yields the text cells of all worksheets of an Excel file (openpyxl read-only mode).
+
+    Args:
+        path (string): Path to the .xlsx file
+
+    Yields:
+        paragraph (string): Cell text
+    """
+
+    import openpyxl  # imported here, only required for Excel files
+
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        for worksheet in workbook.worksheets:
+            for row in worksheet.iter_rows(values_only=True):
+                for cell in row:
+                    if isinstance(cell, str):
+                        yield cell
+    finally:
+        workbook.close()
+
+
+## File extension and paragraph reader
+READERS = {
+    '.txt': iter_txt_paragraphs,
+    '.docx': iter_docx_paragraphs,
+    '.xlsx': iter_xlsx_paragraphs,
+}
+
+
+def iter_paragraphs(path, min_words=min_paragraph_words):
+    """Yields the observation paragraphs of a report file (.docx, .txt or .xlsx).
+
+    Args:
+        path (string): Path to the report
+        min_words (int): Paragraphs with fewer words are skipped (headings, empty lines)
+
+    Yields:
+        paragraph (string): Paragraph text
+    """
+
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in READERS:
+        raise ValueError(f"Unsupported file type '{extension}'. Supported: {', '.join(READERS)}")
+
+    yield from filter_paragraphs(READERS[extension](path), min_words)
+
+
+def filter_paragraphs(paragraphs, min_words=min_paragraph_words):
+    """Strips the paragraphs and skips headings, empty lines and other short paragraphs.
+
+    Args:
+        paragraphs (iterable): Paragraph texts
+        min_words (int): Paragraphs with fewer words are skipped
+
+    Yields:
+        paragraph (string): Paragraph text
+    """
+
+    for paragraph in paragraphs:
+        paragraph = paragraph.strip()
+        if keep_paragraph(paragraph, min_words):
+            yield paragraph
+
+
+def analyze_file(path, workers=1, min_words=min_paragraph_words, language=None, metrics=None):
+    """Analyzes all observation paragraphs of a report file and yields the results in order.
+
+    Args:
+        path (string): Path to the report
+        workers (int): Number of worker processes (see `func_batch.iter_analyze`)
+        min_words (int): Paragraphs with fewer words are skipped
+        language (string): Language (see `func_language`), "auto" to detect it per paragraph, default: configured default
+        metrics (list): Result keys to be calculated (see `func_metrics`), default: all
+
+    Yields:
+        observation_stats (ObservationResult): Result per paragraph
+    """
+
+    yield from func_batch.iter_analyze(iter_paragraphs(path, min_words), workers=workers, language=language, metrics=metrics)
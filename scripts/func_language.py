@@ -0,0 +1,225 @@
+"""
+## Purpose
+Containing the **language profiles** of the readability analysis. A profile bundles everything which is
+language-specific: the textstat language, the syllable rule of the difficult words, the word lists
+(jargon, simple words, difficult words, abbreviations), the mini word rule, the thresholds and if the
+sentiment is analyzed. The profiles are defined in `resources/language_profiles.ini` and loaded once.
+
+The language of a text is either given (e.g. "de"), the configured default (section [LANGUAGE] of the
+config file) or detected per paragraph ("auto") by the frequent words (stop words) of the profiles.
+
+## Key Elements/Variables
+### LanguageProfile (class)
+Settings of one language (see `resources/language_profiles.ini`).
+
+### resolve_language (function)
+Profile of a text: given language, "auto" (detection) or None (configured default).
+
+### group_by_language (function)
+Groups a batch by language, hence a worker switches the textstat language and the word lists once per
+language instead of per paragraph.
+
+## Usage
+```python3 linenums="1"
+import func_language
+func_language.detect_language("Die Kontrollen wurden nicht dokumentiert.")  # "de"
+profile = func_language.resolve_language("auto", text)
+```
+---
+# Functions
+"""
+
+## Packages
+import configparser  # to read the profiles and the language settings
+import re  # to find the words of the language detection
+import threading  # to guard the loading of the profiles
+from dataclasses import dataclass  # for the profile record
+
+
+# --- Global Parameters ---
+CONFIG_FILE = "resources/rcBOT_config.ini"
+PROFILES_FILE = "resources/language_profiles.ini"
+AUTO = "auto"  # detect the language per text
+default_language = "en"
+detect_min_hits = 2  # stop words required to detect a language, otherwise the default language applies
+LEXICON_NAMES = ("jargon", "simplewords", "difficult_words", "abbreviations")
+# --- Global Parameters ---
+
+
+## Words of the language detection (letters incl. accents and umlauts)
+_pattern_word = re.compile(r"[^\W\d_]+")
+
+
+@dataclass(frozen=True)
+class LanguageProfile:
+    """Settings of one language (see `resources/language_profiles.ini`)."""
+
+    name: str  # e.g. "de"
+    label: str  # e.g. "Deutsch"
+    textstat_lang: str  # language of textstat
+    syllables: str  # "custom" (vowel groups) or "textstat" (hyphenation dictionary)
+    lexicon_paths: tuple  # (name, path) of the word lists, see LEXICON_NAMES
+    miniword_max_length: int  # characters of a mini word (EFLAW)
+    sentence_length_max: int  # words of a long sentence
+    score_eflaw: int  # EFLAW score above which improvements are suggested
+    sentiment: bool  # sentiment analysis (English lexicon)
+    stopwords: frozenset  # frequent words (language detection)
+
+
+def load_profiles(path=PROFILES_FILE):
+    """Loads the language profiles.
+
+    Args:
+        path (string): Path to the profiles file
+
+    Returns:
+        profiles (dict): Language name and LanguageProfile, in file order
+    """
+
+    config = configparser.ConfigParser()
+    if not config.read(path, encoding="utf-8"):
+        raise FileNotFoundError(f"Language profiles not found: {path}")
+
+    profiles = {}
+    for name in config.sections():
+        section = config[name]
+        syllables = section.get('syllables', 'custom')
+        if syllables not in ("custom", "textstat"):
+            raise ValueError(f"Unknown syllable rule of language {name}: {syllables} (use custom or textstat)")
+        profiles[name] = LanguageProfile(
+            name=name,
+            label=section.get('name', name),
+            textstat_lang=section.get('textstat_lang', name),
+            syllables=syllables,
+            lexicon_paths=tuple((lexicon, section[lexicon]) for lexicon in LEXICON_NAMES),
+            miniword_max_length=section.getint('miniword_max_length', 3),
+            sentence_length_max=section.getint('sentence_length_max', 20),
+            score_eflaw=section.getint('score_eflaw', 25),
+            sentiment=section.getboolean('sentiment', False),
+            stopwords=frozenset(word.strip().lower() for word in section.get('stopwords', '').split(",") if word.strip()),
+        )
+
+    return profiles
+
+
+def load_language_config(CONFIG_FILE):
+    """Loads the language settings from the config file.
+
+    Args:
+        CONFIG_FILE (string): Path to the config file + config file name
+
+    Returns:
+        settings (dict): default (language of the texts) and detect (True: detect the language per text)
+    """
+
+    config = configparser.ConfigParser()
+    config.read(CONFIG_FILE)
+
+    return {
+        'default': config.get('LANGUAGE', 'default', fallback=default_language) or default_language,
+        'detect': config.getboolean('LANGUAGE', 'detect', fallback=False),
+    }
+
+
+_profiles = None
+_settings = None
+_lock = threading.Lock()
+
+
+def profiles():
+    """Returns the language profiles (loaded on first use) and the language settings."""
+    global _profiles, _settings
+    if _profiles is None:
+        with _lock:
+            if _profiles is None:
+                _settings = load_language_config(CONFIG_FILE)
+                _profiles = load_profiles(PROFILES_FILE)
+                if _settings['default'] not in _profiles:
+                    raise ValueError(f"Unknown default language: {_settings['default']} (use one of {', '.join(_profiles)})")
+
+    return _profiles, _settings
+
+
+def reload_profiles():
+    """Drops the loaded profiles and settings, the next call reads the files again."""
+    global _profiles, _settings
+    with _lock:
+        _profiles = None
+        _settings = None
+
+
+def get_profile(name=None):
+    """Returns the profile of a language (default: configured default language).
+
+    Raises:
+        ValueError: Unknown language
+    """
+
+    all_profiles, settings = profiles()
+    name = name or settings['default']
+    if name not in all_profiles:
+        raise ValueError(f"Unknown language: {name} (use one of {', '.join(all_profiles)} or {AUTO})")
+
+    return all_profiles[name]
+
+
+def detect_language(text, default=None):
+    """Detects the language of a text by the stop words of the profiles.
+
+    Args:
+        text (string): Text (e.g. one paragraph)
+        default (string): Language if no profile has `detect_min_hits` stop words, default: configured default
+
+    Returns:
+        language (string): Name of the profile
+    """
+
+    all_profiles, settings = profiles()
+    hits = dict.fromkeys(all_profiles, 0)
+    for word in _pattern_word.findall(text.lower()):
+        for name, profile in all_profiles.items():
+            if word in profile.stopwords:
+                hits[name] += 1
+    name = max(hits, key=hits.get)  # first profile on a tie
+
+    return name if hits[name] >= detect_min_hits else (default or settings['default'])
+
+
+def is_detected(language):
+    """True if the language of the texts is detected ("auto", or None with detection in the config)."""
+    return language == AUTO or (language is None and profiles()[1]['detect'])
+
+
+def resolve_language(language, text):
+    """Returns the profile of a text.
+
+    Args:
+        language (string): Language name, "auto" (detected) or None (configured default, detected if set in the config)
+        text (string): Text (used for the detection only)
+
+    Returns:
+        profile (LanguageProfile): Profile of the text
+    """
+
+    if is_detected(language):
+        return get_profile(detect_language(text))
+
+    return get_profile(language)
+
+
+def group_by_language(items, language=None):
+    """Groups texts by their language (see `resolve_language`).
+
+    Args:
+        items (list): Tuples (iterator, observation text)
+        language (string): Language name, "auto" or None
+
+    Returns:
+        groups (dict): Language name and the items of this language (in input order)
+    """
+
+    groups = {}
+    for item in items:
+        groups.setdefault(resolve_language(language, item[1]).name, []).append(item)
+
+    return groups
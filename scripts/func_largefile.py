@@ -0,0 +1,215 @@
+"""
+## Purpose
+Containing the **large-input mode**: scores one huge plain text file (e.g. a consolidated annual archive of
+several 100 MB) as one text in constant memory. The file is memory-mapped and decoded chunk by chunk. A chunk
+is cut after its last line break (a line break always ends a sentence, see `func_document.SentenceSegmenter`),
+the rest is carried over to the next chunk, hence the sentences are the same as for the whole text.
+Only the counters (words, mini words, sentences, long sentences, syllables, difficult words) and the top-N
+longest sentences are kept, no list of all sentences.
+
+## Key Elements/Variables
+### LargeTextStats (class)
+Counters, EFLAW score and the longest sentences of a file.
+
+### iter_pieces (generator)
+Decoded text in pieces which end after a line break (a line longer than `max_carry_chars` is cut at a
+sentence end, its sentences may differ from the whole text there).
+
+### analyze_large_file (function)
+Scores a file (or stdin) in pieces.
+
+## Usage
+Run from the project's root folder (the word lists are loaded from `resources/`):
+```python3 linenums="1"
+import func_largefile
+stats = func_largefile.analyze_large_file("archive_2023.txt", top_n=20)
+stats.eflaw_score, stats.long_sentences, stats.longest_sentences[0]
+```
+---
+# Functions
+"""
+
+## Packages
+import codecs  # to decode the chunks (multi-byte characters may span two chunks)
+import heapq  # to keep the longest sentences
+import io  # to translate the line breaks like open()
+import mmap  # to read the file without loading it
+import os  # to get the file size
+import re  # to find a sentence end in very long lines
+import sys  # to read stdin
+from collections import Counter  # to count the words of a piece
+from dataclasses import asdict, dataclass  # for the result record
+import func_readability as rc  # to import the word lists and the rank of the score
+import func_language  # language profiles
+
+
+# --- Global Parameters ---
+default_chunk_bytes = 1024 * 1024  # bytes decoded at once (the peak memory grows with the chunk size)
+default_top_n = 10  # longest sentences kept
+max_carry_chars = 1024 * 1024  # characters carried over without a line break, then the text is cut at a sentence end
+# --- Global Parameters ---
+
+
+## Words as counted by textstat (see func_words) and sentence ends followed by a space (forced cut)
+_pattern_word = re.compile(r"[\w\='‘’]+")
+_pattern_sentence_end = re.compile(r"[.!?]+['\"’”)\]]*\s")
+
+
+@dataclass
+class LargeTextStats:
+    """Counters of a large text (see module description)."""
+
+    path: str
+    language: str  # language profile (see func_language)
+    characters: int
+    words: int  # words of all sentences (EFLAW)
+    miniwords: int  # mini words (EFLAW)
+    sentences: int  # sentences with more than 4 words (EFLAW)
+    long_sentences: int  # sentences with more words than the threshold of the language
+    syllables: int  # syllables of all words (syllable rule of the language)
+    difficult_words: int  # occurrences of difficult words (see `func_words.WordClassifier`)
+    longest_sentences: tuple  # (sentence no., words, sentence), longest first, no. as in `sentence_length_dict`
+
+    @property
+    def eflaw_value(self):
+        return (self.words + self.miniwords) / self.sentences if self.sentences else None
+
+    @property
+    def eflaw_score(self):
+        return None if self.eflaw_value is None else int(self.eflaw_value)
+
+    @property
+    def eflaw_rank(self):
+        return rc.rank_eflaw(self.eflaw_value)
+
+    def to_dict(self):
+        """Returns the counters, the EFLAW score and rank as dictionary."""
+        return {**asdict(self), 'eflaw_score': self.eflaw_score, 'eflaw_rank': self.eflaw_rank}
+
+
+def iter_chunks(path, chunk_bytes=default_chunk_bytes):
+    """Yields the decoded text of a UTF-8 file chunk by chunk (line breaks translated to "\\n" like open()).
+
+    Args:
+        path (string): Path to the text file, "-" for stdin
+        chunk_bytes (int): Bytes decoded at once
+
+    Yields:
+        text (string): Decoded chunk
+    """
+
+    decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder("utf-8")(), translate=True)
+
+    if path == "-":
+        while True:
+            data = sys.stdin.buffer.read(chunk_bytes)
+            text = decoder.decode(data, final=not data)
+            if text:
+                yield text
+            if not data:
+                return
+
+    with open(path, "rb") as binary_file:
+        size = os.fstat(binary_file.fileno()).st_size
+        if not size:
+            return
+        with mmap.mmap(binary_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for offset in range(0, size, chunk_bytes):
+                text = decoder.decode(mapped[offset:offset + chunk_bytes], final=offset + chunk_bytes >= size)
+                if text:
+                    yield text
+
+
+def iter_pieces(chunks, max_carry=max_carry_chars):
+    """Yields the text in pieces which end after a line break, the rest of a chunk is carried over.
+
+    Args:
+        chunks (iterable): Decoded chunks (see `iter_chunks`)
+        max_carry (int): Characters carried over without a line break, then the text is cut after the
+            last sentence end followed by a space (or the last space)
+
+    Yields:
+        piece (string): Text of complete lines
+    """
+
+    carry = ""
+    for chunk in chunks:
+        text = carry + chunk
+        cut = text.rfind("\n") + 1
+        if not cut and len(text) > max_carry:
+            ends = [match.end() for match in _pattern_sentence_end.finditer(text, len(text) - max_carry)]
+            cut = ends[-1] if ends else text.rfind(" ") + 1
+        if cut:
+            yield text[:cut]
+            carry = text[cut:]
+        else:
+            carry = text
+    if carry:
+        yield carry
+
+
+def analyze_large_file(path, language=None, top_n=default_top_n, chunk_bytes=default_chunk_bytes):
+    """Scores a large plain text file as one text in constant memory (see module description).
+
+    Args:
+        path (string): Path to the UTF-8 text file, "-" for stdin
+        language (string): Language (see `func_language`), "auto" to detect it from the first piece,
+            default: configured default
+        top_n (int): Longest sentences kept
+        chunk_bytes (int): Bytes decoded at once
+
+    Returns:
+        stats (LargeTextStats): Counters, EFLAW score and the longest sentences
+    """
+
+    profile = None
+    characters = words = miniwords = sentences = long_sentences = syllables = difficult_words = 0
+    longest = []  # heap of (words, -sentence no., sentence)
+
+    for piece in iter_pieces(iter_chunks(path, chunk_bytes)):
+        if profile is None:
+            profile = func_language.resolve_language(language, piece)
+            lexicons = rc.get_lexicons(profile.name)
+            segmenter = lexicons.segmenter()
+            classifier = lexicons.classifier()
+        characters += len(piece)
+
+        ## EFLAW counters and the longest sentences (sentence texts are only cut for the top-N)
+        for sentence in segmenter.segment(piece):
+            words += sentence.word_count
+            miniwords += sentence.miniword_count
+            if sentence.word_count > profile.sentence_length_max:
+                long_sentences += 1
+            if sentence.word_count > 4:
+                sentences += 1
+                if len(longest) < top_n:
+                    heapq.heappush(longest, (sentence.word_count, -sentences, piece[sentence.start:sentence.end]))
+                elif sentence.word_count > longest[0][0]:
+                    heapq.heapreplace(longest, (sentence.word_count, -sentences, piece[sentence.start:sentence.end]))
+
+        ## Syllables and difficult words, each unique word of the piece is classified once
+        word_counts = Counter(_pattern_word.findall(piece.lower()))
+        with rc.textstat_language(profile.textstat_lang):
+            classification = classifier.classify_many(word_counts)
+        for word, count in word_counts.items():
+            count_syll, difficult = classification[word]
+            syllables += count * count_syll
+            if difficult:
+                difficult_words += count
+
+    if profile is None:  # empty file
+        profile = func_language.get_profile(None if func_language.is_detected(language) else language)
+    longest_sentences = tuple((-negative_no, count, text) for count, negative_no, text in sorted(longest, reverse=True))
+
+    return LargeTextStats(
+        path=path,
+        language=profile.name,
+        characters=characters,
+        words=words,
+        miniwords=miniwords,
+        sentences=sentences,
+        long_sentences=long_sentences,
+        syllables=syllables,
+        difficult_words=difficult_words,
+        longest_sentences=longest_sentences,
+    )
@@ -0,0 +1,362 @@
+"""
+## Purpose
+Containing the **compiled lexicon artifact**. The csv-word lists (`resources/*.csv`) are compiled once into
+a versioned binary file with the word lists, a sorted index per list and the phrase automatons of the
+jargon and simple word checks. The artifact is memory mapped, hence it loads in milliseconds and all
+processes (e.g. the workers of `func_batch` and `service.py`) share the same pages instead of parsing
+their own copy of the lists.
+
+A word list is only taken from the artifact if its csv file is unchanged (size and modification time,
+otherwise the content hash). After editing a csv file the list is read from the csv file again until
+the artifact is rebuilt.
+
+## Key Elements/Variables
+### LexiconArtifact (class)
+- `is_fresh(name, path)`: the artifact contains the current version of the csv file
+- `lexicon(name)`: word list as `MappedDict` (word/phrase and alternative) or `MappedList`
+- `matcher(name)`: phrase matcher on the memory-mapped automaton (see `func_matcher.FlatPhraseMatcher`)
+
+### build_artifact (function)
+Compiles the word lists into the artifact (written as `<path>.part` and renamed when complete).
+
+## Usage
+Run from the project's root folder after editing a word list:
+```shell
+python scripts/func_lexicon.py           # builds resources/lexicons.bin
+python scripts/func_lexicon.py --check   # lists the word lists and if the artifact is up to date
+```
+---
+# Functions
+"""
+
+## Packages
+import hashlib  # to detect changed csv files
+import json  # for the header of the artifact
+import logging  # to report invalid artifacts
+import mmap  # to map the artifact into memory
+import os  # to check the csv files and rename the complete artifact
+import struct  # for the fixed part of the header
+import sys  # for the byte order of the arrays
+from array import array  # for the arrays of the artifact
+from collections.abc import Mapping, Sequence  # for the read-only views of the word lists
+from func_matcher import PhraseMatcher, FlatPhraseMatcher  # to compile the phrase automatons
+
+
+# --- Global Parameters ---
+MAGIC = b"RCBOTLEX"
+FORMAT_VERSION = 1  # increase if the layout changes, older artifacts are ignored
+matched_lexicons = ("jargon", "simplewords")  # word lists with a phrase automaton
+# --- Global Parameters ---
+
+
+logger = logging.getLogger("rcbot.lexicon")
+
+## Magic, format version and length of the JSON header
+_prefix = struct.Struct("<8sII")
+_alignment = 8
+
+
+def _data_start(header_length):
+    """Returns the offset of the data part (aligned)."""
+    end = _prefix.size + header_length
+    return end + -end % _alignment
+
+
+def file_digest(path):
+    """Returns the SHA-256 hash of a file (hex)."""
+    with open(path, 'rb') as source_file:
+        return hashlib.sha256(source_file.read()).hexdigest()
+
+
+class MappedStrings(Sequence):
+    """Read-only sequence of strings stored as one UTF-8 buffer and their end offsets.
+    A string is only decoded when it is accessed."""
+
+    __slots__ = ("_data", "_ends")
+
+    def __init__(self, data, ends):
+        self._data = data
+        self._ends = ends
+
+    def __len__(self):
+        return len(self._ends)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self._ends)
+        start = self._ends[index - 1] if index else 0
+        return str(self._data[start:self._ends[index]], 'utf-8')
+
+    def find(self, value, order):
+        """Returns the index of a string by binary search over `order` (indexes sorted by their string), or -1."""
+        low, high = 0, len(order)
+        while low < high:
+            middle = (low + high) // 2
+            if self[order[middle]] < value:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(order) and self[order[low]] == value:
+            return order[low]
+
+        return -1
+
+
+class MappedList(Sequence):
+    """Read-only word list (same order as the csv file), `in` uses the sorted index."""
+
+    __slots__ = ("_words", "_order")
+
+    def __init__(self, words, order):
+        self._words = words
+        self._order = order
+
+    def __len__(self):
+        return len(self._words)
+
+    def __getitem__(self, index):
+        return self._words[index]
+
+    def __contains__(self, word):
+        return isinstance(word, str) and self._words.find(word, self._order) >= 0
+
+
+class MappedDict(Mapping):
+    """Read-only word list with alternatives (same order as the csv file), lookups use the sorted index."""
+
+    __slots__ = ("_keys", "_values", "_order", "_matcher")
+
+    def __init__(self, keys, values, order, matcher=None):
+        self._keys = keys
+        self._values = values
+        self._order = order
+        self._matcher = matcher
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __getitem__(self, key):
+        index = self._keys.find(key, self._order) if isinstance(key, str) else -1
+        if index < 0:
+            raise KeyError(key)
+
+        return self._values[index]
+
+    def __contains__(self, key):
+        return isinstance(key, str) and self._keys.find(key, self._order) >= 0
+
+    def matcher(self):
+        """Returns the phrase matcher of the word list (memory-mapped automaton if compiled)."""
+        return self._matcher or PhraseMatcher(self._keys)
+
+
+def phrase_matcher(lexicon):
+    """Returns the phrase matcher of a word list (dictionary or `MappedDict`)."""
+    if isinstance(lexicon, MappedDict):
+        return lexicon.matcher()
+
+    return PhraseMatcher(lexicon.keys())
+
+
+class LexiconArtifact:
+    """Memory-mapped lexicon artifact (see module description).
+
+    Args:
+        path (string): Path to the artifact
+
+    Raises:
+        ValueError: The file is not an artifact of this format version or byte order
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as artifact_file:
+            self._map = mmap.mmap(artifact_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+
+        if len(self._map) < _prefix.size:
+            raise ValueError(f"Not a lexicon artifact: {path}")
+        magic, version, header_length = _prefix.unpack_from(self._map)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"Not a lexicon artifact of format version {FORMAT_VERSION}: {path}")
+        self.header = json.loads(bytes(self._view[_prefix.size:_prefix.size + header_length]))
+        if self.header['byteorder'] != sys.byteorder or self.header['itemsize'] != array('I').itemsize:
+            raise ValueError(f"Lexicon artifact of another platform: {path}")
+        self._data_start = _data_start(header_length)
+        self._fresh = {}  # name: (path, mtime_ns, size) of the checked csv file
+
+    def _array(self, section):
+        """Returns a section of the artifact (memory view, not copied)."""
+        offset, typecode, length = self.header['sections'][section]
+        offset += self._data_start
+        view = self._view[offset:offset + length * array(typecode).itemsize]
+
+        return view if typecode == 'B' else view.cast(typecode)
+
+    def _strings(self, section):
+        return MappedStrings(self._array(f"{section}.data"), self._array(f"{section}.ends"))
+
+    @property
+    def names(self):
+        """Names of the compiled word lists."""
+        return list(self.header['lexicons'])
+
+    def is_fresh(self, name, path, stat=None):
+        """Checks if the artifact contains the current version of a csv file.
+
+        Args:
+            name (string): Name of the word list, e.g. 'jargon'
+            path (string): Path to the csv file
+            stat (os.stat_result): Optional stat of the csv file (saves a system call)
+
+        Returns:
+            fresh (bool): True if the word list can be taken from the artifact
+        """
+
+        source = self.header['sources'].get(name)
+        if source is None or os.path.normpath(source['path']) != os.path.normpath(path):
+            return False
+        stat = stat or os.stat(path)
+        key = (path, stat.st_mtime_ns, stat.st_size)
+        if self._fresh.get(name) == key:
+            return True
+        if stat.st_size != source['size']:
+            return False
+        ## Same size, but touched (e.g. by a checkout): compare the content
+        if stat.st_mtime_ns != source['mtime_ns'] and file_digest(path) != source['sha256']:
+            return False
+        self._fresh[name] = key
+
+        return True
+
+    def lexicon(self, name):
+        """Returns a word list of the artifact (`MappedDict` or `MappedList`)."""
+        lexicon = self.header['lexicons'][name]
+        keys = self._strings(f"{name}.keys")
+        order = self._array(f"{name}.order")
+        if lexicon['kind'] == 'list':
+            return MappedList(keys, order)
+
+        return MappedDict(keys, self._strings(f"{name}.values"), order, self.matcher(name) if lexicon['matcher'] else None)
+
+    def matcher(self, name):
+        """Returns the phrase matcher of a word list on the memory-mapped automaton."""
+        arrays = {part: self._array(f"{name}.matcher.{part}") for part in self.header['lexicons'][name]['matcher']}
+
+        return FlatPhraseMatcher(self._strings(f"{name}.keys"), arrays)
+
+
+def open_artifact(path):
+    """Opens the lexicon artifact.
+
+    Returns:
+        artifact (LexiconArtifact): Artifact or None if it does not exist or is invalid (e.g. older format)
+    """
+
+    if not os.path.exists(path):
+        return None
+    try:
+        return LexiconArtifact(path)
+    except (OSError, ValueError, KeyError) as error:
+        logger.warning(f"Lexicon artifact ignored, the csv-word lists are used: {error}")
+        return None
+
+
+def _string_arrays(strings):
+    """Returns the UTF-8 buffer and the end offsets of strings."""
+    data = bytearray()
+    ends = array('I')
+    for string in strings:
+        data += string.encode('utf-8')
+        ends.append(len(data))
+
+    return array('B', data), ends
+
+
+def build_artifact(paths, output):
+    """Compiles the word lists into the artifact.
+
+    Args:
+        paths (dict): Name and (path, reader function) of the word lists (see `func_readability.lexicon_cache`)
+        output (string): Path of the artifact
+
+    Returns:
+        header (dict): Header of the written artifact (sources, word lists and sections)
+    """
+
+    sections = {}  # name: array
+    header = {'byteorder': sys.byteorder, 'itemsize': array('I').itemsize, 'sources': {}, 'lexicons': {}}
+    for name, (path, reader) in paths.items():
+        stat = os.stat(path)
+        lexicon = reader(path)
+        header['sources'][name] = {'path': path, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': file_digest(path)}
+        keys = list(lexicon)
+        sections[f"{name}.keys.data"], sections[f"{name}.keys.ends"] = _string_arrays(keys)
+        sections[f"{name}.order"] = array('I', sorted(range(len(keys)), key=keys.__getitem__))
+        entry = {'kind': 'list' if isinstance(lexicon, list) else 'dict', 'matcher': []}
+        if entry['kind'] == 'dict':
+            sections[f"{name}.values.data"], sections[f"{name}.values.ends"] = _string_arrays(lexicon.values())
+            if name in matched_lexicons:
+                for part, values in PhraseMatcher(keys).flatten().items():
+                    sections[f"{name}.matcher.{part}"] = values
+                    entry['matcher'].append(part)
+        header['lexicons'][name] = entry
+
+    ## Offsets relative to the data part, which starts aligned after the header
+    header['sections'] = {}
+    offset = 0
+    for section, values in sections.items():
+        offset += -offset % _alignment
+        header['sections'][section] = [offset, values.typecode, len(values)]
+        offset += len(values) * values.itemsize
+    header_data = json.dumps(header).encode('utf-8')
+    data_start = _data_start(len(header_data))
+
+    partial_path = output + ".part"
+    with open(partial_path, 'wb') as artifact_file:
+        artifact_file.write(_prefix.pack(MAGIC, FORMAT_VERSION, len(header_data)))
+        artifact_file.write(header_data)
+        for section, values in sections.items():
+            artifact_file.write(b"\0" * (data_start + header['sections'][section][0] - artifact_file.tell()))
+            values.tofile(artifact_file)
+    os.replace(partial_path, output)
+
+    return header
+
+
+def main(argv=None):
+    import argparse  # imported on first use
+    import func_readability as rc  # to get the word lists and the artifact path
+
+    parser = argparse.ArgumentParser(description="Compile the csv-word lists into the memory-mapped lexicon artifact.")
+    parser.add_argument("--output", default=rc.path_lexicon_artifact, help=f"artifact path (default: {rc.path_lexicon_artifact})")
+    parser.add_argument("--check", action="store_true", help="only check if the artifact is up to date (exit code 1 if not)")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        artifact = open_artifact(args.output)
+        stale = []
+        for name, (path, _) in rc.lexicon_cache.paths.items():
+            fresh = artifact is not None and artifact.is_fresh(name, path)
+            print(f"{name:<18}{path:<40}{'up to date' if fresh else 'stale (csv file is used)'}")
+            if not fresh:
+                stale.append(name)
+        return 1 if stale else 0
+
+    header = build_artifact(rc.lexicon_cache.paths, args.output)
+    for name, entry in header['lexicons'].items():
+        words = header['sections'][f"{name}.keys.ends"][2]
+        states = header['sections'][f"{name}.matcher.fail"][2] if entry['matcher'] else 0
+        print(f"{name:<18}{words:>7} entries" + (f"{states:>8} automaton states" if states else ""))
+    print(f"Lexicon artifact written: {args.output} ({os.path.getsize(args.output)} bytes)")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
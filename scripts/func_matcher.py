@@ -0,0 +1,210 @@
+"""
+## Purpose
+Containing the **phrase matcher** (Aho-Corasick automaton) used by the jargon and simple word checks.
+The automaton is compiled once per word list and finds all phrases in **one pass** over the text,
+independent of the number of phrases in the list.
+
+## Key Elements/Variables
+### PhraseMatcher (class)
+- `find_all(text)`: list of matches `(start, end, phrase)`
+- `count(text)`: dictionary phrase and number of matches
+
+Matches are only reported on word boundaries, e.g. "area" does not match within "areas".
+
+### FlatPhraseMatcher (class)
+Same automaton stored as flat integer arrays (see `PhraseMatcher.flatten`), e.g. memory mapped from the
+compiled lexicon artifact (see `func_lexicon`). A state is decoded on its first visit, hence only the
+states reached by the texts use private memory.
+---
+# Functions
+"""
+
+## Packages
+from array import array  # for the flat automaton
+
+
+class PhraseMatcher:
+    """Aho-Corasick automaton over a list of phrases. Phrases are matched case-insensitive
+    (the text is expected in lower case, as prepared by `Document.checker_text`).
+
+    Args:
+        phrases (iterable): Phrases to search for (e.g. the keys of the jargon dictionary)
+    """
+
+    __slots__ = ("phrases", "_goto", "_fail", "_output")
+
+    def __init__(self, phrases):
+        self.phrases = list(dict.fromkeys(phrases))
+        self._goto = [{}]  # state: {character: next state}
+        self._fail = [0]  # state: fallback state
+        self._output = [()]  # state: indexes of the phrases ending in this state
+
+        ## Build the trie
+        for index, phrase in enumerate(self.phrases):
+            state = 0
+            for character in phrase.lower():
+                next_state = self._goto[state].get(character)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][character] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(())
+                state = next_state
+            if phrase:
+                self._output[state] += (index,)
+
+        ## Add the fallback links (breadth first)
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for character, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and character not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                fallback = self._goto[fallback].get(character, 0)
+                self._fail[next_state] = fallback
+                self._output[next_state] += self._output[fallback]
+
+    def __len__(self):
+        return len(self.phrases)
+
+    def flatten(self):
+        """Returns the automaton as flat arrays of unsigned integers (see `FlatPhraseMatcher`).
+
+        Returns:
+            arrays (dict): "offsets" (first transition per state, one more entry than states), "characters"
+                (code points, sorted per state), "targets", "fail", "output_offsets", "outputs" (phrase indexes)
+                and "lengths" (characters per phrase)
+        """
+
+        arrays = {name: array('I') for name in ("offsets", "characters", "targets", "fail", "output_offsets", "outputs", "lengths")}
+        for state, transitions in enumerate(self._goto):
+            arrays['offsets'].append(len(arrays['characters']))
+            for character, next_state in sorted(transitions.items()):
+                arrays['characters'].append(ord(character))
+                arrays['targets'].append(next_state)
+            arrays['fail'].append(self._fail[state])
+            arrays['output_offsets'].append(len(arrays['outputs']))
+            arrays['outputs'].extend(self._output[state])
+        arrays['offsets'].append(len(arrays['characters']))
+        arrays['output_offsets'].append(len(arrays['outputs']))
+        arrays['lengths'].extend(len(phrase) for phrase in self.phrases)
+
+        return arrays
+
+    def _matches(self, text):
+        """Yields all matches on word boundaries as (start, end, phrase index)."""
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        phrases = self.phrases
+        text_length = len(text)
+
+        state = 0
+        for position, character in enumerate(text):
+            while state and character not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(character, 0)
+            if output[state]:
+                end = position + 1
+                for index in output[state]:
+                    start = end - len(phrases[index])
+                    ## Only accept matches on word boundaries
+                    if start > 0 and text[start - 1].isalnum():
+                        continue
+                    if end < text_length and text[end].isalnum():
+                        continue
+                    yield start, end, index
+
+    def find_all(self, text):
+        """Finds all phrases in the text, including overlapping ones.
+
+        Args:
+            text (string): Lower case text
+
+        Returns:
+            matches (list): Tuples (start offset, end offset, phrase) in the order of their end offset
+        """
+
+        phrases = self.phrases
+        return [(start, end, phrases[index]) for start, end, index in self._matches(text)]
+
+    def count(self, text):
+        """Counts the matches per phrase. Phrases without a match are not included.
+
+        Args:
+            text (string): Lower case text
+
+        Returns:
+            counts (dict): Phrase and number of matches, in the order of the phrase list
+        """
+
+        counts = {}
+        for _, _, index in self._matches(text):
+            counts[index] = counts.get(index, 0) + 1
+
+        phrases = self.phrases
+        return {phrases[index]: counts[index] for index in sorted(counts)}
+
+
+class FlatPhraseMatcher(PhraseMatcher):
+    """Aho-Corasick automaton stored as flat arrays (see `PhraseMatcher.flatten`). The arrays can be any
+    sequence of integers, e.g. memory views of a memory-mapped file, hence the automaton is not copied.
+
+    Args:
+        phrases (sequence): Phrases in the order of the phrase indexes
+        arrays (dict): Flat arrays of the automaton
+    """
+
+    __slots__ = ("_offsets", "_characters", "_targets", "_output_offsets", "_outputs", "_lengths", "_visited")
+
+    def __init__(self, phrases, arrays):
+        self.phrases = phrases
+        self._goto = None
+        self._output = None
+        self._fail = arrays['fail']
+        self._offsets = arrays['offsets']
+        self._characters = arrays['characters']
+        self._targets = arrays['targets']
+        self._output_offsets = arrays['output_offsets']
+        self._outputs = arrays['outputs']
+        self._lengths = arrays['lengths']
+        self._visited = [None] * len(self._fail)  # per state: ({character: next state}, phrase indexes), decoded on the first visit
+
+    def _state(self, state):
+        """Decodes a state of the flat arrays (transitions and phrase indexes), kept for the next visits."""
+        low, high = self._offsets[state], self._offsets[state + 1]
+        decoded = self._visited[state] = (
+            {chr(self._characters[transition]): self._targets[transition] for transition in range(low, high)},
+            tuple(self._outputs[self._output_offsets[state]:self._output_offsets[state + 1]]))
+
+        return decoded
+
+    def _matches(self, text):
+        """Yields all matches on word boundaries as (start, end, phrase index).
+        Only the visited states are decoded (private memory), the automaton stays in the shared arrays."""
+        visited = self._visited
+        fail = self._fail
+        lengths = self._lengths
+        text_length = len(text)
+
+        goto, output = visited[0] or self._state(0)
+        state = 0
+        for position, character in enumerate(text):
+            while state and character not in goto:
+                state = fail[state]
+                goto, output = visited[state] or self._state(state)
+            state = goto.get(character, 0)
+            goto, output = visited[state] or self._state(state)
+            if output:
+                end = position + 1
+                for index in output:
+                    start = end - lengths[index]
+                    ## Only accept matches on word boundaries
+                    if start > 0 and text[start - 1].isalnum():
+                        continue
+                    if end < text_length and text[end].isalnum():
+                        continue
+                    yield start, end, index
+
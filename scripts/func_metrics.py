@@ -0,0 +1,203 @@
+"""
+## Purpose
+Containing the **metric registry** of the readability analysis. Every metric declares the metrics it needs
+(its inputs) and the result fields it calculates (see `func_result.ObservationResult`). The parts of the document
+shared by several metrics (sentences, words, vocabulary, syllables, checker text, see `func_document.Document`)
+are metrics without result fields. A caller requests result keys, e.g. EFLAW and Gunning FOG only
+for a triage of many paragraphs, and only the metrics needed for these keys are calculated, each once
+and after its inputs. The result fields of the metrics which are not calculated are None.
+
+## Key Elements/Variables
+### Metric (class)
+Name, inputs, result fields, calculation and timing stage (see `func_timing`) of one metric.
+
+### register (function)
+Adds a metric to the registry, its inputs must be registered before (hence the registry order is a valid
+calculation order).
+
+### plan (function)
+Metrics needed for result keys (dictionary keys listed in `app2` or raw fields), in calculation order.
+
+### evaluate (function)
+Calculates the metrics of a plan for one document.
+
+## Usage
+```python3 linenums="1"
+import func_metrics
+func_metrics.plan(["eflaw_score", "gunning_fog_score"])  # ('sentences', 'words', 'vocabulary', 'syllables', 'eflaw', 'gunning_fog')
+observation_stats = rc.analyze_observation(i, text, metrics=func_metrics.TRIAGE)
+```
+---
+# Functions
+"""
+
+## Packages
+from dataclasses import dataclass  # for the metric record
+from functools import lru_cache  # to keep the plans of the requested keys
+import func_readability as rc  # to import the readability algorithms
+import func_result  # to get the raw fields of the result keys
+import func_timing  # to time the readability stages
+
+
+# --- Global Parameters ---
+TRIAGE = ("eflaw_score", "eflaw_rank", "gunning_fog_score", "gunning_fog_rank")  # result keys of a triage
+ALWAYS = ("observation_no", "language")  # result fields set by the analysis itself
+# --- Global Parameters ---
+
+
+@dataclass(frozen=True)
+class Metric:
+    """One metric of the registry (see module description)."""
+
+    name: str  # e.g. "eflaw"
+    inputs: tuple  # names of the metrics calculated before
+    fields: tuple  # result fields, in the order returned by `calculate`
+    calculate: object  # function(document, profile) returning the values of the fields
+    stage: str  # timing stage (see `func_timing`)
+
+
+## Name and metric, in calculation order
+METRICS = {}
+## Result field and name of the metric calculating it
+_producers = {}
+
+
+def register(metric):
+    """Adds a metric to the registry.
+
+    Args:
+        metric (Metric): Metric, its inputs must be registered before
+
+    Raises:
+        ValueError: Metric or field registered twice, unknown input
+    """
+
+    if metric.name in METRICS:
+        raise ValueError(f"Metric registered twice: {metric.name}")
+    unknown = [name for name in metric.inputs if name not in METRICS]
+    if unknown:
+        raise ValueError(f"Unknown inputs of metric {metric.name}: {', '.join(unknown)} (register them before)")
+    for field in metric.fields:
+        if field in _producers:
+            raise ValueError(f"Field {field} of metric {metric.name} is calculated by metric {_producers[field]}")
+    METRICS[metric.name] = metric
+    for field in metric.fields:
+        _producers[field] = metric.name
+    _plan.cache_clear()
+
+
+def raw_fields(key):
+    """Returns the raw fields of a result key, e.g. ("eflaw_value",) for "eflaw_score".
+
+    Args:
+        key (string): Dictionary key (see `func_result.RESULT_KEYS`) or raw field (see `func_result.RAW_FIELDS`)
+
+    Raises:
+        ValueError: Unknown result key
+    """
+
+    attribute = func_result.RESULT_KEYS.get(key, key)
+    if attribute in func_result.RAW_FIELDS:
+        return (attribute,)
+    fields = getattr(getattr(getattr(func_result.ObservationResult, attribute, None), 'fget', None), 'raw_fields', None)
+    if fields is None:
+        raise ValueError(f"Unknown result key: {key}")
+
+    return fields
+
+
+def plan(keys=None):
+    """Returns the metrics needed for result keys (incl. their inputs).
+
+    Args:
+        keys (list): Result keys (see `raw_fields`), None: all metrics
+
+    Returns:
+        names (tuple): Names of the metrics, in calculation order
+    """
+
+    return _plan(None if keys is None else tuple(keys))
+
+
+@lru_cache(maxsize=None)
+def _plan(keys):
+    if keys is None:
+        return tuple(METRICS)
+
+    needed = set()
+    stack = [_producers[field] for key in keys for field in raw_fields(key) if field not in ALWAYS]
+    while stack:
+        name = stack.pop()
+        if name not in needed:
+            needed.add(name)
+            stack.extend(METRICS[name].inputs)
+
+    return tuple(name for name in METRICS if name in needed)
+
+
+def evaluate(document, profile, names, values=None, timings=None):
+    """Calculates the metrics of a plan for one document.
+
+    Args:
+        document (Document): Parsed observation (see `func_document`)
+        profile (LanguageProfile): Language of the document (see `func_language`)
+        names (tuple): Metrics in calculation order (see `plan`)
+        values (dict): Fields known before (e.g. the sentiment of a batch), their metrics are skipped
+        timings (Timings): Collector of the stage timings (see `func_timing`)
+
+    Returns:
+        values (dict): Result field and value, all fields of the registry (None if not calculated)
+    """
+
+    timings = timings or func_timing.null_timings
+    values = dict(values or ())
+    for name in names:
+        metric = METRICS[name]
+        if metric.fields and all(field in values for field in metric.fields):
+            continue
+        with timings.span(metric.stage):
+            values.update(zip(metric.fields, metric.calculate(document, profile)))
+    for field in _producers:
+        values.setdefault(field, None)
+
+    return values
+
+
+## Metrics of the readability analysis
+def _part(name):
+    """Returns the calculation of a shared part of the document (no result fields, kept by the document)."""
+    def calculate(document, profile):
+        getattr(document, name)
+        return ()
+    return calculate
+
+
+def _sentiment(document, profile):
+    # English lexicon, not analyzed for the other languages
+    return rc.sentiment_scores(document) if profile.sentiment else (None, None)
+
+
+## Shared parts of the document
+register(Metric("sentences", (), (), _part("sentences"), 'parse'))
+register(Metric("words", (), (), _part("words"), 'parse'))
+register(Metric("vocabulary", (), (), _part("vocabulary"), 'parse'))
+register(Metric("syllables", ("words", "vocabulary"), (), _part("syllables"), 'textstat'))
+register(Metric("checker_text", (), (), _part("checker_text"), 'parse'))
+
+## Results
+register(Metric("eflaw", ("sentences",),
+                ("eflaw_value", "eflaw_sentencecount", "eflaw_miniwords_count", "sentence_lengths", "sentence_texts"),
+                lambda document, profile: rc.eflaw_counts(document), 'eflaw'))
+register(Metric("long_sentences", ("sentences",), ("long_sentences",),
+                lambda document, profile: (rc.long_sentences(0, document),), 'eflaw'))
+register(Metric("textstat_counts", ("words", "syllables"), ("words", "sentences", "syllables"),
+                lambda document, profile: rc.textstat_counts(document), 'textstat'))
+register(Metric("difficult_words", ("vocabulary",), ("difficult_words",),
+                lambda document, profile: (rc.difficult_words(document),), 'textstat'))
+register(Metric("gunning_fog", ("words", "vocabulary", "syllables"), ("gunning_fog_value",),
+                lambda document, profile: (rc.gunning_fog_value(document),), 'textstat'))
+register(Metric("jargon", ("checker_text",), ("jargon_hits",),
+                lambda document, profile: (rc.find_lexicon_phrases(document, 'jargon'),), 'checkers'))
+register(Metric("simplewords", ("checker_text",), ("simplewords_hits",),
+                lambda document, profile: (rc.find_lexicon_phrases(document, 'simplewords'),), 'checkers'))
+register(Metric("sentiment", (), ("polarity", "subjectivity"), _sentiment, 'sentiment'))
@@ -6,22 +6,53 @@ Containing functions to pre-process the text and calculate the readability score
 """
 
 ## Packages
-import pandas as pd
-import altair as alt
-import streamlit as st  # to render streamlit webpage
+## textstat, pandas, altair (charts) and textblob (sentiment) are imported on first use,
+## hence scripts only calculating some of the scores do not pay their import time.
+import bisect  # to look up the ranks in the threshold tables
 import csv  # to process csv files
-import textstat  # to calculate text statistics
-import re  # to find and calculate syllables in a word
-from textblob import TextBlob  # for Sentiment Analysis
-from icecream import ic  # to easily print variables (testing)
+import math  # to round the Gunning FOG score as textstat
+import os  # to check the modification time of the csv files
+import threading  # to guard the shared lexicon cache and the textstat language
+from contextlib import contextmanager  # for the textstat language
+from func_document import Document, SentenceSegmenter, as_document  # parsed observation shared by all metrics
+import func_lexicon  # memory-mapped word lists and phrase matchers (compiled artifact)
+import func_language  # language profiles (textstat language, word lists, thresholds)
+import func_words  # memoized syllables and difficult words
+import func_sentiment  # pluggable sentiment backends
+import func_result  # compact result record of an observation
+import func_metrics  # metric registry (calculates only the requested metrics)
+import func_timing  # to time the readability stages
 
 
 # --- Global Parameters ---
+## Thresholds of English texts, the language profiles set their own (see resources/language_profiles.ini)
 recommended_sentence_lengh_max = 20  # or lower
 recommended_score_fres = 49  # or higher
 recommended_score_eflaw = 25  # or lower
 recommended_score_gfs = 17  # or lower
 recommended_score_cons = 18  # or lower
+sentiment_not_analyzed = "not analyzed"  # rank if the sentiment backend is "off"
+chart_max_bars = 150  # sentences shown as single bars, longer documents as sentence windows
+chart_page_size = 50  # sentences per drill-down page
+chart_histogram_bin_words = 5  # words per bin of the sentence length histogram
+
+## Rank tables: EFLAW ranks up to (incl.) the bound, Gunning FOG ranks from (incl.) the bound
+eflaw_rank_bounds = (20, 25, 29)
+eflaw_ranks = ("Very easy to understand.", "Easy to understand.", "Difficult to understand.", "Very confusing.")
+eflaw_rank_missing = "n/a"  # no sentence with more than 4 words, hence no EFLAW score
+gunning_fog_rank_bounds = (6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16, 17, 18)
+gunning_fog_ranks = ("Below sixth grade.", "6th grade level.", "7th grade level.", "8th grade level.",
+                     "High school freshman level.", "High school sophomore level.", "High school junior level.",
+                     "High school senior level.", "College freshman level.", "College sophomore level.",
+                     "College junior level.", "College senior level.", "College graduate level.",
+                     "Beyond college graduate level.")
+
+## Increase if a change of the functions below changes the results (invalidates cached results)
+scoring_rules_version = 4
+
+## Columns of the exported observation table
+export_columns = ['Observation No.', 'eflaw_score_rank', 'gunning_fog_score_rank', 'improvement_suggestions',
+                  'eflaw_sentencecount', 'eflaw_miniwords_count', 'words', 'long_sentences', 'jargon_checklist', 'simplewords_checklist', 'bob_result_polarity', 'bob_result_subjectivity']
 # --- Global Parameters ---
 
 
@@ -34,6 +65,51 @@ observation_stats_list = []
 # --- Global Variables ---
 
 
+_textstat = None
+_textstat_lang = None  # language currently set in textstat
+_textstat_lock = threading.RLock()
+
+
+def get_textstat():
+    """Imports textstat on first use (to calculate text statistics) and sets the language once,
+    otherwise the textstat default (en_US) applies until the first text_statistics call.
+
+    Returns:
+        textstat (module): textstat module
+    """
+
+    global _textstat, _textstat_lang
+    if _textstat is None:
+        import textstat
+        textstat.set_lang("en")
+        _textstat_lang = "en"
+        _textstat = textstat
+
+    return _textstat
+
+
+@contextmanager
+def textstat_language(lang):
+    """Sets the textstat language for the enclosed block. The language is global state of textstat and
+    `set_lang` clears all textstat caches, hence it is only called if the language changes (e.g. once per
+    language group of a batch, see `func_language.group_by_language`). Other threads wait until the block is left.
+
+    Args:
+        lang (string): textstat language, e.g. "en" or "de"
+
+    Yields:
+        textstat (module): textstat module
+    """
+
+    global _textstat_lang
+    textstat = get_textstat()
+    with _textstat_lock:
+        if lang != _textstat_lang:
+            textstat.set_lang(lang)
+            _textstat_lang = lang
+        yield textstat
+
+
 def make_url_link(URL, text):
     """Takes a "link text", "URL target" and returns a url link in html a tag format.
     
@@ -51,40 +127,217 @@ def make_url_link(URL, text):
     return link
 
 
-def load_external_lists():
-    """Function to load external csv-word lists.
+## list of jargon words which should be avoided
+path_jargon_check = r"resources/list_jargon_check.csv"
+
+## list of words which could be simplified
+path_simple_words = r"resources/list_simple_words.csv"
+
+## list of "difficult words" which can be "ignored" as difficult
+path_difficult_words = r"resources/list_difficult_words.csv"
+
+## list of abbreviations whose period does not end a sentence (e.g. "approx.")
+path_abbreviations = r"resources/list_abbreviations.csv"
+
+## compiled word lists and phrase automatons (build: python scripts/func_lexicon.py), the csv files are used if missing or stale
+path_lexicon_artifact = r"resources/lexicons.bin"
+
+
+def read_csv_dict(path):
+    """Reads a semicolon separated csv-word list (word/phrase;alternatives) into a dictionary.
+
+    Args:
+        path (string): Path to the csv file
 
     Returns:
-        dict_jargon (dict): Jargon phrases and words
-        dict_simplewords (dict): Words which could be simplified (incl. alternatives)
-        list_difficult_words (list): Difficult words which can be ignored as difficult
+        dict_words (dict): Words/phrases and their alternatives
     """
 
-    ## list of jargon words which should be avoided
-    list_jargon_check = r"resources/list_jargon_check.csv"
+    with open(path, 'r') as list_file:
+        dict_words = dict(filter(None, csv.reader(list_file, delimiter=";")))
+
+    return dict_words
+
+
+def read_csv_list(path):
+    """Reads a comma separated csv-word list into a list.
 
-    ## list of words which could be simplified
-    list_simple_words = r"resources/list_simple_words.csv"
+    Args:
+        path (string): Path to the csv file
+
+    Returns:
+        list_words (list): Words of the file
+    """
+
+    with open(path, 'r') as list_file:
+        fileimport = list_file.read()
+        list_words = fileimport.split(",")
 
-    ## list of "difficult words" which can be "ignored" as difficult
-    list_difficult_words = r"resources/list_difficult_words.csv"
+    return list_words
 
-    with open(list_jargon_check, 'r') as list_jc:
-        dict_jargon = dict(filter(None, csv.reader(list_jc, delimiter=";")))
 
-    with open(list_simple_words, 'r') as list_sw:
-        dict_simplewords = dict(filter(None, csv.reader(list_sw, delimiter=";")))
+class LexiconCache:
+    """Process-wide cache for the external csv-word lists.
+    Every file is cached with its modification time and size. A file is only parsed again if it
+    changed on disk, hence edits (e.g. of the jargon list) take effect without a restart.
+    Word lists which are up to date in the compiled artifact (see `func_lexicon`) are memory mapped
+    instead of parsed.
 
-    ## load list of "difficult words" which can be "ignored"
-    with open(list_difficult_words, 'r') as list_dw:
-        fileimport = list_dw.read()
-        list_difficult_words = fileimport.split(",")
+    Args:
+        paths (dict): Lexicon name and (path, reader function)
+        artifact_path (string): Path to the compiled lexicon artifact (optional)
+        syllables (string): Syllable rule of the word classifier (see `func_words.WordClassifier`)
+        miniword_max_length (int): Characters of a mini word (see `func_document.SentenceSegmenter`)
+    """
 
-    return dict_jargon, dict_simplewords, list_difficult_words
+    def __init__(self, paths, artifact_path=None, syllables="custom", miniword_max_length=3):
+        self.paths = paths
+        self.artifact_path = artifact_path
+        self.syllables = syllables
+        self.miniword_max_length = miniword_max_length
+        self._artifact = None  # opened on first use, False: not available
+        self._entries = {}  # path: (mtime_ns, size, parsed lexicon)
+        self._derived = {}  # (kind, name): (parsed lexicon, matcher/classifier/segmenter)
+        self._lock = threading.Lock()
+        self.loads = 0  # number of file parses (for monitoring)
+        self.mapped = 0  # number of word lists taken from the artifact (for monitoring)
+
+    def get(self, name):
+        """Returns the parsed lexicon, re-reading the file only if it changed since the last call."""
+        path, reader = self.paths[name]
+        stat = os.stat(path)
+        entry = self._entries.get(path)
+        if entry is None or entry[0] != stat.st_mtime_ns or entry[1] != stat.st_size:
+            with self._lock:
+                artifact = self.artifact()
+                if artifact is not None and name in artifact.names and artifact.is_fresh(name, path, stat):
+                    entry = (stat.st_mtime_ns, stat.st_size, artifact.lexicon(name))
+                    self.mapped += 1
+                else:
+                    entry = (stat.st_mtime_ns, stat.st_size, reader(path))
+                    self.loads += 1
+                self._entries[path] = entry
+
+        return entry[2]
+
+    def artifact(self):
+        """Returns the compiled lexicon artifact (opened on first use) or None."""
+        if self._artifact is None:
+            self._artifact = (self.artifact_path and func_lexicon.open_artifact(self.artifact_path)) or False
+
+        return self._artifact or None
+
+    def _build(self, kind, name, builder):
+        """Returns the object built from a lexicon, built again only after the lexicon file changed."""
+        lexicon = self.get(name)
+        cached = self._derived.get((kind, name))
+        if cached is None or cached[0] is not lexicon:
+            cached = (lexicon, builder(lexicon))
+            self._derived[(kind, name)] = cached
+
+        return cached[1]
+
+    def matcher(self, name):
+        """Returns the phrase matcher compiled from the keys of a lexicon dictionary (memory-mapped automaton
+        if the word list is taken from the artifact)."""
+        return self._build('matcher', name, func_lexicon.phrase_matcher)
+
+    def classifier(self):
+        """Returns the word classifier ignoring the difficult words list. The classifier (and its word memo)
+        is kept for the whole corpus."""
+        return self._build('classifier', 'difficult_words',
+                           lambda lexicon: func_words.WordClassifier(lexicon, syllables=self.syllables))
+
+    def segmenter(self):
+        """Returns the sentence segmenter using the abbreviations list."""
+        return self._build('segmenter', 'abbreviations', lambda lexicon: SentenceSegmenter(lexicon, self.miniword_max_length))
+
+    def load(self):
+        """Returns all lexicons in the order of `load_external_lists`."""
+        return self.get('jargon'), self.get('simplewords'), self.get('difficult_words')
+
+    def reload(self):
+        """Drops all cached lexicons (and the artifact), the next call parses the files again."""
+        with self._lock:
+            self._artifact = None
+            self._entries.clear()
+            self._derived.clear()
+
+    @property
+    def version(self):
+        """String identifying the currently loaded lexicon files (path, mtime and size)."""
+        return ";".join(f"{path}:{entry[0]}:{entry[1]}" for path, entry in sorted(self._entries.items()))
+
+
+## Shared by all callers (and Streamlit sessions) within this process
+lexicon_cache = LexiconCache({
+    'jargon': (path_jargon_check, read_csv_dict),
+    'simplewords': (path_simple_words, read_csv_dict),
+    'difficult_words': (path_difficult_words, read_csv_list),
+    'abbreviations': (path_abbreviations, read_csv_list),
+}, path_lexicon_artifact)
+
+## Word lists of the other languages (see `get_lexicons`)
+_lexicon_caches = {}
+_readers = {'jargon': read_csv_dict, 'simplewords': read_csv_dict, 'difficult_words': read_csv_list, 'abbreviations': read_csv_list}
+
+
+def get_lexicons(language=None):
+    """Returns the lexicon cache of a language (created on first use and kept for the process).
+    Languages using the default word lists share `lexicon_cache` (incl. the compiled artifact).
+
+    Args:
+        language (string): Language name (see `func_language`), default: configured default language
+
+    Returns:
+        lexicons (LexiconCache): Word lists, matchers, classifier and segmenter of the language
+    """
+
+    profile = func_language.get_profile(language)
+    lexicons = _lexicon_caches.get(profile.name)
+    if lexicons is None:
+        paths = {name: (path, _readers[name]) for name, path in profile.lexicon_paths}
+        if paths == lexicon_cache.paths and (profile.syllables, profile.miniword_max_length) == (
+                lexicon_cache.syllables, lexicon_cache.miniword_max_length):
+            lexicons = lexicon_cache
+        else:
+            lexicons = LexiconCache(paths, syllables=profile.syllables, miniword_max_length=profile.miniword_max_length)
+        lexicons = _lexicon_caches.setdefault(profile.name, lexicons)
+
+    return lexicons
+
+
+def result_profile(observation_stats):
+    """Returns the language profile of a result (results without language: configured default language)."""
+    return func_language.get_profile(observation_stats['language'] if 'language' in observation_stats else None)
+
+
+def load_external_lists(language=None):
+    """Function to load external csv-word lists. The lists are cached process-wide and only
+    parsed again if a file changed (see `LexiconCache`).
+
+    Args:
+        language (string): Language of the word lists (see `func_language`), default: configured default language
+
+    Returns:
+        dict_jargon (dict): Jargon phrases and words
+        dict_simplewords (dict): Words which could be simplified (incl. alternatives)
+        list_difficult_words (list): Difficult words which can be ignored as difficult
+    """
+
+    return get_lexicons(language).load()
+
+
+def reload_external_lists():
+    """Forces a reload of the external csv-word lists (all languages) with the next `load_external_lists` call."""
+    lexicon_cache.reload()
+    for lexicons in _lexicon_caches.values():
+        lexicons.reload()
 
 
 def count_syllables(word):
     """Custom function to calculate syllables in a word. This function is **not used** with the actual readability scores.
+    Memoized, see `func_words.count_syllables`.
         
         Args:
             word (string): Single word which should be analyzed for syllables
@@ -92,45 +345,158 @@ def count_syllables(word):
         Returns:
             syllables_count (int): Number of syllables found
     """
-    
-    syllables_count = len(re.findall('(?!e$)[aeiouy]+', word, re.I) + re.findall('^[^aeiouy]*e$', word, re.I))
 
-    return syllables_count
+    return func_words.count_syllables(word)
 
 
-def text_statistics(i, observation):
-    """Function to calculate test statistics."""
-    _, _, list_difficult_words = load_external_lists()
-    """Function to calculate the text statistics."""
-    observation = observation.replace("\n", ". ")
+def word_syllables(words, language=None):
+    """Counts the syllables of words with the hyphenation dictionary of textstat (as `textstat.syllable_count`).
+
+    Args:
+        words (iterable): Lower case words (see `Document.words` and `Document.vocabulary`)
+        language (string): Language (see `func_language`), default: configured default language
+
+    Returns:
+        syllables (dict): Word and syllables
+    """
+
+    with textstat_language(func_language.get_profile(language).textstat_lang) as textstat:
+        return {word: textstat.syllable_count(word) for word in words}
+
+
+def fog_syllable_threshold(textstat_lang):
+    """Returns the syllables of a complex word of the Gunning FOG score (as textstat.gunning_fog)."""
+    from textstat.textstat import langs  # imported on first use
+
+    default = langs["en"]
+    return langs.get(textstat_lang.split("_")[0], default).get("syllable_threshold", default["syllable_threshold"])
 
-    # Set language
-    textstat.set_lang("en")
 
-    # Count words
-    lexiconcount = textstat.lexicon_count(observation, removepunct=True)
+def round_half_up(number, points):
+    """Rounds half away from zero (the legacy rounding of textstat)."""
+    p = 10 ** points
+    return math.floor(number * p + math.copysign(0.5, number)) / p
+
+
+def parse_document(observation):
+    """Parses the observation once. The returned document can be passed to all metric functions.
+
+    Args:
+        observation (string): Observation text
+
+    Returns:
+        document (Document): Parsed observation (see `func_document`)
+    """
+
+    return Document(observation)
 
-    # Count sentences
-    sentencecount = textstat.sentence_count(observation)
 
-    # Count syllable
-    syllablecount = textstat.syllable_count(observation)
+def textstat_counts(observation):
+    """Calculates the textstat counts of the observation.
+
+    Args:
+        observation (string or Document): Observation text
+
+    Returns:
+        lexiconcount (int): Number of words
+        sentencecount (int): Number of sentences
+        syllablecount (int): Number of syllables
+    """
+    document = as_document(observation)
+
+    # Count words and syllables (words and their syllables are counted once by the Document)
+    words, syllables = document.words, document.syllables
+    lexiconcount = len(words)
+    syllablecount = sum(syllables[word] for word in words)
+
+    # Count sentences (language only set if it changed, see `textstat_language`)
+    with textstat_language(func_language.get_profile(document.language).textstat_lang) as textstat:
+        sentencecount = textstat.sentence_count(document.stats_text)
+
+    return lexiconcount, sentencecount, syllablecount
+
+
+def difficult_words(observation):
+    """Finds the difficult words of the observation (each word is classified once per corpus, see `func_words`).
+
+    Args:
+        observation (string or Document): Observation text
+
+    Returns:
+        difficult_words (tuple): Difficult words with 4 or more syllables as (word, syllables), sorted
+    """
+    document = as_document(observation)
+    profile = func_language.get_profile(document.language)
+
+    # textstat language of the syllable rule "textstat"
+    with textstat_language(profile.textstat_lang):
+        return get_lexicons(profile.name).classifier().difficult_words(document.vocabulary)
+
+
+def complex_words(observation):
+    """Finds the complex words of the Gunning FOG score (as `textstat.difficult_words_list`): unique words with
+    the syllables of `fog_syllable_threshold` or more which are not on the textstat list of easy words.
+
+    Args:
+        observation (string or Document): Observation text
+
+    Returns:
+        complex_words (frozenset): Complex words
+    """
+    document = as_document(observation)
+    textstat_lang = func_language.get_profile(document.language).textstat_lang
+    threshold = fog_syllable_threshold(textstat_lang)
+    syllables = document.syllables
+
+    with textstat_language(textstat_lang) as textstat:
+        return frozenset(word for word in document.vocabulary
+                         if syllables[word] >= threshold and textstat.is_difficult_word(word, threshold))
+
+
+def text_counts(observation):
+    """Calculates the textstat counts and the difficult words of the observation.
+
+    Args:
+        observation (string or Document): Observation text
+
+    Returns:
+        lexiconcount (int): Number of words
+        sentencecount (int): Number of sentences
+        syllablecount (int): Number of syllables
+        difficult_words (tuple): Difficult words with 4 or more syllables as (word, syllables), sorted
+    """
+    document = as_document(observation)
+
+    return (*textstat_counts(document), difficult_words(document))
+
+
+def format_difficult_words(difficult_words):
+    """Formats the difficult words for the report, e.g. " management [4],".
+
+    Args:
+        difficult_words (tuple): Difficult words as (word, syllables)
+
+    Returns:
+        diffcultwords_list_string (string): Difficult words and their syllables
+    """
+
+    return "".join(f' {aword} [{str(count_syll)}],\n\n\n' for aword, count_syll in difficult_words)
+
+
+def text_statistics(i, observation):
+    """Function to calculate the text statistics.
+
+    Args:
+        i (int): Iterator
+        observation (string or Document): Observation text
+    """
+    lexiconcount, sentencecount, syllablecount, difficult_words = text_counts(observation)
 
     # Ratio words to sentences
     word_sentence_ratio = int(lexiconcount/sentencecount)
 
-    # Difficult words
-    diffcultwords_list = textstat.difficult_words_list(observation)
-    diffcultwords_list.sort()
-    # diffcultwords_num = textstat.difficult_words(observation)
-    diffcultwords_num = 0
-
-    diffcultwords_list_string = ""
-    for aword in diffcultwords_list:
-        count_syll = count_syllables(aword)
-        if count_syll >= 4 and aword not in list_difficult_words:
-            diffcultwords_list_string = f'{diffcultwords_list_string} {aword} [{str(count_syll)}],\n\n\n'
-            diffcultwords_num += 1
+    diffcultwords_list_string = format_difficult_words(difficult_words)
+    diffcultwords_num = len(difficult_words)
 
     observation_no = i+1  # add +1 to the observation lenght count to make it "human" readable
 
@@ -148,42 +514,51 @@ def observation_selection_list():
     return(observation_selected)
 """
 
+def gunning_fog_value(observation):
+    """Calculates the Gunning FOG score (not rounded).
+
+    Args:
+        observation (string or Document): Observation text
+
+    Returns:
+        gfs (float): Gunning FOG score
+    """
+
+    document = as_document(observation)
+    words = len(document.words)
+    if not words:
+        return 0.0
+
+    # Sentences of the text as is (a line break does not end a sentence), words and complex words of the Document
+    with textstat_language(func_language.get_profile(document.language).textstat_lang) as textstat:
+        sentences = textstat.sentence_count(document.text)
+
+    # 0.4 * (average sentence length + percentage of complex words), rounded as textstat.gunning_fog
+    average_sentence_length = round_half_up(words / sentences, 1)
+    return round_half_up(0.4 * (average_sentence_length + len(complex_words(document)) / words * 100), 2)
+
+
+def rank_gunning_fog(gfs):
+    """Ranks the Gunning FOG score.
+
+    Args:
+        gfs (float): Gunning FOG score
+
+    Returns:
+        gfsrank (string): Reading level
+    """
+
+    # Rank Gunning FOG score (see `gunning_fog_rank_bounds`, many scores at once: `func_scoring`)
+    gfsrank = gunning_fog_ranks[bisect.bisect_right(gunning_fog_rank_bounds, gfs)]
+
+    return gfsrank
+
+
 def readability_gfogs(i, observation):
     """Function to calculate the Gunning FOG score and rank."""
     # Gunning FOG score
-    gfs = ""
-    gfsrank = ""
-    gfs = textstat.gunning_fog(observation)
-
-    # Rank Gunning FOG score
-    if gfs < 6:
-        gfsrank = "Below sixth grade."
-    elif gfs >= 6 and gfs < 7:
-        gfsrank = "6th grade level."
-    elif gfs >= 7 and gfs < 8:
-        gfsrank = "7th grade level."
-    elif gfs >= 8 and gfs < 9:
-        gfsrank = "8th grade level."
-    elif gfs >= 9 and gfs < 10:
-        gfsrank = "High school freshman level."
-    elif gfs >= 10 and gfs < 11:
-        gfsrank = "High school sophomore level."
-    elif gfs >= 11 and gfs < 12:
-        gfsrank = "High school junior level."
-    elif gfs >= 12 and gfs < 13:
-        gfsrank = "High school senior level."
-    elif gfs >= 13 and gfs < 14:
-        gfsrank = "College freshman level."
-    elif gfs >= 14 and gfs < 15:
-        gfsrank = "College sophomore level."
-    elif gfs >= 15 and gfs < 16:
-        gfsrank = "College junior level."
-    elif gfs >= 16 and gfs < 17:
-        gfsrank = "College senior level."
-    elif gfs >= 17 and gfs < 18:
-        gfsrank = "College graduate level."
-    elif gfs >= 18:
-        gfsrank = "Beyond college graduate level."
+    gfs = gunning_fog_value(observation)
+    gfsrank = rank_gunning_fog(gfs)
 
     #observation_stats_list[i]['gunning_fog_score'] = int(gfs)
     #observation_stats_list[i]['gunning_fog_rank'] = gfsrank
@@ -193,59 +568,20 @@ def readability_gfogs(i, observation):
     return int(gfs), gfsrank, gunning_fog_score_rank
 
 
-def text_cleanup(observation):
-    """Function to do some simple text clean-up. TODO: replace with a regex pattern.
-    """
-    observation = observation.replace("approx.", "approx")
-    observation = observation.replace("1.", "1")
-    observation = observation.replace("2.", "2")
-    observation = observation.replace("3.", "3")
-    observation = observation.replace("4.", "4")
-    observation = observation.replace("5.", "5")
-    observation = observation.replace("e.g.", "eg")
-    observation = observation.replace("i.e.", "ie")
-    observation = observation.replace("min.", "min")
-    observation = observation.replace("max.", "max")
-    observation = observation.replace("dept.", "dept")
-    observation = observation.replace("misc.", "misc")
-    observation = observation.replace("p.a.", "pa")
-    observation = observation.replace("p.m.", "pm")
-    observation = observation.replace("avg.", "avg")
-    observation = observation.replace("fig.", "fig")
-    observation = observation.replace("vs.", "vs")
-    observation = observation.replace("etc.", "etc")
-    observation = observation.replace(".", "")
-    observation = observation.replace("•", "-")
-    observation = observation.replace("       ", " ")
-    print("clean obs:",observation)  # testing
-
-    return observation
-
-
-def eflaw(i, observation):
-    """Function to calculate the McAlpine EFLAW score and rank.
+def eflaw_counts(observation):
+    """Calculates the McAlpine EFLAW score and the sentence lengths.
 
     Args:
-        i (int): Iterator
-        observation (string): Observation text
-    
+        observation (string or Document): Observation text
+
     Returns:
-        eflaw_score (int): eflaw score
-        eflaw_rank (string): eflaw rank
-        eflaw_score_rank (string): eflaw score and rank
-        count_sentences (int): Number of sentences in this text.
-        sentence_length_dict (dict): Sentence position + sentence length
-        count_miniwords (int): Number of identified mini words 
+        eflaw_score (float): eflaw score (not rounded), None if no sentence has more than 4 words
+        count_sentences (int): Number of sentences (with more than 4 words)
+        count_miniwords (int): Number of identified mini words
+        sentence_lengths (tuple): Number of words per sentence
+        sentence_texts (tuple): Text per sentence
     """
-    observation = text_cleanup(observation)
-    observation = observation.replace(". ", "\n")
-    # using "\n " for splitting to avoid to break e.g. or 1. into sentences
-    sentences_list = observation.split("\n")
-
-    while '' in sentences_list:
-        sentences_list.remove('')
-    while ' ' in sentences_list:
-        sentences_list.remove(' ')
+    document = as_document(observation)
 
     # Let W, M and S be the number of words, miniwords and sentences in a text.
     # Then EFLAW Score = (W+M)/S.
@@ -254,45 +590,83 @@ def eflaw(i, observation):
     # 1-20 (very easy to understand);
     # 21-25 (quite easy to understand);
     # 26-29 (a little difficult); and 30+ (very confusing).
-    eflaw_rank = ""
-    eflaw_score = ""
-    word_list = []
     count_words = 0
     count_miniwords = 0
-    count_sentences = 0
+    sentence_lengths = []
+    sentence_texts = []
+
+    # words and mini words are counted once by the segmenter (see func_document.SentenceSegmenter)
+    for sentence in document.sentences:
+        if sentence.word_count > 4:  # to avoid to count headlines as sentences; only count sentences with words > 4
+            sentence_lengths.append(sentence.word_count)
+            sentence_texts.append(document.sentence_text(sentence))
+        count_words += sentence.word_count
+        count_miniwords += sentence.miniword_count
+    count_sentences = len(sentence_lengths)
+    eflaw_score = (count_words+count_miniwords)/count_sentences if count_sentences else None
+
+    return eflaw_score, count_sentences, count_miniwords, tuple(sentence_lengths), tuple(sentence_texts)
+
+
+def rank_eflaw(eflaw_score):
+    """Ranks the McAlpine EFLAW score.
+
+    Args:
+        eflaw_score (float): eflaw score, None if no sentence has more than 4 words
+
+    Returns:
+        eflaw_rank (string): eflaw rank, `eflaw_rank_missing` without a score
+    """
+
+    if eflaw_score is None:
+        return eflaw_rank_missing
+
+    # Rank EFLAW score (see `eflaw_rank_bounds`, many scores at once: `func_scoring`)
+    eflaw_rank = eflaw_ranks[bisect.bisect_left(eflaw_rank_bounds, eflaw_score)]
+
+    return eflaw_rank
+
+
+def build_sentence_length_dict(sentence_lengths, sentence_texts):
+    """Builds the sentence length dictionary: sentence no, length and actual sentence under "SentNo. x".
+
+    Args:
+        sentence_lengths (tuple): Number of words per sentence
+        sentence_texts (tuple): Text per sentence
+
+    Returns:
+        sentence_length_dict (dict): Sentence position + sentence length
+    """
+
     sentence_length_dict = {}
+    for count_sentences, (words, text) in enumerate(zip(sentence_lengths, sentence_texts), start=1):
+        sentence_length_dict['SentNo.'+str(count_sentences)] = {
+            'Sentence No': int(count_sentences), 'Words': words, 'Sentence': text}
+
+    return sentence_length_dict
 
-    for sentence in range(len(sentences_list)):
-        word_list = sentences_list[sentence].split()
-        if len(word_list) > 4:  # to avoid to count headlines as sentences; only count sentences with words > 4
-            count_sentences += 1
-            # Set dictionary to store sentence no, lenght and actual sentence under "SentNo. x"
-            sentence_length_dict['SentNo.'+str(count_sentences)] = {}
-            sentence_length_dict['SentNo.' +
-                                 str(count_sentences)]['Sentence No'] = int(count_sentences)
-            # add sentence no and word count to dict
-            sentence_length_dict['SentNo.' +
-                                 str(count_sentences)]['Words'] = len(word_list)
-            sentence_length_dict['SentNo.' +
-                                 str(count_sentences)]['Sentence'] = sentences_list[sentence]
-        count_words += len(word_list)
-
-        for word in word_list:
-            if len(word) <= 3:
-                #print(word)  # testing
-                count_miniwords += 1
-    eflaw_score = (count_words+count_miniwords)/count_sentences
-
-    # Rank EFLAW score
-    if eflaw_score <= 20:
-        eflaw_rank = "Very easy to understand."
-    elif eflaw_score > 20 and eflaw_score <= 25:
-        eflaw_rank = "Easy to understand."
-    elif eflaw_score > 25 and eflaw_score <= 29:
-        eflaw_rank = "Difficult to understand."
-    elif eflaw_score > 29:
-        eflaw_rank = "Very confusing."
 
+def eflaw(i, observation):
+    """Function to calculate the McAlpine EFLAW score and rank.
+
+    Args:
+        i (int): Iterator
+        observation (string or Document): Observation text
+    
+    Returns:
+        eflaw_score (int): eflaw score, None if no sentence has more than 4 words
+        eflaw_rank (string): eflaw rank
+        eflaw_score_rank (string): eflaw score and rank
+        count_sentences (int): Number of sentences in this text.
+        sentence_length_dict (dict): Sentence position + sentence length
+        count_miniwords (int): Number of identified mini words 
+    """
+    eflaw_score, count_sentences, count_miniwords, sentence_lengths, sentence_texts = eflaw_counts(observation)
+    eflaw_rank = rank_eflaw(eflaw_score)
+    sentence_length_dict = build_sentence_length_dict(sentence_lengths, sentence_texts)
+
+    if eflaw_score is None:
+        return None, eflaw_rank, eflaw_rank_missing, int(count_sentences), sentence_length_dict, int(count_miniwords)
     eflaw_score_rank = f"{int(eflaw_score)}: {eflaw_rank}"
 
     return int(eflaw_score), eflaw_rank, eflaw_score_rank, int(count_sentences), sentence_length_dict, int(count_miniwords)
@@ -300,44 +674,65 @@ def eflaw(i, observation):
 
 def long_sentences(i, observation):
     """Function to find long sentences according to the threshold."""
-    sentences_list = []
-    observation = text_cleanup(observation)
-    observation = observation.replace(". ", "\n")
-    sentences_list = observation.split("\n")
-
-    # Removing empty list entries such as "" and " "
-    sentences_list = [sentence for sentence in sentences_list if len(sentence) > 1]
-    #ic(sentences_list)
-    
-    word_list = []
+    document = as_document(observation)
+    sentence_length_max = func_language.get_profile(document.language).sentence_length_max
+
     count_long_sentences = 0
 
-    for sentence in range(len(sentences_list)):
-        word_list = sentences_list[sentence].split()
-        ic(len(word_list))
-        if len(word_list) > recommended_sentence_lengh_max:
+    for sentence in document.sentences:
+        if sentence.word_count > sentence_length_max:
             count_long_sentences += 1
 
     return count_long_sentences
 
 
+def find_lexicon_phrases(observation, name):
+    """Finds the phrases of a word list (on word boundaries, see `func_matcher.PhraseMatcher`).
+
+    Args:
+        observation (string or Document): Observation text
+        name (string): 'jargon' or 'simplewords'
+
+    Returns:
+        hits (tuple): Found phrases and their alternatives as (phrase, alternative), in list order
+    """
+    document = as_document(observation)
+    lexicons = get_lexicons(document.language)
+    lexicon = lexicons.get(name)
+
+    # text cleansing for the checkers (done once by the Document)
+    observation_cleaned = document.checker_text
+
+    return tuple((phrase, lexicon[phrase]) for phrase in lexicons.matcher(name).count(observation_cleaned))
+
+
+def format_checklist(hits, empty_text):
+    """Formats the found phrases for the report, e.g. "utilize >> use".
+
+    Args:
+        hits (tuple): Found phrases and their alternatives as (phrase, alternative)
+        empty_text (string): Text if nothing was found
+
+    Returns:
+        checklist (string): Phrases and their alternatives
+    """
+
+    checklist = "".join(f"{phrase} >> {alternative}\n\n" for phrase, alternative in hits)
+
+    return checklist or empty_text
+
+
+## Text of the checklists if nothing was found
+jargon_checklist_empty = "No jargon found."
+simplewords_checklist_empty = "No words be simplified."
+
+
 def jargon_checker(i, observation):
-    """Function to find jargon phrases."""
-    dict_jargon, _, _ = load_external_lists()
-
-    # text cleansing for jargon checker
-    observation_cleaned = observation.replace("\n", " ").lower()
-    observation_cleaned = observation_cleaned.replace(",", "")
-    observation_cleaned = observation_cleaned.replace("  ", " ")
-
-    jargon_checklist = ""
-    jargon_checklist_dict = dict()
-    for jargon in dict_jargon.keys():
-        if jargon in observation_cleaned:
-            jargon_checklist += (f"{jargon} >> {dict_jargon[jargon]}\n\n")
-            jargon_checklist_dict[jargon] = dict_jargon[jargon]
-    if jargon_checklist == "":
-        jargon_checklist = "No jargon found."
+    """Function to find jargon phrases (on word boundaries, see `func_matcher.PhraseMatcher`)."""
+    jargon_hits = find_lexicon_phrases(observation, 'jargon')
+
+    jargon_checklist = format_checklist(jargon_hits, jargon_checklist_empty)
+    jargon_checklist_dict = dict(jargon_hits)
     #observation_stats_list[i]['jargon_checklist'] = jargon_checklist
     #bservation_stats_list[i]['jargon_checklist_dict'] = jargon_checklist_dict
 
@@ -345,24 +740,11 @@ def jargon_checker(i, observation):
 
 
 def simplewords_checker(i, observation):
-    """Function to find word which could be replaced with simpler versions."""
-    _, dict_simplewords, _ = load_external_lists()
-
-    # text cleansing for jargon checker
-    observation_cleaned = observation.replace("\n", " ").lower()
-    observation_cleaned = observation_cleaned.replace(",", "")
-    observation_cleaned = observation_cleaned.replace("  ", " ")
-
-    simplewords_checklist = ""
-    simplewords_checklist_dict = dict()
-    for simpleword in dict_simplewords.keys():
-        if simpleword in observation_cleaned:
-            simplewords_checklist += (
-                f"{simpleword} >> {dict_simplewords[simpleword]}\n\n")
-            simplewords_checklist_dict[simpleword] = dict_simplewords[simpleword]
-
-    if simplewords_checklist == "":
-        simplewords_checklist = "No words be simplified."
+    """Function to find word which could be replaced with simpler versions (on word boundaries)."""
+    simplewords_hits = find_lexicon_phrases(observation, 'simplewords')
+
+    simplewords_checklist = format_checklist(simplewords_hits, simplewords_checklist_empty)
+    simplewords_checklist_dict = dict(simplewords_hits)
     #observation_stats_list[i]['simplewords_checklist'] = simplewords_checklist
     #observation_stats_list[i]['simplewords_checklist_dict'] = simplewords_checklist_dict
     return simplewords_checklist, simplewords_checklist_dict
@@ -371,12 +753,14 @@ def simplewords_checker(i, observation):
 def improvement_suggestions(i, observation_stats_list):
     """Function to define/formualte the improvement suggestions based on the thresholds."""
     improvement_suggestions = ""
-    if observation_stats_list[i]['eflaw_score'] > recommended_score_eflaw:
-        if observation_stats_list[i]['jargon_checklist'] != "No jargon found.":
+    profile = result_profile(observation_stats_list[i])
+    eflaw_score = observation_stats_list[i]['eflaw_score']
+    if eflaw_score is not None and eflaw_score > profile.score_eflaw:
+        if observation_stats_list[i]['jargon_checklist'] != jargon_checklist_empty:
             improvement_suggestions += "Review and replace the jargons, where possible (see table below).\n\n"
         # if observation_stats_list[i]['word_sentence_ratio'] > recommended_sentence_lengh_max :
         improvement_suggestions += f"Reduce the size of the {observation_stats_list[i]['long_sentences']} lengthy sentences.\n\n"
-        improvement_suggestions += f"Reduce the use of the {observation_stats_list[i]['eflaw_miniwords_count']} mini words (words with less <= 3 characters).\n\n"
+        improvement_suggestions += f"Reduce the use of the {observation_stats_list[i]['eflaw_miniwords_count']} mini words (words with less <= {profile.miniword_max_length} characters).\n\n"
         improvement_suggestions += "\n\n"
     else:
         improvement_suggestions = "None. All good here."
@@ -385,89 +769,313 @@ def improvement_suggestions(i, observation_stats_list):
     return improvement_suggestions
 
 
-def sentiment_analysis(i, observation):
-    """Function to calculate the sentiment."""
-    # Textblob Sentiment Analysis
-    # TextBlob Scoring:
-    # The polarity score is a float within the range [-1.0, 1.0].
-    # The subjectivity is a float within the range [0.0, 1.0] where 0.0 is very objective and 1.0 is very subjective.
-    # polarity is >0, it is considered positive,
-    # <0 -is considered negative and
-    # ==0 is considered neutral.
-    result_sentiment = ''
-    blob = TextBlob(observation)
-    result_sentiment = blob.sentiment
+def sentiment_scores(observation):
+    """Calculates the polarity and subjectivity with the selected sentiment backend (see `func_sentiment`).
+
+    Args:
+        observation (string or Document): Observation text
+
+    Returns:
+        polarity (float): -1.0 (negative) to 1.0 (positive), None if the sentiment is not analyzed
+        subjectivity (float): 0.0 (very objective) to 1.0 (very subjective), None if the sentiment is not analyzed
+    """
+
+    return func_sentiment.get_backend().score(as_document(observation).text)
+
 
+def rank_sentiment(polarity, subjectivity):
+    """Ranks the polarity and subjectivity.
+
+    Args:
+        polarity (float): -1.0 (negative) to 1.0 (positive)
+        subjectivity (float): 0.0 (very objective) to 1.0 (very subjective)
+
+    Returns:
+        bob_result_polarity (string): Polarity rank
+        bob_result_subjectivity (string): Subjectivity rank
+    """
     bob_result_polarity = ""
     bob_result_subjectivity = ""
 
-    if result_sentiment[0] <= -0.5:
+    ## sentiment backend "off"
+    if polarity is None or subjectivity is None:
+        return sentiment_not_analyzed, sentiment_not_analyzed
+
+    if polarity <= -0.5:
         bob_result_polarity = "very negative"
-    elif result_sentiment[0] >= -0.5 and result_sentiment[0] < -0.25:
+    elif polarity >= -0.5 and polarity < -0.25:
         bob_result_polarity = "negative"
-    elif result_sentiment[0] >= -0.25 and result_sentiment[0] < 0.25:
+    elif polarity >= -0.25 and polarity < 0.25:
         bob_result_polarity = "neutral"
-    elif result_sentiment[0] >= 0.25 and result_sentiment[0] < 0.5:
+    elif polarity >= 0.25 and polarity < 0.5:
         bob_result_polarity = "postive"
-    elif result_sentiment[0] >= 0.75:
+    elif polarity >= 0.5:
         bob_result_polarity = "very postive"
 
-    if result_sentiment[1] >= 0 and result_sentiment[1] < 0.25:
+    if subjectivity >= 0 and subjectivity < 0.25:
         bob_result_subjectivity = "very objective"
-    elif result_sentiment[1] >= 0.25 and result_sentiment[1] < 0.5:
+    elif subjectivity >= 0.25 and subjectivity < 0.5:
         bob_result_subjectivity = "objective"
-    elif result_sentiment[1] >= 0.5 and result_sentiment[1] < 0.75:
+    elif subjectivity >= 0.5 and subjectivity < 0.75:
         bob_result_subjectivity = "subjective"
-    elif result_sentiment[1] >= 0.75:
+    elif subjectivity >= 0.75:
         bob_result_subjectivity = "very subjective"
 
+    return bob_result_polarity, bob_result_subjectivity
+
+
+def sentiment_analysis(i, observation):
+    """Function to calculate the sentiment."""
+    # Textblob Sentiment Analysis
+    # TextBlob Scoring:
+    # The polarity score is a float within the range [-1.0, 1.0].
+    # The subjectivity is a float within the range [0.0, 1.0] where 0.0 is very objective and 1.0 is very subjective.
+    # polarity is >0, it is considered positive,
+    # <0 -is considered negative and
+    # ==0 is considered neutral.
+    polarity, subjectivity = sentiment_scores(observation)
+    bob_result_polarity, bob_result_subjectivity = rank_sentiment(polarity, subjectivity)
+
     #observation_stats_list[i]['bob_result_polarity'] = bob_result_polarity
     #observation_stats_list[i]['bob_result_subjectivity'] = bob_result_subjectivity
     return bob_result_polarity, bob_result_subjectivity
 
 
+def analyze_observation(i, observation, timings=None, sentiment=None, language=None, metrics=None):
+    """Runs the readability checks for one observation. The result stores the raw numbers and
+    match lists once, the report texts are formatted on access (see `func_result.ObservationResult`).
+
+    Args:
+        i (int): Iterator (the observation no. is i+1)
+        observation (string or Document): Observation text
+        timings (Timings): Optional collector of the stage timings (see `func_timing`)
+        sentiment (tuple): Optional (polarity, subjectivity) scored before, e.g. for a whole batch
+            (see `func_batch.analyze_chunk`)
+        language (string): Language (see `func_language`), "auto" to detect it, default: language of the
+            document or configured default
+        metrics (list): Result keys to be calculated (see `func_metrics`), e.g. `func_metrics.TRIAGE`,
+            default: all. Only the metrics needed for these keys run, the other results are None.
+
+    Returns:
+        observation_stats (ObservationResult): All results, statistics and details of the observation.
+            Supports the dictionary keys listed in `app2`, e.g. observation_stats['eflaw_score'].
+    """
+    timings = timings or func_timing.null_timings
+
+    ## (cached) word lists of the language, parsed again only if a file changed
+    with timings.span('word_lists'):
+        if language is None and not isinstance(observation, str):
+            language = observation.language
+        profile = func_language.resolve_language(language, observation if isinstance(observation, str) else observation.text)
+        load_external_lists(profile.name)
+
+    with timings.span('parse'):
+        document = as_document(observation, profile.name)
+
+    ## sentiment scored before (e.g. for a whole batch), not analyzed for the languages without sentiment
+    known = {}
+    if sentiment is not None and profile.sentiment:
+        known['polarity'], known['subjectivity'] = sentiment
+
+    ## requested metrics and their inputs, each once and in dependency order (see func_metrics)
+    values = func_metrics.evaluate(document, profile, func_metrics.plan(metrics), known, timings)
+
+    return func_result.ObservationResult(observation_no=i+1, language=profile.name, **values)
+
+
+def scoring_version(language=None, metrics=None):
+    """Identifies everything besides the text which changes the results: the scoring rules,
+    the thresholds, the language profiles and their loaded word lists, the sentiment backend and the
+    calculated metrics. Used as part of the result cache key (see `func_cache`).
+
+    Args:
+        language (string): Language (see `func_language`), "auto" (all profiles) or None (configured default)
+        metrics (list): Result keys to be calculated (see `analyze_observation`), default: all
+
+    Returns:
+        version (string): Version string
+    """
+
+    detected = func_language.is_detected(language)
+    profiles = list(func_language.profiles()[0].values()) if detected else [func_language.get_profile(language)]
+    languages = []
+    for profile in profiles:
+        lexicons = get_lexicons(profile.name)
+        for name in lexicons.paths:
+            lexicons.get(name)
+        settings = (profile.name, profile.textstat_lang, profile.syllables, profile.miniword_max_length,
+                    profile.sentence_length_max, profile.score_eflaw, profile.sentiment)
+        if detected:
+            settings += tuple(sorted(profile.stopwords))
+        languages.append(f"{settings}:{lexicons.version}")
+    thresholds = (recommended_sentence_lengh_max, recommended_score_fres, recommended_score_eflaw,
+                  recommended_score_gfs, recommended_score_cons)
+
+    version = f"{scoring_rules_version}|{thresholds}|{'|'.join(languages)}|{func_sentiment.get_backend().name}"
+    if metrics is not None:
+        version += f"|{','.join(func_metrics.plan(metrics))}"
+
+    return version
+
+
 def export_csv(df_obs):
-    """Export CSV file to specified folder.
+    """Export CSV file to the export folder (config section [EXPORT], see `func_export`).
 
         Args:
             df_obs (dataframe): Dataframe with observation details
         
         Returns:
-            None
+            export_path (string): Path of the CSV file
     """
+    import func_export  # streaming export, imported on first use
 
     # Define export path and file name
     export_file_name = "observation-full-table.csv"
-    export_path = r'c:/pyBOTS/rcBOT/reports/'
-    export01 = export_path+export_file_name
+    export_path = func_export.load_export_config(func_export.CONFIG_FILE)['directory']
+
+    # Write the export columns in batches
+    export01, _ = func_export.export_frame(df_obs[export_columns], os.path.join(export_path, export_file_name))
+
+    return export01
+
+
+def sentence_pages(sentence_count, page_size=None):
+    """Returns the number of drill-down pages of a document (at least 1).
+
+    Args:
+        sentence_count (int): Number of sentences
+        page_size (int): Sentences per page, default: `chart_page_size`
+
+    Returns:
+        pages (int): Number of pages
+    """
+    page_size = page_size or chart_page_size
+    return max(1, -(-sentence_count // page_size))
+
+
+def sentence_bar_data(sentence_lengths, sentence_texts, first=0, last=None):
+    """Chart data of single sentences (one bar per sentence), built directly from the arrays.
+
+    Args:
+        sentence_lengths (tuple): Number of words per sentence
+        sentence_texts (tuple): Text per sentence
+        first (int): Index of the first sentence
+        last (int): Index after the last sentence, default: all sentences
 
-    # Create export df and write csv file
-    #df_export= df_obs.drop(['sentence_length_dict','observation_summary_result','diffcult_words_list','jargon_checklist_dict','simplewords_checklist_dict','eflaw_score','eflaw_rank','sentences'], axis=1)
-    df_export = df_obs[['Observation No.', 'eflaw_score_rank', 'gunning_fog_score_rank', 'improvement_suggestions',
-                        'eflaw_sentencecount', 'eflaw_miniwords_count', 'words', 'long_sentences', 'jargon_checklist', 'simplewords_checklist', 'bob_result_polarity', 'bob_result_subjectivity']]
-    df_export.to_csv(export01, index=None, header=True)
+    Returns:
+        chart_data (DataFrame): Sentence No, Words, Sentence
+    """
+    import pandas as pd  # imported on first use (charts only)
+
+    last = len(sentence_lengths) if last is None else min(last, len(sentence_lengths))
+    return pd.DataFrame({
+        'Sentence No': range(first + 1, last + 1),
+        'Words': sentence_lengths[first:last],
+        'Sentence': sentence_texts[first:last],
+    })
 
 
-def render_bar_chart(i, observation_stats_list):
-    """Creates a bar chart to display the length of each sentence.
+def sentence_window_data(sentence_lengths, max_bars=None, sentence_length_max=None):
+    """Chart data of consecutive sentence windows (at most `max_bars` windows): maximum and mean length
+    and number of long sentences per window. The sentence texts are not part of the data.
+
+    Args:
+        sentence_lengths (tuple): Number of words per sentence
+        max_bars (int): Maximum number of windows, default: `chart_max_bars`
+        sentence_length_max (int): Words of a long sentence, default: `recommended_sentence_lengh_max`
+
+    Returns:
+        chart_data (DataFrame): Sentences (e.g. "1-10"), Max words, Mean words, Long sentences
+    """
+    import numpy as np  # imported on first use (charts only)
+    import pandas as pd
+
+    lengths = np.asarray(sentence_lengths, dtype=np.int64)
+    window = max(1, -(-len(lengths) // (max_bars or chart_max_bars)))
+    starts = np.arange(0, len(lengths), window)
+    ends = np.minimum(starts + window, len(lengths))
+    if not len(lengths):
+        return pd.DataFrame({'Sentences': [], 'Max words': [], 'Mean words': [], 'Long sentences': []})
+
+    return pd.DataFrame({
+        'Sentences': [f"{start + 1}-{end}" for start, end in zip(starts.tolist(), ends.tolist())],
+        'Max words': np.maximum.reduceat(lengths, starts),
+        'Mean words': np.round(np.add.reduceat(lengths, starts) / (ends - starts), 1),
+        'Long sentences': np.add.reduceat(lengths > (sentence_length_max or recommended_sentence_lengh_max), starts),
+    })
+
+
+def sentence_histogram_data(sentence_lengths, bin_words=None):
+    """Chart data of the sentence length distribution (number of sentences per length bin).
+
+    Args:
+        sentence_lengths (tuple): Number of words per sentence
+        bin_words (int): Words per bin, default: `chart_histogram_bin_words`
+
+    Returns:
+        chart_data (DataFrame): Words (e.g. "20-24"), From (first length of the bin), Sentences
+    """
+    import numpy as np  # imported on first use (charts only)
+    import pandas as pd
+
+    bin_words = bin_words or chart_histogram_bin_words
+    counts = np.bincount(np.asarray(sentence_lengths, dtype=np.int64) // bin_words)
+    starts = np.arange(len(counts)) * bin_words
+
+    return pd.DataFrame({
+        'Words': [f"{start}-{start + bin_words - 1}" for start in starts.tolist()],
+        'From': starts,
+        'Sentences': counts,
+    })
+
+
+def render_bar_chart(i, observation_stats_list, mode="auto", page=None):
+    """Creates a bar chart to display the length of each sentence. Long documents (more than
+    `chart_max_bars` sentences) are shown as sentence windows, single sentences page by page.
 
     Args:
         i (int): Iterator
-        observation_stats_list (list): List of dictionaries
+        observation_stats_list (list): List of results (ObservationResult)
+        mode (string): "auto" (bars or windows), "bars", "windows" or "histogram"
+        page (int): Drill-down page (1-based, `chart_page_size` sentences as bars), overrides the mode
 
     Returns:
         bar_chart (LayerChart): Altair layered bar chart
     """
 
-    barchartdata = pd.DataFrame(observation_stats_list[i]['sentence_length_dict'])
-    barchartdata = barchartdata.transpose()
-    hline = alt.Chart(pd.DataFrame({'Limit': [recommended_sentence_lengh_max]})).mark_rule(color="red").encode(y='Limit')
-    barchartwordcount = alt.Chart(barchartdata).mark_bar().encode(
-        x=alt.X('Sentence No:O', sort=None), y='Words:Q', tooltip=['Sentence No', 'Words', 'Sentence']).properties(
-        width=670,
-        height=300
-    )
-    
-    bar_chart = barchartwordcount + hline
+    import pandas as pd  # imported on first use (charts only)
+    import altair as alt
+
+    sentence_lengths = observation_stats_list[i].sentence_lengths
+    if mode == "auto":
+        mode = "bars" if len(sentence_lengths) <= chart_max_bars else "windows"
+    sentence_length_max = result_profile(observation_stats_list[i]).sentence_length_max
+    limit = pd.DataFrame({'Limit': [sentence_length_max]})
+
+    if page is not None:
+        first = (min(max(1, int(page)), sentence_pages(len(sentence_lengths))) - 1) * chart_page_size
+        barchartdata = sentence_bar_data(sentence_lengths, observation_stats_list[i].sentence_texts, first, first + chart_page_size)
+        mode = "bars"
+    elif mode == "bars":
+        barchartdata = sentence_bar_data(sentence_lengths, observation_stats_list[i].sentence_texts)
+
+    if mode == "bars":
+        hline = alt.Chart(limit).mark_rule(color="red").encode(y='Limit')
+        barchartwordcount = alt.Chart(barchartdata).mark_bar().encode(
+            x=alt.X('Sentence No:O', sort=None), y='Words:Q', tooltip=['Sentence No', 'Words', 'Sentence'])
+    elif mode == "windows":
+        hline = alt.Chart(limit).mark_rule(color="red").encode(y='Limit')
+        barchartwordcount = alt.Chart(sentence_window_data(sentence_lengths, sentence_length_max=sentence_length_max)).mark_bar().encode(
+            x=alt.X('Sentences:O', sort=None, axis=alt.Axis(labels=False)), y='Max words:Q',
+            tooltip=['Sentences', 'Max words', 'Mean words', 'Long sentences'])
+    elif mode == "histogram":
+        hline = alt.Chart(limit).mark_rule(color="red").encode(x='Limit:Q')
+        barchartwordcount = alt.Chart(sentence_histogram_data(sentence_lengths)).mark_bar().encode(
+            x=alt.X('From:Q', bin='binned', title='Words'), x2='To:Q', y='Sentences:Q',
+            tooltip=['Words', 'Sentences']).transform_calculate(To=f"datum.From + {chart_histogram_bin_words}")
+    else:
+        raise ValueError(f"Unknown chart mode: {mode}")
+
+    bar_chart = barchartwordcount.properties(width=670, height=300) + hline
 
     return bar_chart
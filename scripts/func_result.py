@@ -0,0 +1,274 @@
+"""
+## Purpose
+Containing the compact **result record** of an analyzed observation. The raw numbers and match lists
+are stored once, the report texts (ranks, checklists, "score: rank", improvement suggestions) are
+formatted on access only.
+
+## Key Elements/Variables
+### ObservationResult (class)
+Supports the dictionary keys listed in `app2`, e.g. `observation_stats['eflaw_score_rank']`,
+hence the Quick Check rendering and `improvement_suggestions` work unchanged.
+
+### derived (decorator)
+Report property calculated from raw fields. The raw fields are listed for the metric registry
+(see `func_metrics`), the property is None if one of them was not calculated (partial result).
+
+### ATTRIBUTE_TYPES / column_type
+Type of every result key and raw attribute (int, float, str or the nested tuple and dict).
+
+### results_to_columns / results_to_frame / results_to_arrow
+Collect many results column by column (batch mode) without building a dictionary per row.
+---
+# Functions
+"""
+
+## Packages
+from dataclasses import dataclass, fields, replace  # for the compact result record
+import func_readability as rc  # to rank and format the results
+
+
+def derived(*raw_fields, guard=True):
+    """Property calculated from raw fields (see module description).
+
+    Args:
+        raw_fields (string): Raw attributes used by the property
+        guard (bool): None if one of the raw fields is None, False if the property handles None itself
+    """
+
+    def decorator(method):
+        def getter(self):
+            if guard:
+                for name in raw_fields:
+                    if getattr(self, name) is None:
+                        return None
+            return method(self)
+        getter.__doc__ = method.__doc__
+        getter.raw_fields = raw_fields
+        return property(getter)
+
+    return decorator
+
+
+@dataclass
+class ObservationResult:
+    """Results of one observation (see `func_readability.analyze_observation`)."""
+
+    __slots__ = ("observation_no", "eflaw_value", "eflaw_sentencecount", "eflaw_miniwords_count",
+                 "sentence_lengths", "sentence_texts", "gunning_fog_value", "words", "sentences",
+                 "syllables", "difficult_words", "long_sentences", "jargon_hits", "simplewords_hits",
+                 "polarity", "subjectivity", "language")
+
+    observation_no: int
+    eflaw_value: float  # not rounded
+    eflaw_sentencecount: int
+    eflaw_miniwords_count: int
+    sentence_lengths: tuple  # words per sentence
+    sentence_texts: tuple  # text per sentence
+    gunning_fog_value: float  # not rounded
+    words: int
+    sentences: int
+    syllables: int
+    difficult_words: tuple  # (word, syllables)
+    long_sentences: int
+    jargon_hits: tuple  # (phrase, alternative)
+    simplewords_hits: tuple  # (phrase, alternative)
+    polarity: float
+    subjectivity: float
+    language: str  # language profile (see func_language)
+
+    ## Scores and ranks
+    @derived("eflaw_value")
+    def eflaw_score(self):
+        return int(self.eflaw_value)
+
+    ## No sentence with more than 4 words: eflaw_value None, rank "n/a" (see `func_readability.rank_eflaw`)
+    @derived("eflaw_value", "eflaw_sentencecount", guard=False)
+    def eflaw_rank(self):
+        return None if self.eflaw_sentencecount is None else rc.rank_eflaw(self.eflaw_value)
+
+    @derived("eflaw_value", "eflaw_sentencecount", guard=False)
+    def eflaw_score_rank(self):
+        if self.eflaw_sentencecount is None:
+            return None
+        return rc.eflaw_rank_missing if self.eflaw_value is None else f"{self.eflaw_score}: {self.eflaw_rank}"
+
+    @derived("gunning_fog_value")
+    def gunning_fog_score(self):
+        return int(self.gunning_fog_value)
+
+    @derived("gunning_fog_value")
+    def gunning_fog_rank(self):
+        return rc.rank_gunning_fog(self.gunning_fog_value)
+
+    @derived("gunning_fog_value")
+    def gunning_fog_score_rank(self):
+        return f"{self.gunning_fog_score}: {self.gunning_fog_rank}"
+
+    ## Statistics
+    @derived("sentence_lengths", "sentence_texts")
+    def sentence_length_dict(self):
+        return rc.build_sentence_length_dict(self.sentence_lengths, self.sentence_texts)
+
+    @derived("words", "sentences")
+    def word_sentence_ratio(self):
+        return int(self.words/self.sentences)
+
+    @derived("difficult_words")
+    def diffcult_words_list(self):
+        return rc.format_difficult_words(self.difficult_words)
+
+    @derived("difficult_words")
+    def diffcult_words_num(self):
+        return len(self.difficult_words)
+
+    ## Checklists
+    @derived("jargon_hits")
+    def jargon_checklist(self):
+        return rc.format_checklist(self.jargon_hits, rc.jargon_checklist_empty)
+
+    @derived("jargon_hits")
+    def jargon_checklist_dict(self):
+        return dict(self.jargon_hits)
+
+    @derived("simplewords_hits")
+    def simplewords_checklist(self):
+        return rc.format_checklist(self.simplewords_hits, rc.simplewords_checklist_empty)
+
+    @derived("simplewords_hits")
+    def simplewords_checklist_dict(self):
+        return dict(self.simplewords_hits)
+
+    @derived("eflaw_sentencecount", "jargon_hits", "long_sentences", "eflaw_miniwords_count")
+    def improvement_suggestions(self):
+        return rc.improvement_suggestions(0, [self])
+
+    ## Sentiment (None: not analyzed, see `func_readability.rank_sentiment`)
+    @derived("polarity", "subjectivity", guard=False)
+    def bob_result_polarity(self):
+        return rc.rank_sentiment(self.polarity, self.subjectivity)[0]
+
+    @derived("polarity", "subjectivity", guard=False)
+    def bob_result_subjectivity(self):
+        return rc.rank_sentiment(self.polarity, self.subjectivity)[1]
+
+    ## Dictionary interface with the keys of the former result dictionary
+    def keys(self):
+        return RESULT_KEYS.keys()
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, RESULT_KEYS[key])
+        except KeyError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key):
+        return key in RESULT_KEYS
+
+    def __iter__(self):
+        return iter(RESULT_KEYS)
+
+    def to_dict(self):
+        """Returns the results as dictionary (keys listed in `app2`)."""
+        return {key: getattr(self, name) for key, name in RESULT_KEYS.items()}
+
+    def renumbered(self, i):
+        """Returns a copy with the observation no. of iterator i (e.g. for cached results)."""
+        return replace(self, observation_no=i+1)
+
+
+## Dictionary key and attribute, in the order of the former result dictionary
+RESULT_KEYS = {
+    'Observation No.': 'observation_no',
+    'eflaw_score': 'eflaw_score',
+    'eflaw_rank': 'eflaw_rank',
+    'eflaw_score_rank': 'eflaw_score_rank',
+    'eflaw_sentencecount': 'eflaw_sentencecount',
+    'sentence_length_dict': 'sentence_length_dict',
+    'eflaw_miniwords_count': 'eflaw_miniwords_count',
+    'gunning_fog_score': 'gunning_fog_score',
+    'gunning_fog_rank': 'gunning_fog_rank',
+    'gunning_fog_score_rank': 'gunning_fog_score_rank',
+    'observation_no': 'observation_no',
+    'words': 'words',
+    'sentences': 'sentences',
+    'syllables': 'syllables',
+    'word_sentence_ratio': 'word_sentence_ratio',
+    'diffcult_words_list': 'diffcult_words_list',
+    'diffcult_words_num': 'diffcult_words_num',
+    'long_sentences': 'long_sentences',
+    'jargon_checklist': 'jargon_checklist',
+    'jargon_checklist_dict': 'jargon_checklist_dict',
+    'simplewords_checklist': 'simplewords_checklist',
+    'simplewords_checklist_dict': 'simplewords_checklist_dict',
+    'improvement_suggestions': 'improvement_suggestions',
+    'bob_result_polarity': 'bob_result_polarity',
+    'bob_result_subjectivity': 'bob_result_subjectivity',
+    'language': 'language',
+}
+
+## Raw (unformatted) attributes of the record
+RAW_FIELDS = [field.name for field in fields(ObservationResult)]
+
+## Type of the attributes (None is always possible), e.g. for the Parquet schema (see `func_export`)
+ATTRIBUTE_TYPES = {
+    **{field.name: field.type for field in fields(ObservationResult)},
+    'eflaw_score': int,
+    'eflaw_rank': str,
+    'eflaw_score_rank': str,
+    'gunning_fog_score': int,
+    'gunning_fog_rank': str,
+    'gunning_fog_score_rank': str,
+    'sentence_length_dict': dict,
+    'word_sentence_ratio': int,
+    'diffcult_words_list': str,
+    'diffcult_words_num': int,
+    'jargon_checklist': str,
+    'jargon_checklist_dict': dict,
+    'simplewords_checklist': str,
+    'simplewords_checklist_dict': dict,
+    'improvement_suggestions': str,
+    'bob_result_polarity': str,
+    'bob_result_subjectivity': str,
+}
+
+
+def column_type(column):
+    """Returns the type of a result key or raw attribute (see `ATTRIBUTE_TYPES`)."""
+    return ATTRIBUTE_TYPES[RESULT_KEYS.get(column, column)]
+
+
+def results_to_columns(results, columns=None):
+    """Collects the results column by column.
+
+    Args:
+        results (iterable): ObservationResult records
+        columns (list): Dictionary keys (see `RESULT_KEYS`) or raw attributes (see `RAW_FIELDS`),
+            default: `func_readability.export_columns`
+
+    Returns:
+        table (dict): Column name and list of values
+    """
+
+    columns = list(columns or rc.export_columns)
+    attributes = [RESULT_KEYS.get(column, column) for column in columns]
+    table = {column: [] for column in columns}
+    values = [table[column] for column in columns]
+    for result in results:
+        for column_values, attribute in zip(values, attributes):
+            column_values.append(getattr(result, attribute))
+
+    return table
+
+
+def results_to_frame(results, columns=None):
+    """Collects the results in a pandas DataFrame (see `results_to_columns`)."""
+    import pandas as pd  # imported on first use
+
+    return pd.DataFrame(results_to_columns(results, columns))
+
+
+def results_to_arrow(results, columns=None):
+    """Collects the results in a pyarrow Table (see `results_to_columns`)."""
+    import pyarrow as pa  # imported on first use, optional
+
+    return pa.table(results_to_columns(results, columns))
@@ -0,0 +1,179 @@
+"""
+## Purpose
+Containing the **vectorized scoring** of many paragraphs (numpy). The paragraphs are counted once in a
+Python loop (words, mini words, sentences, complex words), the EFLAW and Gunning FOG scores, the word/sentence
+ratio and the ranks of all paragraphs are then calculated at once from the count arrays. The ranks are looked
+up in the threshold tables of `func_readability` (`numpy.searchsorted`), the results are the same as
+`func_readability.analyze_observation`.
+
+## Key Elements/Variables
+### count_arrays (function)
+Counts of every paragraph (the only loop over the paragraphs).
+
+### score_arrays (function)
+Scores and ranks of all paragraphs from the counts.
+
+### score_many (function)
+Counts and scores a list of paragraphs, returns a table (column name and list of values) which can be
+written by `func_export` or loaded in pandas.
+
+## Usage
+```python3 linenums="1"
+import func_scoring
+table = func_scoring.score_many(texts)  # {'eflaw_score': [...], 'gunning_fog_rank': [...], ...}
+scores = func_scoring.score_arrays(func_scoring.count_arrays(texts))  # numpy arrays
+```
+---
+# Functions
+"""
+
+## Packages
+## numpy is imported on first use (see func_sentiment)
+import func_readability as rc  # to import the counts and the rank tables
+import func_language  # language profiles
+
+
+# --- Global Parameters ---
+COUNT_COLUMNS = (
+    "eflaw_words",  # words of the sentences (EFLAW)
+    "eflaw_miniwords",  # mini words (EFLAW)
+    "eflaw_sentences",  # sentences with more than 4 words (EFLAW)
+    "words",  # textstat words
+    "sentences",  # textstat sentences (a line break ends a sentence)
+    "fog_sentences",  # textstat sentences of the text as is (Gunning FOG)
+    "complex_words",  # textstat difficult words (Gunning FOG)
+)
+# --- Global Parameters ---
+
+
+def count_arrays(texts, language=None):
+    """Counts the words, mini words, sentences and complex words of every paragraph.
+
+    Args:
+        texts (iterable): Observation texts
+        language (string): Language (see `func_language`), "auto" to detect it per text, default: configured default
+
+    Returns:
+        counts (dict): Count column (see `COUNT_COLUMNS`) and numpy array (one value per text),
+            "language": list of the language names
+    """
+    import numpy as np  # imported on first use
+
+    columns = {name: [] for name in COUNT_COLUMNS}
+    append = [columns[name].append for name in COUNT_COLUMNS]
+    languages = []
+    for text in texts:
+        profile = func_language.resolve_language(language, text)
+        document = rc.as_document(text, profile.name)
+        eflaw_words = eflaw_miniwords = eflaw_sentences = 0
+        for sentence in document.sentences:
+            eflaw_words += sentence.word_count
+            eflaw_miniwords += sentence.miniword_count
+            eflaw_sentences += sentence.word_count > 4
+        words = len(document.words)
+        complex_words = len(rc.complex_words(document)) if words else 0
+        with rc.textstat_language(profile.textstat_lang) as textstat:
+            sentences = textstat.sentence_count(document.stats_text)
+            fog_sentences = textstat.sentence_count(text) if "\n" in text else sentences
+        for add, value in zip(append, (eflaw_words, eflaw_miniwords, eflaw_sentences, words, sentences,
+                                       fog_sentences, complex_words)):
+            add(value)
+        languages.append(profile.name)
+
+    counts = {name: np.array(values, dtype=np.int64) for name, values in columns.items()}
+    counts["language"] = languages
+
+    return counts
+
+
+def round_half_up(values, points):
+    """Rounds half away from zero (the legacy rounding of textstat), element-wise."""
+    import numpy as np  # imported on first use
+
+    p = 10 ** points
+    return np.floor(values * p + np.copysign(0.5, values)) / p
+
+
+def rank_labels(scores, bounds, ranks, side, missing=None):
+    """Looks up the ranks of many scores in a threshold table.
+
+    Args:
+        scores (array): Scores (NaN: no rank)
+        bounds (tuple): Thresholds, e.g. `func_readability.eflaw_rank_bounds`
+        ranks (tuple): Rank per interval (one more than bounds)
+        side (string): "left" (rank up to incl. the bound) or "right" (rank from incl. the bound)
+        missing (string): Rank of NaN, e.g. `func_readability.eflaw_rank_missing`
+
+    Returns:
+        labels (array): Rank per score (object array)
+    """
+    import numpy as np  # imported on first use
+
+    labels = np.array(ranks + (missing,), dtype=object)
+    positions = np.searchsorted(np.asarray(bounds, dtype=np.float64), scores, side=side)
+
+    return labels[np.where(np.isnan(scores), len(ranks), positions)]
+
+
+def score_arrays(counts):
+    """Calculates the scores and ranks of all paragraphs at once.
+
+    Args:
+        counts (dict): Count arrays (see `count_arrays`)
+
+    Returns:
+        scores (dict): numpy arrays (one value per text):
+            eflaw_value (float, NaN if no sentence has more than 4 words), eflaw_score (float, truncated),
+            eflaw_rank, gunning_fog_value, gunning_fog_score (int), gunning_fog_rank and word_sentence_ratio (int)
+    """
+    import numpy as np  # imported on first use
+
+    words = counts["words"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ## EFLAW = (words + mini words) / sentences
+        eflaw_value = np.where(counts["eflaw_sentences"] > 0,
+                               (counts["eflaw_words"] + counts["eflaw_miniwords"]) / counts["eflaw_sentences"], np.nan)
+
+        ## Gunning FOG = 0.4 * (average sentence length + percentage of complex words), rounded as textstat
+        average_sentence_length = round_half_up(words / counts["fog_sentences"], 1)
+        gunning_fog_value = np.where(words > 0, round_half_up(
+            0.4 * (average_sentence_length + counts["complex_words"] / words * 100), 2), 0.0)
+
+    return {
+        "eflaw_value": eflaw_value,
+        "eflaw_score": np.trunc(eflaw_value),
+        "eflaw_rank": rank_labels(eflaw_value, rc.eflaw_rank_bounds, rc.eflaw_ranks, "left", rc.eflaw_rank_missing),
+        "gunning_fog_value": gunning_fog_value,
+        "gunning_fog_score": np.trunc(gunning_fog_value).astype(np.int64),
+        "gunning_fog_rank": rank_labels(gunning_fog_value, rc.gunning_fog_rank_bounds, rc.gunning_fog_ranks, "right"),
+        "word_sentence_ratio": np.trunc(words / counts["sentences"]).astype(np.int64),
+    }
+
+
+def score_many(texts, language=None):
+    """Counts and scores many paragraphs (see `count_arrays` and `score_arrays`).
+
+    Args:
+        texts (iterable): Observation texts
+        language (string): Language (see `func_language`), "auto" to detect it per text, default: configured default
+
+    Returns:
+        table (dict): Column name and list of values: "Observation No.", the scores (None instead of NaN,
+            EFLAW score as int), the counts and "language"
+    """
+    import numpy as np  # imported on first use
+
+    counts = count_arrays(texts, language)
+    scores = score_arrays(counts)
+    valid = (~np.isnan(scores["eflaw_value"])).tolist()
+
+    table = {"Observation No.": list(range(1, len(valid) + 1))}
+    for name, values in scores.items():
+        table[name] = values.tolist()
+    table["eflaw_value"] = [value if ok else None for value, ok in zip(table["eflaw_value"], valid)]
+    table["eflaw_score"] = [int(value) if ok else None for value, ok in zip(table["eflaw_score"], valid)]
+    for name in COUNT_COLUMNS:
+        table[name] = counts[name].tolist()
+    table["language"] = counts["language"]
+
+    return table
@@ -0,0 +1,242 @@
+"""
+## Purpose
+Containing the **sentiment backends**. The sentiment is only a diagnostic of the readability report,
+hence the engine can be chosen per run:
+
+- `textblob`: TextBlob (default, one `TextBlob` per observation)
+- `lexicon`: fast lexicon-based engine. Scores a whole batch of paragraphs at once with precompiled
+  word -> polarity/subjectivity arrays, built from the TextBlob sentiment lexicon. Follows the TextBlob
+  rules for modifiers ("very good"), negations ("not good") and "!", the averages per paragraph are
+  calculated for the whole batch (numpy). Emoticons and "(!)" are not rated, URLs and code are tokenized
+  slightly differently, otherwise the results are the same as TextBlob.
+- `off`: no sentiment analysis (polarity and subjectivity are None)
+
+## Usage
+```python3 linenums="1"
+import func_sentiment
+func_sentiment.set_backend("lexicon")
+scores = func_sentiment.get_backend().score_many(texts)  # [(polarity, subjectivity), ...]
+```
+---
+# Functions
+"""
+
+## Packages
+import os  # to locate the TextBlob sentiment lexicon
+import re  # to tokenize the texts
+import threading  # to guard the backend selection
+
+
+# --- Global Parameters ---
+default_backend = "textblob"
+negations = ("no", "not", "n't", "never")  # as in TextBlob
+exclamation_boost = 1.25  # "!" boosts the polarity of the previous word (as in TextBlob)
+negation_factor = -0.5  # negated polarity (as in TextBlob)
+modifiers = ("RB",)  # part-of-speech tags of the modifiers (as in TextBlob)
+# --- Global Parameters ---
+
+
+## Tokens like the TextBlob tokenizer: words (incl. "well-known", "isn't" -> "is", "n", "'", "t") and punctuation marks
+_pattern_token = re.compile(r"\w+?(?=n'\w)|\w+(?:[-.]\w+)*|[^\w\s]")
+
+
+class SentimentBackend:
+    """Interface of the sentiment backends."""
+
+    name = ""
+
+    def score(self, text):
+        """Returns (polarity, subjectivity) of a text."""
+        return self.score_many([text])[0]
+
+    def score_many(self, texts):
+        """Returns (polarity, subjectivity) per text.
+
+        Args:
+            texts (list): Observation texts
+
+        Returns:
+            scores (list): Tuples (polarity -1.0 to 1.0, subjectivity 0.0 to 1.0)
+        """
+        raise NotImplementedError
+
+
+class TextBlobBackend(SentimentBackend):
+    """TextBlob (PatternAnalyzer) per text."""
+
+    name = "textblob"
+
+    def score_many(self, texts):
+        from textblob import TextBlob  # for Sentiment Analysis, imported on first use
+
+        return [tuple(TextBlob(text).sentiment[:2]) for text in texts]
+
+
+class SkipBackend(SentimentBackend):
+    """No sentiment analysis."""
+
+    name = "off"
+
+    def score_many(self, texts):
+        return [(None, None)] * len(texts)
+
+
+class LexiconBackend(SentimentBackend):
+    """Fast lexicon-based engine (see module description). The lexicon is compiled on first use.
+
+    Args:
+        path (string): Path to the sentiment lexicon (xml), default: lexicon of TextBlob
+    """
+
+    name = "lexicon"
+
+    def __init__(self, path=None):
+        self.path = path
+        self.vocabulary = None  # word: row of the arrays
+
+    def compile(self):
+        """Compiles the lexicon to arrays (one row per word): polarity, subjectivity and intensity
+        (average per part-of-speech tag, then over the tags, like TextBlob without tags) and the modifier
+        flag (word is an adverb). Like TextBlob, adverbs are derived from the adjectives ("terribly")."""
+        from xml.etree import ElementTree  # imported on first use
+
+        path = self.path
+        if path is None:
+            import textblob
+            path = os.path.join(os.path.dirname(textblob.__file__), "en", "en-sentiment.xml")
+
+        senses = {}  # word: {pos: [(polarity, subjectivity, intensity), ...]}
+        for node in ElementTree.parse(path).getroot().iter("word"):
+            word = node.get("form")
+            if word:
+                scores = (float(node.get("polarity", 0.0)), float(node.get("subjectivity", 0.0)), float(node.get("intensity", 1.0)))
+                senses.setdefault(word, {}).setdefault(node.get("pos"), []).append(scores)
+
+        words = {}  # word: {pos: (polarity, subjectivity, intensity)}, None: average of all tags
+        for word, pos_scores in senses.items():
+            words[word] = {pos: tuple(map(_average, zip(*scores))) for pos, scores in pos_scores.items()}
+            words[word][None] = tuple(map(_average, zip(*words[word].values())))
+        for word, pos_scores in list(words.items()):
+            if "JJ" in pos_scores:
+                stem = word[:-1] + "i" if word.endswith("y") else word
+                stem = stem[:-2] if stem.endswith("le") else stem
+                adverb = words.setdefault(stem + "ly", {})
+                adverb["RB"] = adverb[None] = pos_scores["JJ"]
+
+        self.polarity, self.subjectivity, self.intensity = (list(column) for column in zip(*(scores[None] for scores in words.values())))
+        self.modifier = [any(modifier in pos_scores for modifier in modifiers) for pos_scores in words.values()]
+        self.vocabulary = {word: row for row, word in enumerate(words)}  # set last: the arrays are complete
+
+    def assessments(self, texts):
+        """Finds the assessments of the texts: a known word, optionally preceded by modifiers ("very good")
+        or a negation ("not good") and followed by "!" (same rules as TextBlob).
+
+        Args:
+            texts (list): Observation texts
+
+        Returns:
+            text_no (list): Text of every assessment
+            polarity (list): Polarity of every assessment
+            subjectivity (list): Subjectivity of every assessment
+            negated (list): Negation of every assessment
+        """
+
+        if self.vocabulary is None:
+            self.compile()
+        vocabulary, polarities, subjectivities, intensities, is_modifier = (
+            self.vocabulary, self.polarity, self.subjectivity, self.intensity, self.modifier)
+        text_no, polarity, subjectivity, negated = [], [], [], []
+
+        for no, text in enumerate(texts):
+            count = len(polarity)
+            modifier = None  # preceding modifier
+            negation = None  # preceding negation
+            for token in _pattern_token.findall(text.lower()):
+                row = vocabulary.get(token)
+                if row is not None:
+                    if modifier is None:
+                        text_no.append(no)
+                        polarity.append(polarities[row])
+                        subjectivity.append(subjectivities[row])
+                        negated.append(False)
+                    else:
+                        polarity[-1] = max(-1.0, min(polarities[row] * intensity, 1.0))
+                        subjectivity[-1] = max(-1.0, min(subjectivities[row] * intensity, 1.0))
+                    intensity = intensities[row]
+                    if negation is not None:
+                        intensity = 1.0 / intensity
+                        negated[-1] = True
+                    modifier = token if is_modifier[row] else None
+                    negation = token if token in negations else None
+                    continue
+
+                if token in negations:
+                    negation = token
+                elif negation and len(token.strip("'")) > 1:
+                    negation = None  # negations are kept across small words ("not a good")
+                if negation is not None and modifier is not None and modifier.endswith("ly"):
+                    negated[-1] = True  # "really not good"
+                    negation = None
+                elif modifier and len(token) > 2:
+                    modifier = None  # modifiers are kept across small words ("really is a good")
+                if token == "!" and len(polarity) > count:
+                    polarity[-1] = max(-1.0, min(polarity[-1] * exclamation_boost, 1.0))
+
+        return text_no, polarity, subjectivity, negated
+
+    def score_many(self, texts):
+        import numpy as np  # imported on first use
+
+        if not texts:
+            return []
+
+        ## Average of the assessments per text (all texts at once)
+        text_no, polarity, subjectivity, negated = (np.array(column) for column in self.assessments(texts))
+        polarity = np.where(negated.astype(bool), polarity * negation_factor, polarity)
+        text_no = text_no.astype(np.int64)
+        divisor = np.maximum(np.bincount(text_no, minlength=len(texts)), 1)
+        polarities = np.bincount(text_no, weights=polarity, minlength=len(texts)) / divisor
+        subjectivities = np.bincount(text_no, weights=subjectivity, minlength=len(texts)) / divisor
+
+        return list(zip(polarities.tolist(), subjectivities.tolist()))
+
+
+def _average(values):
+    """Average like TextBlob (same rounding)."""
+    return sum(values) / float(len(values) or 1)
+
+
+## Name and backend class
+BACKENDS = {
+    TextBlobBackend.name: TextBlobBackend,
+    LexiconBackend.name: LexiconBackend,
+    SkipBackend.name: SkipBackend,
+}
+
+_backend = None
+_lock = threading.Lock()
+
+
+def set_backend(name):
+    """Selects the sentiment backend of this process (kept if already selected).
+
+    Args:
+        name (string): "textblob", "lexicon" or "off"
+
+    Returns:
+        backend (SentimentBackend): Selected backend
+    """
+
+    global _backend
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown sentiment backend: {name} (use one of {', '.join(BACKENDS)})")
+    with _lock:
+        if _backend is None or _backend.name != name:
+            _backend = BACKENDS[name]()
+
+    return _backend
+
+
+def get_backend():
+    """Returns the selected sentiment backend (default: `default_backend`)."""
+    return _backend or set_backend(default_backend)
@@ -0,0 +1,84 @@
+"""
+## Purpose
+Containing the **per-session analysis history** of the Quick Check. The results are stored in the
+Streamlit session state (not in a module global), hence they are not shared between users and
+the history is bounded to the last N analyses per session.
+---
+# Functions
+"""
+
+## Packages
+import sys  # to estimate the memory use
+from collections import OrderedDict  # to keep the analyses in least recently used order
+
+
+class AnalysisHistory:
+    """Least recently used history of the last analyses (input text and results).
+    Analyzing the same text again moves it to the end instead of adding a second entry.
+
+    Args:
+        max_items (int): Maximum number of analyses kept
+    """
+
+    def __init__(self, max_items=5):
+        self.max_items = max(1, int(max_items))
+        self._items = OrderedDict()  # input text: observation_stats
+
+    def __len__(self):
+        return len(self._items)
+
+    def add(self, observation, observation_stats):
+        """Adds an analysis and drops the least recently used ones above max_items."""
+        self._items[observation] = observation_stats
+        self._items.move_to_end(observation)
+        while len(self._items) > self.max_items:
+            self._items.popitem(last=False)
+
+    def get(self, observation):
+        """Returns the results of an earlier analysis of the text (or None) and marks it as recently used."""
+        observation_stats = self._items.get(observation)
+        if observation_stats is not None:
+            self._items.move_to_end(observation)
+        return observation_stats
+
+    def latest(self):
+        """Returns the results of the latest analysis (or None)."""
+        if not self._items:
+            return None
+        return next(reversed(self._items.values()))
+
+    def clear(self):
+        """Removes all analyses."""
+        self._items.clear()
+
+    def memory_bytes(self):
+        """Estimates the memory used by the stored texts and results (in bytes)."""
+        return deep_sizeof(self._items)
+
+
+def deep_sizeof(obj, seen=None):
+    """Estimates the memory of an object incl. the contained dictionaries, lists, tuples, strings
+    and the attributes of slotted objects (e.g. `ObservationResult`).
+
+    Args:
+        obj (object): Object to be measured
+        seen (set): Ids of the already counted objects
+
+    Returns:
+        size (int): Size in bytes
+    """
+
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(key, seen) + deep_sizeof(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    elif hasattr(obj, '__slots__'):
+        size += sum(deep_sizeof(getattr(obj, name), seen) for name in obj.__slots__ if hasattr(obj, name))
+
+    return size
@@ -0,0 +1,138 @@
+"""
+## Purpose
+Containing the **timing and profiling instrumentation**. Named timing spans are recorded around the
+readability stages (TextBlob, textstat, word lists, chart, ...) of the Quick Check and the batch analysis.
+The timings are written as JSON log lines and displayed in the sidebar of the Quick Check.
+
+## Key Elements/Variables
+### Timings (class)
+- `span(name)`: context manager measuring a named span
+- `totals()`: seconds per span name
+- `log(**context)`: writes the timings as one JSON line (logger "rcbot.timing")
+
+### capture (function)
+Optional profiling of a code block: "cprofile" (top functions) or "tracemalloc" (peak memory, top allocations).
+---
+# Functions
+"""
+
+## Packages
+import json  # to write the timings as JSON
+import logging  # to write the timing logs
+import time  # to measure the spans
+from contextlib import contextmanager  # for the span and capture context managers
+
+
+# --- Global Parameters ---
+PROFILE_MODES = ("off", "cprofile", "tracemalloc")
+profile_top = 20  # functions/allocations listed in a profile
+# --- Global Parameters ---
+
+
+logger = logging.getLogger("rcbot.timing")
+
+
+class Timings:
+    """Collects named timing spans (in call order)."""
+
+    __slots__ = ("spans",)
+
+    def __init__(self):
+        self.spans = []  # (name, seconds)
+
+    @contextmanager
+    def span(self, name):
+        """Measures the wall time of the enclosed block as span `name`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.spans.append((name, time.perf_counter() - start))
+
+    def add(self, name, seconds):
+        """Adds a span measured elsewhere (e.g. in a worker process)."""
+        self.spans.append((name, seconds))
+
+    def merge(self, totals):
+        """Adds the totals of another collector (see `totals`)."""
+        for name, seconds in totals.items():
+            self.add(name, seconds)
+
+    def totals(self):
+        """Returns the seconds per span name (summed, in order of the first occurrence)."""
+        totals = {}
+        for name, seconds in self.spans:
+            totals[name] = totals.get(name, 0.0) + seconds
+        return totals
+
+    def to_dict(self, **context):
+        """Returns the context and the milliseconds per span name."""
+        return {**context, 'timings_ms': {name: round(seconds * 1000, 3) for name, seconds in self.totals().items()}}
+
+    def log(self, **context):
+        """Writes the timings (and the context, e.g. the page) as one JSON line."""
+        logger.info(json.dumps(self.to_dict(**context)))
+
+
+class NullTimings(Timings):
+    """Timings which are not recorded (default of the instrumented functions)."""
+
+    __slots__ = ()
+
+    @contextmanager
+    def span(self, name):
+        yield
+
+    def add(self, name, seconds):
+        pass
+
+
+null_timings = NullTimings()
+
+
+@contextmanager
+def capture(mode="off", top=profile_top):
+    """Profiles the enclosed block. The report (dict) is filled when the block is left.
+
+    Args:
+        mode (string): "off", "cprofile" (cumulative time per function) or "tracemalloc" (peak memory)
+        top (int): Number of listed functions/allocations
+
+    Yields:
+        report (dict): "cprofile" (text) or "tracemalloc_peak_kb" and "tracemalloc_top" (text)
+    """
+
+    report = {}
+    if mode == "cprofile":
+        import cProfile
+        import io
+        import pstats
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield report
+        finally:
+            profiler.disable()
+            stream = io.StringIO()
+            pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(top)
+            report['cprofile'] = stream.getvalue()
+
+    elif mode == "tracemalloc":
+        import tracemalloc
+
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        try:
+            yield report
+        finally:
+            report['tracemalloc_peak_kb'] = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+            statistics = tracemalloc.take_snapshot().statistics("lineno")[:top]
+            report['tracemalloc_top'] = "\n".join(str(statistic) for statistic in statistics)
+            if started:
+                tracemalloc.stop()
+
+    else:
+        yield report
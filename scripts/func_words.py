@@ -0,0 +1,141 @@
+"""
+## Purpose
+Containing the **word classification** (syllables and difficult words). The same words ("management",
+"implementation") occur in almost every observation, hence every word is classified once and the
+result is kept in a bounded memo (least recently used) for the whole corpus.
+
+## Key Elements/Variables
+### count_syllables (function)
+Memoized custom syllable count (compiled patterns).
+
+### WordClassifier (class)
+- `classify(word)`: (syllables, difficult)
+- `classify_many(words)`: classifies a whole vocabulary, each unique word once
+- `difficult_words(words)`: difficult words of a vocabulary as (word, syllables), sorted
+
+### tokenize / vocabulary (functions)
+Words of a text as counted by textstat (word and syllable counts) and the unique words of the difficult
+word checks, computed once per text by `func_document.Document`.
+---
+# Functions
+"""
+
+## Packages
+import re  # to find and calculate syllables in a word
+from functools import lru_cache  # for the bounded word memo
+import func_lexicon  # memory-mapped word lists
+
+
+# --- Global Parameters ---
+word_memo_size = 65536  # words kept in the memo
+difficult_syllables_min = 4  # custom syllables of a difficult word
+# --- Global Parameters ---
+
+
+## Compiled patterns (syllables and the word tokens used by textstat)
+_pattern_vowel_groups = re.compile('(?!e$)[aeiouy]+', re.I)
+_pattern_silent_e = re.compile('^[^aeiouy]*e$', re.I)
+_pattern_word = re.compile(r"[\w\='‘’]+")
+_pattern_punctuation = re.compile(r"[^\w\s]")  # removed by textstat before the word and syllable counts
+
+
+@lru_cache(maxsize=word_memo_size)
+def count_syllables(word):
+    """Custom function to calculate syllables in a word (memoized).
+
+    Args:
+        word (string): Single word which should be analyzed for syllables
+
+    Returns:
+        syllables_count (int): Number of syllables found
+    """
+
+    return len(_pattern_vowel_groups.findall(word)) + len(_pattern_silent_e.findall(word))
+
+
+def tokenize(text):
+    """Returns the words of a text as counted by textstat (`lexicon_count`, `syllable_count`):
+    lower case, punctuation removed (e.g. "don't" is "dont").
+
+    Args:
+        text (string): Text
+
+    Returns:
+        words (list): Words, in text order
+    """
+
+    return _pattern_punctuation.sub("", text.lower()).split()
+
+
+def vocabulary(text):
+    """Returns the unique words of a text as checked by textstat (`difficult_words_list`):
+    lower case, apostrophes kept.
+
+    Args:
+        text (string): Text
+
+    Returns:
+        words (frozenset): Unique words
+    """
+
+    return frozenset(_pattern_word.findall(text.lower()))
+
+
+class WordClassifier:
+    """Classifies words as difficult: textstat rates the word as difficult, it has 4 or more (custom)
+    syllables and it is not on the ignore list (`resources/list_difficult_words.csv`).
+
+    Args:
+        ignore_words (iterable): Words which are not rated as difficult
+        max_words (int): Words kept in the memo
+        syllables (string): Syllable rule, "custom" (`count_syllables`) or "textstat" (hyphenation dictionary of the
+            textstat language, e.g. German and French)
+    """
+
+    def __init__(self, ignore_words, max_words=word_memo_size, syllables="custom"):
+        ## Memory-mapped word lists (see func_lexicon) are searched in place
+        self.ignore_words = ignore_words if isinstance(ignore_words, (frozenset, func_lexicon.MappedList)) else frozenset(ignore_words)
+        self.syllables = syllables
+        self.classify = lru_cache(maxsize=max_words)(self._classify)
+
+    def _classify(self, word):
+        """Returns (syllables, difficult) of a lower case word. textstat has to be set to the language
+        of the classifier (see `func_readability.textstat_language`)."""
+        import func_readability as rc
+        count_syll = count_syllables(word) if self.syllables == "custom" else rc.get_textstat().syllable_count(word)
+        if count_syll < difficult_syllables_min or word in self.ignore_words:
+            return count_syll, False
+
+        ## textstat rating (Dale-Chall list of easy words, see textstat.difficult_words_list)
+        return count_syll, rc.get_textstat().is_difficult_word(word)
+
+    def classify_many(self, words):
+        """Classifies a vocabulary, each unique word once.
+
+        Args:
+            words (iterable): Lower case words
+
+        Returns:
+            classification (dict): Word and (syllables, difficult)
+        """
+
+        classify = self.classify
+        return {word: classify(word) for word in set(words)}
+
+    def difficult_words(self, words):
+        """Finds the difficult words of a vocabulary.
+
+        Args:
+            words (iterable): Lower case words of a text (see `vocabulary`)
+
+        Returns:
+            difficult_words (tuple): Difficult words as (word, syllables), sorted
+        """
+
+        classification = self.classify_many(words)
+
+        return tuple((word, classification[word][0]) for word in sorted(classification) if classification[word][1])
+
+    def memo_info(self):
+        """Returns the memo statistics (hits, misses, size)."""
+        return self.classify.cache_info()
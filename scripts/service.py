@@ -0,0 +1,496 @@
+"""
+## Purpose
+**Local HTTP/JSON scoring service** for report-authoring tools (offline, stdlib only). The texts are scored
+by a warm worker pool: every worker has loaded the word lists, compiled the phrase matchers and selected
+the sentiment backend before the first request. Concurrent small requests are batched into one chunk
+per worker call.
+
+## Endpoints
+- `POST /score`: `{"texts": ["...", ...]}` or `{"text": "..."}`, returns `{"results": [...]}` (one record per
+  text, same fields as the CLI JSON lines)
+- `GET /metrics`: request counters, batch sizes and the p50/p99 latency (milliseconds) of the last requests
+- `GET /health`: `{"status": "ok"}`
+
+## Limits
+- Requests larger than `max_request_bytes` or with more than `max_texts` texts: 413
+- Queue full (`max_queue` pending requests, all workers busy): 503 with `Retry-After`
+- No result within `request_timeout_seconds`: 504
+
+## Usage
+Run from the project's root folder (the word lists and the config are loaded from `resources/`):
+```shell
+python scripts/service.py --port 8765 --workers 4
+curl -s -X POST localhost:8765/score -d '{"text": "The management team did not review the invoices."}'
+curl -s localhost:8765/metrics
+```
+---
+# Functions
+"""
+
+## Packages
+import argparse  # to parse the command line arguments
+import configparser  # to read the service settings from the config file
+import json  # to read the requests and write the responses
+import logging  # to write the request logs
+import os  # to get the number of CPU cores
+import queue  # for the bounded request queue (backpressure)
+import signal  # to leave Ctrl+C to the main process
+import sys  # to set the exit code
+import threading  # for the batching thread and the metrics lock
+import time  # to measure the latency
+from collections import deque, namedtuple  # for the latency window and the queued requests
+from concurrent.futures import Future, ProcessPoolExecutor  # warm worker pool
+from concurrent.futures import TimeoutError as ResultTimeout  # not the built-in TimeoutError before Python 3.11
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer  # HTTP server (one thread per connection)
+
+
+# --- Global Parameters ---
+CONFIG_FILE = "resources/rcBOT_config.ini"
+default_host = "127.0.0.1"  # local only
+default_port = 8765
+default_max_request_bytes = 1_048_576  # 1 MB
+default_max_texts = 256  # texts per request
+default_max_queue = 256  # pending requests
+default_batch_max_texts = 32  # texts per worker call
+default_batch_wait_ms = 5  # time to collect further requests for a batch
+default_request_timeout_seconds = 60
+latency_window = 10_000  # requests kept for the percentiles
+warm_up_text = "The management team did not ensure that the vendor invoices were reviewed in order to leverage the framework."
+# --- Global Parameters ---
+
+
+logger = logging.getLogger("rcbot.service")
+
+## Request waiting in the queue
+PendingRequest = namedtuple("PendingRequest", ["texts", "future"])
+
+
+class Busy(Exception):
+    """The request queue is full."""
+
+
+def init_service_worker(sentiment_backend):
+    """Warms up a worker process (see `func_batch.init_worker`). Ctrl+C is handled by the main process,
+    which scores the queued requests and then stops the workers."""
+    import func_batch
+
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    func_batch.init_worker(sentiment_backend)
+
+
+def percentile(sorted_values, q):
+    """Returns the q-th percentile (nearest rank) of sorted values, None if there are none."""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * q // 100))  # ceil(n * q / 100)
+    return sorted_values[int(rank) - 1]
+
+
+class Metrics:
+    """Request counters and the latency of the last requests (thread-safe)."""
+
+    def __init__(self, window=latency_window):
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=window)  # seconds
+        self.counters = {'requests': 0, 'texts': 0, 'busy': 0, 'too_large': 0, 'bad_request': 0,
+                         'timeouts': 0, 'errors': 0, 'batches': 0, 'batched_texts': 0, 'batch_retries': 0}
+
+    def count(self, name, amount=1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def observe(self, seconds, texts):
+        """Records a scored request."""
+        with self._lock:
+            self._latencies.append(seconds)
+            self.counters['requests'] += 1
+            self.counters['texts'] += texts
+
+    def to_dict(self):
+        """Returns the counters, the mean batch size and the p50/p99 latency (ms) of the last requests."""
+        with self._lock:
+            counters = dict(self.counters)
+            latencies = sorted(self._latencies)
+        batches = counters['batches']
+
+        return {
+            **counters,
+            'mean_batch_texts': round(counters['batched_texts'] / batches, 2) if batches else None,
+            'latency_ms': {
+                'p50': None if not latencies else round(percentile(latencies, 50) * 1000, 2),
+                'p99': None if not latencies else round(percentile(latencies, 99) * 1000, 2),
+                'max': None if not latencies else round(latencies[-1] * 1000, 2),
+                'window': len(latencies),
+            },
+        }
+
+
+class Batcher:
+    """Collects the queued requests into batches and scores them on the worker pool.
+    At most two batches per worker are in flight; if the workers are busy, the queue fills up and
+    further requests are rejected (see `Busy`).
+
+    Args:
+        pool (ProcessPoolExecutor): Warm worker pool (see `func_batch.init_worker`)
+        workers (int): Number of worker processes
+        metrics (Metrics): Counters of the service
+        max_queue (int): Maximum number of pending requests
+        batch_max_texts (int): Texts per worker call (a larger request is sent as one batch)
+        batch_wait_ms (float): Time to collect further requests for a batch
+    """
+
+    def __init__(self, pool, workers, metrics, max_queue=default_max_queue,
+                 batch_max_texts=default_batch_max_texts, batch_wait_ms=default_batch_wait_ms):
+        self.pool = pool
+        self.metrics = metrics
+        self.batch_max_texts = max(1, int(batch_max_texts))
+        self.batch_wait = max(0.0, batch_wait_ms / 1000)
+        self._queue = queue.Queue(maxsize=max(1, int(max_queue)))
+        self._slots = threading.BoundedSemaphore(max(1, workers) * 2)
+        self._thread = threading.Thread(target=self._run, name="rcbot-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, texts):
+        """Queues the texts of a request.
+
+        Args:
+            texts (list): Observation texts
+
+        Returns:
+            future (Future): Results of the texts (list of ObservationResult)
+
+        Raises:
+            Busy: The queue is full
+        """
+
+        future = Future()
+        try:
+            self._queue.put_nowait(PendingRequest(texts, future))
+        except queue.Full:
+            raise Busy() from None
+
+        return future
+
+    def pending(self):
+        """Returns the number of queued requests."""
+        return self._queue.qsize()
+
+    def close(self):
+        """Stops the batching thread (queued requests are still scored)."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        import func_batch  # to score a chunk in a worker
+
+        closing = False
+        while not closing:
+            request = self._queue.get()
+            if request is None:
+                break
+
+            ## Collect further requests until the batch is full or the wait time is over
+            batch = [request]
+            size = len(request.texts)
+            deadline = time.monotonic() + self.batch_wait
+            while size < self.batch_max_texts:
+                try:
+                    request = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if request is None:
+                    closing = True
+                    break
+                batch.append(request)
+                size += len(request.texts)
+
+            self._slots.acquire()
+            ## Numbered across the batch, the results are matched by number (see `func_batch.analyze_chunk`)
+            items = list(enumerate(text for request in batch for text in request.texts))
+            try:
+                future = self.pool.submit(func_batch.analyze_chunk, items)
+            except Exception as error:  # pool shut down or broken
+                self._slots.release()
+                for request in batch:
+                    request.future.set_exception(error)
+                continue
+            self.metrics.count('batches')
+            self.metrics.count('batched_texts', size)
+            future.add_done_callback(lambda future, batch=batch: self._deliver(batch, future))
+
+    def _deliver(self, batch, future, slot=True):
+        """Splits the results of a batch by request. If a batch of several requests fails, every request
+        is scored again on its own, hence only the request with the failing text gets the error."""
+        if slot:
+            self._slots.release()
+        error = future.exception()
+        if error is not None:
+            if len(batch) == 1:
+                batch[0].future.set_exception(error)
+                return
+            import func_batch  # to score a chunk in a worker
+
+            self.metrics.count('batch_retries')
+            for request in batch:
+                try:
+                    retry = self.pool.submit(func_batch.analyze_chunk, list(enumerate(request.texts)))
+                except Exception as submit_error:  # pool shut down or broken
+                    request.future.set_exception(submit_error)
+                    continue
+                retry.add_done_callback(lambda retry, request=request: self._deliver([request], retry, slot=False))
+            return
+
+        results = future.result()
+        start = 0
+        for request in batch:
+            ## observation no. per request (1, 2, ...)
+            request.future.set_result([result.renumbered(i) for i, result in enumerate(results[start:start + len(request.texts)])])
+            start += len(request.texts)
+
+
+class ScoringService:
+    """Warm worker pool, batcher and metrics of the HTTP service.
+
+    Args:
+        workers (int): Number of worker processes, default: number of CPU cores
+        sentiment_backend (string): Sentiment backend (see `func_sentiment`)
+        max_request_bytes (int): Maximum request body size
+        max_texts (int): Maximum number of texts per request
+        max_queue (int): Maximum number of pending requests
+        batch_max_texts (int): Texts per worker call
+        batch_wait_ms (float): Time to collect further requests for a batch
+        request_timeout_seconds (float): Maximum time to wait for the results of a request
+    """
+
+    def __init__(self, workers=None, sentiment_backend=None, max_request_bytes=default_max_request_bytes,
+                 max_texts=default_max_texts, max_queue=default_max_queue, batch_max_texts=default_batch_max_texts,
+                 batch_wait_ms=default_batch_wait_ms, request_timeout_seconds=default_request_timeout_seconds):
+        import func_batch  # to warm up the workers
+        import func_sentiment  # to select the sentiment backend
+
+        self.workers = workers or os.cpu_count() or 1
+        self.sentiment_backend = func_sentiment.set_backend(sentiment_backend or func_sentiment.default_backend).name
+        self.max_request_bytes = int(max_request_bytes)
+        self.max_texts = int(max_texts)
+        self.request_timeout_seconds = float(request_timeout_seconds)
+        self.metrics = Metrics()
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=init_service_worker,
+                                        initargs=(self.sentiment_backend,))
+
+        ## Warm up: start all workers and score a sample text in each (imports, word lists, lexicons)
+        warm_up = [self.pool.submit(func_batch.analyze_chunk, [(0, warm_up_text)]) for _ in range(self.workers)]
+        for future in warm_up:
+            future.result()
+
+        self.batcher = Batcher(self.pool, self.workers, self.metrics, max_queue, batch_max_texts, batch_wait_ms)
+
+    def score(self, texts):
+        """Scores the texts of a request on the worker pool.
+
+        Args:
+            texts (list): Observation texts
+
+        Returns:
+            observation_stats_list (list): One ObservationResult per text
+
+        Raises:
+            Busy: The queue is full
+            ResultTimeout: No result within `request_timeout_seconds`
+        """
+
+        start = time.perf_counter()
+        results = self.batcher.submit(texts).result(timeout=self.request_timeout_seconds)
+        self.metrics.observe(time.perf_counter() - start, len(texts))
+
+        return results
+
+    def metrics_dict(self):
+        """Returns the metrics, the queue length and the pool settings."""
+        return {**self.metrics.to_dict(), 'queue': self.batcher.pending(), 'workers': self.workers,
+                'sentiment_backend': self.sentiment_backend}
+
+    def close(self):
+        """Scores the queued requests and stops the worker pool."""
+        self.batcher.close()
+        self.pool.shutdown(wait=True)
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+    """HTTP endpoints of the service (see module description)."""
+
+    server_version = "rcBOT"
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def service(self):
+        return self.server.service
+
+    def do_GET(self):
+        if self.path == "/health":
+            self.send_json(200, {'status': 'ok'})
+        elif self.path == "/metrics":
+            self.send_json(200, self.service.metrics_dict())
+        else:
+            self.send_json(404, {'error': "not found"})
+
+    def do_POST(self):
+        if self.path != "/score":
+            self.send_json(404, {'error': "not found"})
+            return
+
+        ## Request size limit (checked before the body is read)
+        try:
+            length = int(self.headers.get('Content-Length', ''))
+        except ValueError:
+            self.send_json(411, {'error': "Content-Length required"}, close=True)
+            return
+        if length > self.service.max_request_bytes:
+            self.service.metrics.count('too_large')
+            self.send_json(413, {'error': f"request larger than {self.service.max_request_bytes} bytes"}, close=True)
+            return
+
+        try:
+            texts = self.read_texts(self.rfile.read(length))
+        except ValueError as error:
+            self.service.metrics.count('bad_request')
+            self.send_json(400, {'error': str(error)})
+            return
+        if len(texts) > self.service.max_texts:
+            self.service.metrics.count('too_large')
+            self.send_json(413, {'error': f"more than {self.service.max_texts} texts"})
+            return
+
+        try:
+            results = self.service.score(texts)
+        except Busy:
+            self.service.metrics.count('busy')
+            self.send_json(503, {'error': "busy, retry later"}, headers={'Retry-After': "1"})
+            return
+        except ResultTimeout:
+            self.service.metrics.count('timeouts')
+            self.send_json(504, {'error': "timeout"})
+            return
+        except Exception as error:
+            self.service.metrics.count('errors')
+            logger.exception("Scoring failed")
+            self.send_json(500, {'error': f"scoring failed: {error}"})
+            return
+
+        self.send_json(200, {'results': [{**observation_stats} for observation_stats in results]})
+
+    @staticmethod
+    def read_texts(body):
+        """Returns the texts of a request body (JSON with "texts" or "text"), raises ValueError if invalid."""
+        try:
+            request = json.loads(body)
+        except (UnicodeDecodeError, json.JSONDecodeError) as error:
+            raise ValueError(f"invalid JSON: {error}") from None
+        if not isinstance(request, dict):
+            raise ValueError('expected an object with "texts" or "text"')
+
+        texts = request['texts'] if 'texts' in request else [request.get('text')]
+        if not isinstance(texts, list) or not texts or not all(isinstance(text, str) for text in texts):
+            raise ValueError('"texts" must be a non-empty list of strings ("text": a string)')
+
+        return texts
+
+    def send_json(self, status, payload, headers=None, close=False):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header('Content-Type', "application/json")
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if close:
+            self.send_header('Connection', "close")
+            self.close_connection = True
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+def load_service_config(CONFIG_FILE):
+    """Loads the service settings (section [SERVICE]) and the sentiment backend from the config file.
+
+    Args:
+        CONFIG_FILE (string): Path to the config file + config file name
+
+    Returns:
+        settings (dict): host, port and the arguments of `ScoringService`
+    """
+
+    config = configparser.ConfigParser()
+    config.read(CONFIG_FILE)
+
+    return {
+        'host': config.get('SERVICE', 'host', fallback=default_host),
+        'port': config.getint('SERVICE', 'port', fallback=default_port),
+        'workers': config.getint('SERVICE', 'workers', fallback=0) or None,
+        'sentiment_backend': config.get('SENTIMENT', 'backend', fallback=None),
+        'max_request_bytes': config.getint('SERVICE', 'max_request_bytes', fallback=default_max_request_bytes),
+        'max_texts': config.getint('SERVICE', 'max_texts', fallback=default_max_texts),
+        'max_queue': config.getint('SERVICE', 'max_queue', fallback=default_max_queue),
+        'batch_max_texts': config.getint('SERVICE', 'batch_max_texts', fallback=default_batch_max_texts),
+        'batch_wait_ms': config.getfloat('SERVICE', 'batch_wait_ms', fallback=default_batch_wait_ms),
+        'request_timeout_seconds': config.getfloat('SERVICE', 'request_timeout_seconds',
+                                                   fallback=default_request_timeout_seconds),
+    }
+
+
+class ScoringHTTPServer(ThreadingHTTPServer):
+    """HTTP server with one thread per connection and a larger listen backlog (many concurrent clients)."""
+
+    daemon_threads = True
+    request_queue_size = 128
+
+
+def make_server(host, port, service):
+    """Returns the HTTP server (not started) of a scoring service."""
+    server = ScoringHTTPServer((host, port), RequestHandler)
+    server.service = service
+
+    return server
+
+
+def main(argv=None):
+    """Parses the command line arguments and runs the service until it is interrupted (Ctrl+C)."""
+
+    parser = argparse.ArgumentParser(description="Local HTTP/JSON readability scoring service.")
+    parser.add_argument("--config", default=CONFIG_FILE, help="config file (section [SERVICE])")
+    parser.add_argument("--host", help=f"interface to listen on (default: {default_host})")
+    parser.add_argument("--port", type=int, help=f"port (default: {default_port})")
+    parser.add_argument("--workers", type=int, help="number of worker processes (default: number of CPU cores)")
+    parser.add_argument("--sentiment", choices=["textblob", "lexicon", "off"], help="sentiment backend")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(stream=sys.stderr, level=logging.INFO, format="%(asctime)s %(message)s")
+    settings = load_service_config(args.config)
+    host = settings.pop('host')
+    port = settings.pop('port')
+    if args.host:
+        host = args.host
+    if args.port is not None:
+        port = args.port
+    if args.workers:
+        settings['workers'] = args.workers
+    if args.sentiment:
+        settings['sentiment_backend'] = args.sentiment
+
+    service = ScoringService(**settings)
+    server = make_server(host, port, service)
+    logger.info("rcBOT scoring service on http://%s:%s (%s workers, sentiment: %s)",
+                host, server.server_address[1], service.workers, service.sentiment_backend)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+"""
+## Purpose
+Regression check of the scoring service: requests collected into one batch get their own results.
+
+## Usage
+Run from the project's root folder (the word lists are loaded from `resources/`):
+```shell
+python -m pytest tests
+```
+"""
+
+## Packages
+import os  # to locate the scripts folder
+import sys  # to import the scripts
+import threading  # to send the requests at the same time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+import func_batch  # noqa: E402
+import service  # noqa: E402
+
+
+TEXTS = [
+    ["The management team did not ensure that the vendor invoices were reviewed in order to leverage it."],
+    ["The controls were not documented by the team.", "The team did not act on the findings of the audit."],
+    ["In addition, approx. 5 of 20 vendor contracts were not approved by the procurement department in the period."],
+]
+
+
+def test_concurrent_requests_get_their_own_results():
+    metrics = service.Metrics()
+    batcher = service.Batcher(func_batch.InlineExecutor(), 1, metrics, batch_wait_ms=500)
+    futures = [None] * len(TEXTS)
+
+    def send(n):
+        futures[n] = batcher.submit(TEXTS[n])
+
+    threads = [threading.Thread(target=send, args=(n,)) for n in range(len(TEXTS))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    results = [future.result(timeout=60) for future in futures]
+    batcher.close()
+
+    assert metrics.counters['batches'] == 1
+    for texts, observation_stats_list in zip(TEXTS, results):
+        expected = func_batch.analyze_chunk(list(enumerate(texts)))
+        assert [result.words for result in observation_stats_list] == [result.words for result in expected]
+        assert [result.observation_no for result in observation_stats_list] == list(range(1, len(texts) + 1))